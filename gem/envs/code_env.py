@@ -25,7 +25,7 @@ from datasets import Dataset, DatasetDict, load_dataset
 from gem.core import Env
 from gem.utils.constants import TERMINAL_STATE
 from gem.utils.parsing import extract_code_from_model
-from gem.utils.sandbox import run_python
+from gem.utils.sandbox import run_python, run_python_batch
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +45,7 @@ class CodeEnv(Env):
         max_tests: int = 12,
         verbose: bool = False,
         sandbox_type: str = "none",
+        batch_tests: bool = False,
         **_,
     ):
         super().__init__()
@@ -77,6 +78,8 @@ class CodeEnv(Env):
         self.max_tests = max_tests
         self.verbose = verbose
         self.sandbox_type = sandbox_type
+        # Run all tests of a submission in one sandboxed interpreter
+        self.batch_tests = batch_tests
 
     def step(
         self, action: str
@@ -149,11 +152,16 @@ class CodeEnv(Env):
             (model_code, self.sandbox_type, _parse_test(test))
             for test in tests["inputs"]
         ]
-        results = list(
-            self.thread_pool_executer.map(
-                lambda args: run_python(*args), code_and_tests
+        if self.batch_tests:
+            results = run_python_batch(
+                model_code, self.sandbox_type, [args[2] for args in code_and_tests]
+            )
+        else:
+            results = list(
+                self.thread_pool_executer.map(
+                    lambda args: run_python(*args), code_and_tests
+                )
             )
-        )
 
         try:
             successes, stdouts, stderrs = zip(*results)
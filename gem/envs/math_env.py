@@ -16,7 +16,6 @@
 
 import functools
 import logging
-import multiprocessing
 import random
 import warnings
 from typing import Any, Optional, SupportsFloat, Tuple
@@ -28,7 +27,8 @@ from gem.utils.constants import TERMINAL_STATE
 from gem.utils.math_grader import (
     boxed_reward_fn,
     extract_answer,
-    run_with_timeout_signal,
+    get_grading_pool,
+    run_with_timeout,
 )
 
 logger = logging.getLogger(__name__)
@@ -82,8 +82,9 @@ class MathEnv(Env):
         self.idx = 0
         self.epoch = 0
         if self.use_mp:
-            # Process pool is used to enable the timeout mechanism for answer grading in a potential distributed training setup
-            self.mp_pool = multiprocessing.Pool(1)
+            # Process pool is used to enable the timeout mechanism for answer grading in a potential distributed training setup.
+            # It is shared by all envs in the process, and a worker that hangs is replaced instead of blocking later steps.
+            self.mp_pool = get_grading_pool()
 
     def _mp_step(
         self, action: str
@@ -92,11 +93,11 @@ class MathEnv(Env):
             extracted_answer = extract_answer(action)
             if extracted_answer is None:
                 return TERMINAL_STATE, FORMAT_ERROR_REWARD, True, True, {}
-        res = self.mp_pool.apply_async(self.check_correct, (action, self.answer))
-        try:
-            is_correct = res.get(timeout=1)
-        except multiprocessing.context.TimeoutError:
-            is_correct = False
+        is_correct = bool(
+            self.mp_pool.run(
+                self.check_correct, args=(action, self.answer), timeout_seconds=1
+            )
+        )
         reward = 1.0 if is_correct else 0
         return TERMINAL_STATE, reward, True, True, {"correct": is_correct}
 
@@ -107,7 +108,7 @@ class MathEnv(Env):
             extracted_answer = extract_answer(action)
             if extracted_answer is None:
                 return TERMINAL_STATE, FORMAT_ERROR_REWARD, True, True, {}
-        res = run_with_timeout_signal(
+        res = run_with_timeout(
             self.check_correct, args=(action, self.answer), timeout_seconds=1
         )
         is_correct = False
@@ -171,7 +172,8 @@ class MathEnv(Env):
         return "\\boxed{42}"
 
     def close(self):
-        self.mp_pool.close()
+        # The grading pool is shared with other envs and shut down at exit
+        pass
 
     def get_state(self) -> dict[str, Any]:
         return {
@@ -231,33 +231,35 @@ async def initialize_snowflake_local(snowflake_db_dir: str, groundtruth_dir: Pat
         inserted_count = 0
         failed_count = 0
         
-        for idx, invoice in enumerate(invoices_data, 1):
-            try:
-                # Insert invoice
-                invoice_insert = f"""
-                INSERT INTO PURCHASE_INVOICE.PUBLIC.INVOICES 
-                (INVOICE_ID, SUPPLIER_NAME, INVOICE_AMOUNT, PURCHASER_EMAIL, INVOICE_DATE)
-                VALUES ('{invoice['invoice_number']}', '{invoice['supplier_name'].replace("'", "''")}', 
-                        {invoice['invoice_amount']:.2f}, '{invoice['purchaser_email']}', '{invoice['invoice_date']}')
-                """
-                db.execute_write_query(invoice_insert)
-                
-                # Insert payment
-                payment_insert = f"""
-                INSERT INTO PURCHASE_INVOICE.PUBLIC.INVOICE_PAYMENTS 
-                (INVOICE_ID, PAYMENT_AMOUNT, OUTSTANDING_FLAG)
-                VALUES ('{invoice['invoice_number']}', {invoice['paid_amount']:.2f}, {invoice['outstanding_flag']})
-                """
-                db.execute_write_query(payment_insert)
-                
-                inserted_count += 1
-                
-                if idx % 100 == 0:
-                    print(f"   Progress: {idx}/{len(invoices_data)} (inserted: {inserted_count}, failed: {failed_count})")
-            except Exception as e:
-                failed_count += 1
-                if failed_count <= 5:  # Only print first 5 errors
-                    print(f"   ⚠️  Failed to insert invoice {invoice['invoice_number']}: {e}")
+        # Commit all inserts in one transaction instead of once per statement
+        with db.batch():
+            for idx, invoice in enumerate(invoices_data, 1):
+                try:
+                    # Insert invoice
+                    invoice_insert = f"""
+                    INSERT INTO PURCHASE_INVOICE.PUBLIC.INVOICES 
+                    (INVOICE_ID, SUPPLIER_NAME, INVOICE_AMOUNT, PURCHASER_EMAIL, INVOICE_DATE)
+                    VALUES ('{invoice['invoice_number']}', '{invoice['supplier_name'].replace("'", "''")}', 
+                            {invoice['invoice_amount']:.2f}, '{invoice['purchaser_email']}', '{invoice['invoice_date']}')
+                    """
+                    db.execute_write_query(invoice_insert)
+                    
+                    # Insert payment
+                    payment_insert = f"""
+                    INSERT INTO PURCHASE_INVOICE.PUBLIC.INVOICE_PAYMENTS 
+                    (INVOICE_ID, PAYMENT_AMOUNT, OUTSTANDING_FLAG)
+                    VALUES ('{invoice['invoice_number']}', {invoice['paid_amount']:.2f}, {invoice['outstanding_flag']})
+                    """
+                    db.execute_write_query(payment_insert)
+                    
+                    inserted_count += 1
+                    
+                    if idx % 100 == 0:
+                        print(f"   Progress: {idx}/{len(invoices_data)} (inserted: {inserted_count}, failed: {failed_count})")
+                except Exception as e:
+                    failed_count += 1
+                    if failed_count <= 5:  # Only print first 5 errors
+                        print(f"   ⚠️  Failed to insert invoice {invoice['invoice_number']}: {e}")
         
         print(f"   ✓ Inserted {inserted_count} records (failed: {failed_count})")
         
@@ -88,6 +88,7 @@ def make_vec(
     async_mode: bool = False,
     seed: int = 0,
     root_dir: Optional[str] = None,
+    copy: bool = True,
     **kwargs,
 ) -> VectorEnv:
     """Create vectorized environments with optional per-env workspace isolation.
@@ -102,6 +103,9 @@ def make_vec(
         seed: Base random seed
         root_dir: Root directory for per-env workspaces. If provided, each env gets
                  a subdirectory (env_0, env_1, ...) for isolated file operations.
+        copy: Whether reset/step return copies of observations and infos. Set to
+              False to skip copying; the returned objects must then be treated
+              as read-only (see VectorEnv).
         **kwargs: Additional kwargs passed to all environments
         
     Returns:
@@ -173,6 +177,7 @@ def make_vec(
             env_fns=[
                 partial(create_single_env, env_ids[i], i) for i in range(num_envs)
             ],
+            copy=copy,
         )
     else:
         print(f"SyncVectorEnv with {num_envs} environments.")
@@ -181,5 +186,6 @@ def make_vec(
             env_fns=[
                 partial(create_single_env, env_ids[i], i) for i in range(num_envs)
             ],
+            copy=copy,
         )
     return env
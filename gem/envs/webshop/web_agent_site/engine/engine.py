@@ -1,14 +1,17 @@
 """ """
 
+import functools
 import json
 import os
 import random
 import re
 import sqlite3
+import threading
 from ast import literal_eval
 from collections import defaultdict
 from decimal import Decimal
 from typing import Optional, Tuple
+from urllib.request import pathname2url
 
 from flask import render_template_string
 from pyserini.search.lucene import LuceneSearcher
@@ -22,6 +25,8 @@ from gem.envs.webshop.web_agent_site.utils import (
 )
 
 WEBSHOP_DB_PATH = ".cache/webshop/webshop.db"
+# Number of recently fetched products kept in memory by get_product_by_asin
+PRODUCT_CACHE_SIZE = 1024
 TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
 
 SEARCH_RETURN_N = 50
@@ -168,17 +173,39 @@ def maybe_json(value):
     return value
 
 
-def get_goal_by_idx(idx, split):
-    db_path = WEBSHOP_DB_PATH
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"webshop.db not found at {db_path}")
+_db_local = threading.local()
+
 
-    with sqlite3.connect(db_path) as conn:
+def get_db_connection(db_path=None):
+    """Return this thread's read-only connection to webshop.db.
+
+    webshop.db is written once by preprocess.py and only read afterwards, so
+    it is opened in immutable mode and each thread keeps its connection
+    instead of reconnecting for every lookup.
+    """
+    db_path = os.path.abspath(db_path or WEBSHOP_DB_PATH)
+    connections = getattr(_db_local, "connections", None)
+    if connections is None:
+        connections = _db_local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"webshop.db not found at {db_path}")
+        conn = sqlite3.connect(
+            f"file:{pathname2url(db_path)}?mode=ro&immutable=1", uri=True
+        )
         conn.row_factory = sqlite3.Row
-        row = conn.execute(
-            f"SELECT * FROM goals_{split} WHERE idx = ? LIMIT 1",
-            (idx,),
-        ).fetchone()
+        connections[db_path] = conn
+    return conn
+
+
+def get_goal_by_idx(idx, split):
+    conn = get_db_connection()
+    row = conn.execute(
+        f"SELECT * FROM goals_{split} WHERE idx = ? LIMIT 1",
+        (idx,),
+    ).fetchone()
 
     if row is None:
         return None
@@ -190,25 +217,26 @@ def get_goal_by_idx(idx, split):
 
 
 def get_weights(split):
-    db_path = WEBSHOP_DB_PATH
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"webshop.db not found at {db_path}")
-
     weights = []
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.execute(f"SELECT weight FROM goals_{split}")
-        rows = cursor.fetchall()
-        for row in rows:
-            weights.append(row[0])
+    cursor = get_db_connection().execute(f"SELECT weight FROM goals_{split}")
+    rows = cursor.fetchall()
+    for row in rows:
+        weights.append(row[0])
 
     return weights
 
 
 def get_product_by_asin(asin):
-    db_path = WEBSHOP_DB_PATH
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"webshop.db not found at {db_path}")
+    """Fetch a product from webshop.db.
+
+    Recently fetched products are cached, and the returned dict is shared
+    between callers, so it must not be modified.
+    """
+    return _get_product_by_asin(os.path.abspath(WEBSHOP_DB_PATH), asin)
+
 
+@functools.lru_cache(maxsize=PRODUCT_CACHE_SIZE)
+def _get_product_by_asin(db_path, asin):
     key_map = {
         "asin": "asin",
         "name": "name",
@@ -235,12 +263,10 @@ def get_product_by_asin(asin):
         "page": "page",
     }
 
-    with sqlite3.connect(db_path) as conn:
-        conn.row_factory = sqlite3.Row
-        row = conn.execute(
-            "SELECT * FROM all_products WHERE asin = ? LIMIT 1",
-            (asin,),
-        ).fetchone()
+    row = get_db_connection(db_path).execute(
+        "SELECT * FROM all_products WHERE asin = ? LIMIT 1",
+        (asin,),
+    ).fetchone()
 
     if row is None:
         return None
@@ -12,6 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Any
+
+
+def render_tool_result(result: Any) -> str:
+    """
+    Render a tool result as the text placed in a tool message.
+    Tools may return structured results (e.g. the hydrated data of an MCP
+    call); this is the single point where they are turned into text.
+    """
+    if isinstance(result, str):
+        return result
+    return str(result)
+
 
 class BaseTool:
     tool_type = "base"
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 
 import yaml
 
+from gem.tools.mcp_server.launch_commands import resolve_launch_command
+
 
 class ServerConfigLoader:
     """Loads and processes MCP server configurations from YAML files."""
@@ -99,6 +101,14 @@ class ServerConfigLoader:
         # Determine working directory
         cwd = self._determine_cwd(config, params)
 
+        # Use launch commands prepared by `loca setup` when available
+        resolved = resolve_launch_command(command, args)
+        if resolved is not None:
+            command, args, run_dir = resolved
+            if run_dir:
+                # uv always runs the server from its project directory
+                cwd = run_dir
+
         # Build stdio config
         stdio_config = {
             "command": command,
@@ -497,6 +507,32 @@ class ServerConfigLoader:
 
         return value
 
+    def get_reinitializable_env_vars(self) -> Dict[str, str]:
+        """Find environment variables that a running server can be re-pointed at.
+
+        Servers opt in with a ``pooling.reinitialize_param`` entry naming a
+        parameter that is passed through ``env_var``.
+
+        Returns:
+            Dictionary mapping environment variable name to parameter name
+        """
+        env_vars = {}
+        for config_path in sorted((self.base_dir / "config").glob("*.yaml")):
+            try:
+                config = self.load_config(config_path.stem)
+            except (FileNotFoundError, ValueError):
+                continue
+
+            param_name = (config.get("pooling") or {}).get("reinitialize_param")
+            if not param_name:
+                continue
+
+            env_var = config.get("parameters", {}).get(param_name, {}).get("env_var")
+            if env_var:
+                env_vars[env_var] = param_name
+
+        return env_vars
+
 
 # Global loader instance
 _loader = ServerConfigLoader()
@@ -527,3 +563,11 @@ def build_server_config(
         {"canvas": {"command": "python", "args": [...], "env": {...}}}
     """
     return _loader.build_stdio_config(server_type, params, server_name)
+
+
+def get_reinitializable_env_vars() -> Dict[str, str]:
+    """Map environment variables of reinitializable servers to their parameter names.
+
+    See ServerConfigLoader.get_reinitializable_env_vars.
+    """
+    return _loader.get_reinitializable_env_vars()
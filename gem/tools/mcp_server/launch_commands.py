@@ -0,0 +1,264 @@
+"""Pre-resolved launch commands for uv, uvx and npx MCP servers.
+
+``uv run``, ``uvx`` and ``npx`` resolve dependencies every time they start a
+server. ``loca setup`` runs that resolution once and records the resulting
+interpreter or executable paths in a generated JSON file. When the file is
+present, the config loader launches servers through those paths directly,
+which is faster and works offline.
+
+Generated file format::
+
+    {
+        "version": 1,
+        "uv": {"<project root>": "<venv python>"},
+        "uvx": {"<package>": "<installed executable>"},
+        "npx": {"<package>": "<node_modules/.bin executable>"}
+    }
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LAUNCH_COMMANDS_VERSION = 1
+
+# Environment variable overriding where the generated file is read and written
+LAUNCH_COMMANDS_ENV_VAR = "LOCA_MCP_LAUNCH_COMMANDS"
+
+DEFAULT_LAUNCH_COMMANDS_PATH = Path(__file__).parent / "config" / "launch_commands.json"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "loca" / "mcp_servers"
+
+RESOLVED_COMMAND_TYPES = ("uv", "uvx", "npx")
+
+# path -> (file signature, parsed commands)
+_loaded: Dict[str, Tuple[Optional[Tuple[int, int]], Dict[str, Dict[str, str]]]] = {}
+
+
+def get_launch_commands_path() -> Path:
+    """Return the path of the generated launch command file."""
+    override = os.environ.get(LAUNCH_COMMANDS_ENV_VAR)
+    return Path(override) if override else DEFAULT_LAUNCH_COMMANDS_PATH
+
+
+def load_launch_commands(path: Optional[Path] = None) -> Dict[str, Dict[str, str]]:
+    """Load the generated launch commands, or {} if none were prepared.
+
+    The parsed file is cached and re-read only when it changes on disk.
+    """
+    path = Path(path or get_launch_commands_path())
+    try:
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return {}
+
+    cached = _loaded.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        data = {}
+    if not isinstance(data, dict) or data.get("version") != LAUNCH_COMMANDS_VERSION:
+        data = {}
+
+    commands = {
+        kind: dict(data.get(kind) or {}) for kind in RESOLVED_COMMAND_TYPES
+    }
+    _loaded[str(path)] = (signature, commands)
+    return commands
+
+
+def get_launch_command(kind: str, key: str) -> Optional[str]:
+    """Return the prepared executable for a uv project root or uvx/npx package.
+
+    Entries whose executable no longer exists are ignored, so a stale file
+    falls back to the resolver instead of breaking server startup.
+    """
+    executable = load_launch_commands().get(kind, {}).get(key)
+    if executable and os.path.exists(executable):
+        return executable
+    return None
+
+
+def resolve_launch_command(
+    command: str, args: List[str]
+) -> Optional[Tuple[str, List[str], Optional[str]]]:
+    """Rewrite a uv/uvx/npx launch into a direct invocation.
+
+    Args:
+        command: Command built by the config loader
+        args: Arguments built by the config loader
+
+    Returns:
+        Tuple of (command, args, working directory) or None if the launch has
+        not been prepared. The working directory is only set for ``uv``, which
+        runs servers from its project directory.
+    """
+    if command == "uv":
+        # uv --directory <project root> run python <script> [args...]
+        if len(args) >= 4 and args[0] == "--directory" and args[2:4] == ["run", "python"]:
+            python = get_launch_command("uv", args[1])
+            if python:
+                return python, args[4:], args[1]
+    elif command in ("uvx", "npx") and args:
+        executable = get_launch_command(command, args[0])
+        if executable:
+            return executable, args[1:], None
+    return None
+
+
+def collect_launch_targets(loader) -> Dict[str, List[str]]:
+    """Find the uv project roots and uvx/npx packages used by server configs.
+
+    Args:
+        loader: ServerConfigLoader whose YAML configs are scanned
+
+    Returns:
+        Dictionary mapping command type to sorted project roots or packages
+    """
+    targets: Dict[str, set] = {kind: set() for kind in RESOLVED_COMMAND_TYPES}
+    for config_path in sorted((loader.base_dir / "config").glob("*.yaml")):
+        try:
+            config = loader.load_config(config_path.stem)
+        except (FileNotFoundError, ValueError):
+            continue
+
+        execution = config["execution"]
+        for spec in (execution, execution.get("fallback_command") or {}):
+            command_type = spec.get("command_type")
+            if command_type in ("uvx", "npx") and spec.get("package_name"):
+                targets[command_type].add(spec["package_name"])
+            elif command_type == "uv":
+                try:
+                    script_path = loader._resolve_script_path(spec.get("script", {}))
+                except (FileNotFoundError, ValueError):
+                    continue
+                targets["uv"].add(str(loader._get_project_root(script_path)))
+
+    return {kind: sorted(values) for kind, values in targets.items()}
+
+
+def _run(cmd: List[str], cwd: Optional[str] = None) -> str:
+    """Run a setup command and return its stdout, raising RuntimeError on failure."""
+    if shutil.which(cmd[0]) is None:
+        raise RuntimeError(f"'{cmd[0]}' is not installed")
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        output = (result.stderr or result.stdout).strip()
+        raise RuntimeError(f"{' '.join(cmd)} failed: {output[-500:]}")
+    return result.stdout
+
+
+def _resolve_uv_project(project_root: str) -> str:
+    """Sync a uv project and return its environment's Python interpreter."""
+    stdout = _run([
+        "uv", "--directory", project_root, "run", "python", "-c",
+        "import sys; print(sys.executable)",
+    ])
+    return stdout.strip().splitlines()[-1]
+
+
+def _resolve_uvx_package(package: str) -> str:
+    """Install a uvx package as a uv tool and return its executable."""
+    _run(["uv", "tool", "install", package])
+    bin_dir = _run(["uv", "tool", "dir", "--bin"]).strip()
+    executable = shutil.which(package, path=bin_dir)
+    if executable is None:
+        raise RuntimeError(f"No '{package}' executable in {bin_dir}")
+    return executable
+
+
+def _npm_bin_name(package_dir: Path, package: str) -> str:
+    """Return the executable npx runs for a package, from its package.json."""
+    with open(package_dir / "package.json", "r", encoding="utf-8") as f:
+        bin_field = json.load(f).get("bin")
+    if isinstance(bin_field, dict):
+        if len(bin_field) == 1:
+            return next(iter(bin_field))
+        # npx prefers the bin named after the package when there are several
+        name = package.rsplit("/", 1)[-1]
+        if name in bin_field:
+            return name
+        raise RuntimeError(f"Cannot choose between executables of {package}: {sorted(bin_field)}")
+    if isinstance(bin_field, str):
+        return package.rsplit("/", 1)[-1]
+    raise RuntimeError(f"{package} does not declare an executable")
+
+
+def _resolve_npx_packages(packages: List[str], node_prefix: Path) -> Dict[str, Any]:
+    """Install npx packages into a local prefix and return their executables.
+
+    Returns:
+        Dictionary mapping package to executable path, or to the exception
+        raised while resolving it
+    """
+    node_prefix.mkdir(parents=True, exist_ok=True)
+    _run(["npm", "install", "--prefix", str(node_prefix), "--no-audit", "--no-fund", *packages])
+
+    resolved: Dict[str, Any] = {}
+    for package in packages:
+        try:
+            bin_name = _npm_bin_name(node_prefix / "node_modules" / package, package)
+            executable = node_prefix / "node_modules" / ".bin" / bin_name
+            if not executable.exists():
+                raise RuntimeError(f"{executable} was not installed")
+            resolved[package] = str(executable)
+        except (OSError, ValueError, RuntimeError) as e:
+            resolved[package] = e
+    return resolved
+
+
+def prepare_launch_commands(
+    loader,
+    cache_dir: Optional[Path] = None,
+    path: Optional[Path] = None,
+) -> Tuple[Dict[str, Dict[str, str]], Dict[str, str]]:
+    """Resolve every uv/uvx/npx launch once and write the generated file.
+
+    Args:
+        loader: ServerConfigLoader whose YAML configs are prepared
+        cache_dir: Directory for locally installed npm packages
+        path: Output file (defaults to get_launch_commands_path())
+
+    Returns:
+        Tuple of (written launch commands, errors keyed by "<kind> <target>").
+        Targets that failed keep launching through their resolver.
+    """
+    cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+    path = Path(path or get_launch_commands_path())
+    targets = collect_launch_targets(loader)
+
+    commands: Dict[str, Dict[str, str]] = {kind: {} for kind in RESOLVED_COMMAND_TYPES}
+    errors: Dict[str, str] = {}
+
+    resolvers = (("uv", _resolve_uv_project), ("uvx", _resolve_uvx_package))
+    for kind, resolve in resolvers:
+        for target in targets[kind]:
+            try:
+                commands[kind][target] = resolve(target)
+            except (OSError, RuntimeError) as e:
+                errors[f"{kind} {target}"] = str(e)
+
+    if targets["npx"]:
+        try:
+            npx_results = _resolve_npx_packages(targets["npx"], cache_dir / "node")
+        except (OSError, RuntimeError) as e:
+            npx_results = {package: e for package in targets["npx"]}
+        for package, result in npx_results.items():
+            if isinstance(result, Exception):
+                errors[f"npx {package}"] = str(result)
+            else:
+                commands["npx"][package] = result
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": LAUNCH_COMMANDS_VERSION, **commands}, f, indent=2)
+
+    return commands, errors
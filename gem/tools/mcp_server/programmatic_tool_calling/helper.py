@@ -8,6 +8,7 @@ tools as functions, with execution pausing while tools are executed via the tool
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 
+from gem.tools.base_tool import render_tool_result
 from gem.tools.mcp_tool import MCPTool
 
 
@@ -100,7 +101,7 @@ class ProgrammaticToolCallingTool(MCPTool):
             # Parse the result to execute any nested tool calls
             try:
                 import json
-                result = json.loads(observation)
+                result = observation if isinstance(observation, dict) else json.loads(observation)
 
                 # Multi-pass execution: keep running until no more tools need execution
                 max_passes = 10  # Prevent infinite loops
@@ -129,7 +130,7 @@ class ProgrammaticToolCallingTool(MCPTool):
                                 )
                                 if tc_parsed:
                                     # Cache the result
-                                    tool_results_cache[tc_id] = tc_obs
+                                    tool_results_cache[tc_id] = render_tool_result(tc_obs)
                                     executed = True
                                     break
 
@@ -141,7 +142,7 @@ class ProgrammaticToolCallingTool(MCPTool):
                             )
                             if tc_parsed:
                                 # Cache the result
-                                tool_results_cache[tc_id] = tc_obs
+                                tool_results_cache[tc_id] = render_tool_result(tc_obs)
                                 executed = True
 
                         if not executed:
@@ -163,7 +164,11 @@ class ProgrammaticToolCallingTool(MCPTool):
                         return (tc_parsed, tc_error, observation, tc_ret_name, tc_ret_id)
 
                     # Parse new result
-                    result = json.loads(observation)
+                    result = observation if isinstance(observation, dict) else json.loads(observation)
+
+                if pass_count:
+                    # Nested tool calls ran in between; report the whole call as execution time
+                    self.last_call_timing = {"server": self._server_for_tool(tool_name), "attempts": pass_count + 1}
 
                 # Final result - filter out internal fields that model shouldn't see
                 filtered_result = {
@@ -178,7 +183,7 @@ class ProgrammaticToolCallingTool(MCPTool):
                 error_info = {
                     "error": f"Failed to parse programmatic tool calling result: {e}",
                     "traceback": traceback.format_exc(),
-                    "original_observation": observation
+                    "original_observation": render_tool_result(observation)
                 }
                 observation = json.dumps(error_info, indent=2)
                 has_error = True
@@ -192,6 +197,7 @@ class ProgrammaticToolCallingTool(MCPTool):
                 for other_tool in self._other_tools:
                     result = other_tool.execute_tool(tool_name, parameters, tool_call_id)
                     if result[0]:  # tool_parsed
+                        self.last_call_timing = getattr(other_tool, "last_call_timing", None)
                         return result
 
             # Try single-tool mode (super() - same instance with multiple servers)
@@ -0,0 +1,227 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Warm pool of stdio MCP server processes reused across tasks.
+
+Starting a stdio server (often through ``uv run``, ``uvx`` or ``npx``) costs
+seconds per server and task. With the pool enabled, stdio transports created
+for MCPTool configs are kept alive when the tool is closed and handed to the
+next config that launches the same server. Only the data directory may differ
+between tasks; the pooled server is re-pointed at it through the hidden
+reinitialize tool of ``mcp_convert`` servers, and respawned with the new
+environment if it does not support that call. Servers whose launch command
+differs in anything else are never shared.
+
+The pool is opt-in: set ``LOCA_MCP_SERVER_POOL=1`` (read when
+``gem.tools.mcp_tool`` is imported) or call :func:`enable_server_pool`. It
+assumes one task at a time per process, as in ProcessPoolExecutor workers:
+closing an MCPTool returns every server in use to the pool.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Must match REINITIALIZE_TOOL_NAME in mcp_convert/common/mcp/server_base.py
+REINITIALIZE_TOOL_NAME = "__loca_reinitialize"
+
+SERVER_POOL_ENV_VAR = "LOCA_MCP_SERVER_POOL"
+
+_server_pool = None
+_server_pool_lock = threading.Lock()
+
+
+def _make_pooled_transport_class():
+    """Create the StdioTransport subclass lazily so FastMCP stays optional."""
+    from fastmcp.client.transports import StdioTransport
+
+    class PooledStdioTransport(StdioTransport):
+        """Stdio transport whose subprocess outlives the clients using it."""
+
+        def __init__(self, *args, data_dir_var: str, **kwargs):
+            super().__init__(*args, keep_alive=True, **kwargs)
+            self.data_dir_var = data_dir_var
+            self.in_use = False
+            self._pending_data_dir: Optional[str] = None
+
+        @property
+        def data_dir(self) -> Optional[str]:
+            return (self.env or {}).get(self.data_dir_var)
+
+        def retarget(self, env: Dict[str, str]):
+            """Switch to another task's environment on the next connection."""
+            new_data_dir = env.get(self.data_dir_var)
+            if new_data_dir != self.data_dir:
+                self._pending_data_dir = new_data_dir
+            self.env = env
+
+        async def connect(self, **session_kwargs):
+            session = await super().connect(**session_kwargs)
+            if self._pending_data_dir is not None:
+                data_dir, self._pending_data_dir = self._pending_data_dir, None
+                if not await self._reinitialize(data_dir):
+                    # Fall back to a fresh process started with the new env
+                    logger.info(f"Respawning MCP server {self.command} for {data_dir}")
+                    await self.disconnect()
+                    session = await super().connect(**session_kwargs)
+            return session
+
+        async def _reinitialize(self, data_dir: str) -> bool:
+            """Ask a running server to switch data directories."""
+            if self._session is None:
+                # Not started yet; the new env is used when it is spawned
+                return True
+            try:
+                result = await self._session.call_tool(
+                    REINITIALIZE_TOOL_NAME, {"data_dir": data_dir}
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.debug(f"Reinitialize call failed: {e}")
+                return False
+            text = " ".join(
+                getattr(content, "text", "") for content in (result.content or [])
+            )
+            return not result.isError and not text.startswith(("Error", "Unknown tool"))
+
+        async def close(self):
+            # Owned by the pool; see MCPServerPool.shutdown
+            if not self.in_use:
+                await super().close()
+
+        async def shutdown(self):
+            await super().close()
+
+    return PooledStdioTransport
+
+
+class MCPServerPool:
+    """Keeps stdio MCP server transports alive between tasks of a worker."""
+
+    def __init__(self, reinitializable_env_vars: Dict[str, str]):
+        """Initialize the pool.
+
+        Args:
+            reinitializable_env_vars: Environment variables holding the data
+                directory of servers that support reinitialization, as
+                returned by config_loader.get_reinitializable_env_vars
+        """
+        self.reinitializable_env_vars = reinitializable_env_vars
+        self._transport_class = _make_pooled_transport_class()
+        self._transports: Dict[Tuple, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def _pool_key(self, command: str, args: List[str], env: Dict[str, str],
+                  cwd: Optional[str]) -> Optional[Tuple[Tuple, str]]:
+        """Return (key, data dir env var) for a poolable launch, else None."""
+        data_dir_vars = [var for var in env if var in self.reinitializable_env_vars]
+        if len(data_dir_vars) != 1:
+            return None
+        data_dir_var = data_dir_vars[0]
+        other_env = tuple(sorted((k, v) for k, v in env.items() if k != data_dir_var))
+        return (command, tuple(args), cwd, other_env, data_dir_var), data_dir_var
+
+    def get_transport(self, command: str, args: List[str], env: Optional[Dict[str, str]],
+                      cwd: Optional[str], log_file: Optional[Path] = None):
+        """Return a pooled transport for a server launch, or None if it cannot be pooled.
+
+        A transport already in use for the same data directory is shared; an
+        idle one is checked out and re-pointed; otherwise a new one is made.
+        """
+        env = dict(env or {})
+        pool_key = self._pool_key(command, args, env, cwd)
+        if pool_key is None:
+            return None
+        key, data_dir_var = pool_key
+        data_dir = env[data_dir_var]
+
+        with self._lock:
+            transports = self._transports.setdefault(key, [])
+            for transport in transports:
+                if transport.in_use and transport.data_dir == data_dir:
+                    return transport
+            for transport in transports:
+                if not transport.in_use:
+                    transport.in_use = True
+                    transport.retarget(env)
+                    return transport
+
+            transport = self._transport_class(
+                command=command,
+                args=list(args),
+                env=env,
+                cwd=cwd,
+                log_file=log_file,
+                data_dir_var=data_dir_var,
+            )
+            transport.in_use = True
+            transports.append(transport)
+            return transport
+
+    def release(self):
+        """Return all servers in use to the pool (at the end of a task)."""
+        with self._lock:
+            for transports in self._transports.values():
+                for transport in transports:
+                    transport.in_use = False
+
+    async def shutdown(self):
+        """Stop all pooled server processes."""
+        with self._lock:
+            transports = [t for group in self._transports.values() for t in group]
+            self._transports = {}
+        for transport in transports:
+            try:
+                await transport.shutdown()
+            except Exception:  # noqa: BLE001
+                pass
+
+
+def get_server_pool() -> Optional[MCPServerPool]:
+    """Return the process-wide server pool, or None if pooling is disabled."""
+    return _server_pool
+
+
+def enable_server_pool() -> MCPServerPool:
+    """Enable the process-wide server pool (idempotent)."""
+    global _server_pool
+    with _server_pool_lock:
+        if _server_pool is None:
+            from gem.tools.mcp_server.config_loader import get_reinitializable_env_vars
+
+            _server_pool = MCPServerPool(get_reinitializable_env_vars())
+            atexit.register(_shutdown_server_pool)
+        return _server_pool
+
+
+def server_pool_requested() -> bool:
+    """Check whether pooling was requested through the environment."""
+    return os.environ.get(SERVER_POOL_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+def _shutdown_server_pool():
+    """Stop pooled servers at interpreter exit."""
+    pool = _server_pool
+    if pool is None:
+        return
+    try:
+        from gem.tools.mcp_tool import _run_async
+
+        _run_async(pool.shutdown())
+    except Exception:  # noqa: BLE001
+        pass
@@ -15,6 +15,8 @@
 """MCP Tool implementation for connecting to any MCP server."""
 
 import asyncio
+import atexit
+import concurrent.futures
 import io
 import json
 import logging
@@ -22,6 +24,7 @@ import os
 import re
 import sys
 import threading
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from fastmcp import Client
@@ -31,6 +34,7 @@ from fastmcp.client.sampling import RequestContext, SamplingMessage, SamplingPar
 from fastmcp.exceptions import ClientError
 
 from gem.tools.base_tool import BaseTool
+from gem.tools.mcp_server_pool import enable_server_pool, get_server_pool, server_pool_requested
 
 logger = logging.getLogger(__name__)
 # silence the underlying HTTP and MCP client loggers
@@ -62,6 +66,11 @@ def _patch_stdio_transport_for_quiet_mode() -> None:
         def _patched_to_transport(self) -> StdioTransport:
             quiet = os.environ.get('LOCA_QUIET', '').lower() in ('1', 'true', 'yes')
             log_file = Path('/dev/null') if quiet else None
+            pool = get_server_pool()
+            if pool is not None:
+                transport = pool.get_transport(self.command, self.args, self.env, self.cwd, log_file)
+                if transport is not None:
+                    return transport
             return StdioTransport(
                 command=self.command,
                 args=self.args,
@@ -77,6 +86,9 @@ def _patch_stdio_transport_for_quiet_mode() -> None:
 
 _patch_stdio_transport_for_quiet_mode()
 
+if server_pool_requested():
+    enable_server_pool()
+
 
 class _StreamFilter(io.TextIOWrapper):
     """Filter a stream to suppress harmless MCP server warnings and startup messages.
@@ -134,83 +146,89 @@ def _install_stream_filters() -> None:
 _install_stream_filters()
 
 
-# Global event loop for MCP operations to avoid "Event loop is closed" errors
+# Global event loop for MCP operations to avoid "Event loop is closed" errors.
+# The loop runs forever in a dedicated daemon thread; sync callers submit
+# coroutines to it, so async resources (client sessions, subprocess
+# transports) created on it stay usable across calls.
 _global_loop = None
+_global_loop_thread = None
+_global_loop_pid = None
+_global_loop_closed = False
 _global_loop_lock = threading.Lock()
 
+# Upper bound on how long a sync caller waits for a coroutine
+_RUN_ASYNC_TIMEOUT = 300
+
+
 def _get_or_create_global_loop():
-    """Get or create a global event loop for MCP operations."""
-    global _global_loop
+    """Get the background MCP event loop, starting its thread if needed."""
+    global _global_loop, _global_loop_thread, _global_loop_pid
     with _global_loop_lock:
-        if _global_loop is None or _global_loop.is_closed():
-            _global_loop = asyncio.new_event_loop()
+        if _global_loop_closed:
+            raise RuntimeError("MCP event loop has been shut down")
+        # A forked child inherits the loop object but not its thread
+        if (
+            _global_loop is None
+            or _global_loop.is_closed()
+            or _global_loop_pid != os.getpid()
+            or not _global_loop_thread.is_alive()
+        ):
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _loop_runner():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(
+                target=_loop_runner, name="mcp-event-loop", daemon=True
+            )
+            thread.start()
+            ready.wait()
+            _global_loop = loop
+            _global_loop_thread = thread
+            _global_loop_pid = os.getpid()
         return _global_loop
 
-def _run_async(coro):
-    """Run an async coroutine from both sync and already-async contexts safely.
 
-    - If there is no running loop, uses a persistent global loop
-    - If called inside a running loop, spins up a dedicated thread with its own loop
+@atexit.register
+def _shutdown_global_loop():
+    """Stop the background loop at interpreter exit.
+
+    Later calls (e.g. from ``MCPTool.__del__`` during teardown) fail fast
+    instead of trying to start a new loop thread.
     """
-    # Try to detect if there's a running event loop
-    # Need to check both get_running_loop() AND loop.is_running() for uvloop compatibility
-    in_running_loop = False
-    running_loop = None
-    
-    try:
-        running_loop = asyncio.get_running_loop()
-        # If we got a loop, check if it's actually running (important for uvloop)
-        if running_loop is not None and running_loop.is_running():
-            in_running_loop = True
-    except RuntimeError:
-        # No running loop detected
-        pass
+    global _global_loop_closed
+    with _global_loop_lock:
+        _global_loop_closed = True
+        if _global_loop is not None and not _global_loop.is_closed():
+            _global_loop.call_soon_threadsafe(_global_loop.stop)
 
-    # Additional check: even if we got a loop from the global dict, verify it's not running
-    if not in_running_loop:
-        try:
-            loop = _get_or_create_global_loop()
-            # Double-check the loop isn't already running (uvloop safety)
-            if loop.is_running():
-                in_running_loop = True
-            else:
-                # Safe to use this loop
-                return loop.run_until_complete(coro)
-        except RuntimeError as e:
-            # If we get here, the loop is running - use thread approach
-            logger.debug(f"Loop is running, switching to thread approach: {e}")
-            in_running_loop = True
-
-    # There's a running loop - execute in separate thread with new loop
+
+def _run_in_new_thread(coro):
+    """Run a coroutine to completion on a throwaway loop in a separate thread."""
     result: Dict[str, Any] = {}
 
     def _runner():
         try:
-            # Create a fresh event loop for this thread
-            # Don't reuse global loop to avoid conflicts
             new_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(new_loop)
             try:
                 result["value"] = new_loop.run_until_complete(coro)
             finally:
-                # Minimal cleanup - let FastMCP client close connections properly
-                # Don't aggressively cancel tasks or close loop immediately
                 try:
-                    # Only shutdown async generators
                     new_loop.run_until_complete(new_loop.shutdown_asyncgens())
                 except Exception:
                     pass
-                # Don't close the loop immediately - let it be garbage collected
-                # This allows FastMCP client background tasks to complete naturally
         except Exception as exc:  # noqa: BLE001
             result["error"] = exc
 
     thread = threading.Thread(target=_runner, daemon=True)
     thread.start()
-    thread.join(timeout=300)  # Add timeout to prevent hanging forever
-    
+    thread.join(timeout=_RUN_ASYNC_TIMEOUT)
+
     if thread.is_alive():
-        # Thread still running after timeout
         raise TimeoutError("MCP tool execution timed out in thread")
 
     if "error" in result:
@@ -218,6 +236,36 @@ def _run_async(coro):
     return result.get("value")
 
 
+def _run_async(coro):
+    """Run an async coroutine from both sync and already-async contexts safely.
+
+    The coroutine is submitted to the process-wide background loop and the
+    calling thread blocks until it finishes. This works the same whether or
+    not the caller is itself inside a running event loop (e.g. an async agent
+    framework), without creating a thread or loop per call.
+    """
+    try:
+        loop = _get_or_create_global_loop()
+    except RuntimeError:
+        coro.close()
+        raise
+
+    if threading.current_thread() is _global_loop_thread:
+        # Blocking the background loop on itself would deadlock
+        logger.debug("_run_async called from the MCP loop thread, using a separate thread")
+        return _run_in_new_thread(coro)
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout=_RUN_ASYNC_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        if future.done():
+            # The coroutine itself raised a timeout
+            raise
+        future.cancel()
+        raise TimeoutError("MCP tool execution timed out in thread")
+
+
 def is_timeout_error(error: Exception) -> bool:
     """Check if an error is a timeout-related error."""
     if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
@@ -367,9 +415,14 @@ class MCPTool(BaseTool):
 
         # Tool discovery and caching
         self._available_tools: Optional[List[Dict[str, Any]]] = None
+        self._tools_by_name: Dict[str, Dict[str, Any]] = {}
+        self._tool_functions: Optional[List[Dict[str, Any]]] = None  # get_tool_function() result
+        self._instruction_string: Optional[str] = None
         self._tools_discovered = False
         self._discovery_lock = threading.Lock()  # Protect tool discovery
         self._tool_execution_lock = None  # Async lock for tool execution, created lazily
+        # Phase timings of the most recent execute_tool() call (see gem.utils.tool_timing)
+        self.last_call_timing: Optional[Dict[str, Any]] = None
 
         # Perform sanity check unless explicitly disabled
         if validate_on_init:
@@ -488,6 +541,9 @@ class MCPTool(BaseTool):
             print(f"[MCP] Discovering tools from servers...")
             tools = _run_async(self._async_discover_tools())
             self._available_tools = tools
+            self._tools_by_name = {tool["name"]: tool for tool in tools}
+            self._tool_functions = None
+            self._instruction_string = None
             self._tools_discovered = True
             print(f"[MCP] Discovered {len(tools)} tools")
             if tools:
@@ -495,6 +551,20 @@ class MCPTool(BaseTool):
                 print(f"[MCP] Sample tools: {tool_names}")
             return tools
 
+    def _invalidate_tools(self):
+        """Drop discovered tools and derived schemas so the next access re-discovers them."""
+        with self._discovery_lock:
+            self._tools_discovered = False
+            self._available_tools = None
+            self._tools_by_name = {}
+            self._tool_functions = None
+            self._instruction_string = None
+
+    def _has_tool(self, tool_name: str) -> bool:
+        """Check whether a tool name is among the discovered tools."""
+        self._discover_tools()
+        return tool_name in self._tools_by_name
+
     async def _async_discover_tools(self) -> List[Dict[str, Any]]:
         """Discover tools using fastMCP client."""
         tools: List[Dict[str, Any]] = []
@@ -587,21 +657,66 @@ class MCPTool(BaseTool):
             logger.error(f"Failed to parse parameters JSON: {e}")
             return tool_name, parsed_action, {}, False
 
-    def _execute_mcp_tool(self, tool_name: str, parameters: Dict[str, Any]) -> str:
-        """Execute a specific MCP tool with given parameters (synchronous wrapper)."""
-        return _run_async(self._async_execute_tool(tool_name, parameters))
+    def _execute_mcp_tool(
+        self, tool_name: str, parameters: Dict[str, Any], structured: bool = False
+    ) -> Any:
+        """Execute a specific MCP tool with given parameters (synchronous wrapper).
+
+        Phase timings of the call are stored in ``self.last_call_timing``.
+        """
+        timing = {"submitted": time.perf_counter()}
+
+        async def timed_execute():
+            try:
+                return await self._async_execute_tool(
+                    tool_name, parameters, structured, timing
+                )
+            finally:
+                timing["finished"] = time.perf_counter()
+
+        try:
+            return _run_async(timed_execute())
+        finally:
+            returned = time.perf_counter()
+            started = timing.get("started", returned)
+            finished = timing.get("finished", returned)
+            self.last_call_timing = {
+                "server": self._server_for_tool(tool_name),
+                "queue_wait_s": started - timing["submitted"],
+                "execution_s": finished - started,
+                "serialization_s": returned - finished,
+                "attempts": timing.get("attempts", 0),
+            }
 
     async def _async_execute_tool(
-        self, tool_name: str, parameters: Dict[str, Any]
-    ) -> str:
-        """Execute tool using FastMCP client with enhanced result handling."""
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        structured: bool = False,
+        timing: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Execute tool using FastMCP client with enhanced result handling.
+
+        Errors and content-block results are always returned as text. With
+        ``structured=True`` FastMCP's hydrated ``result.data`` is returned
+        unchanged instead of being stringified.
+
+        If ``timing`` is given, the perf_counter() time at which execution
+        starts (after waiting for the lock) and the number of attempts are
+        recorded in it.
+        """
+        if timing is None:
+            timing = {}
+
         # Create async lock lazily (must be in async context)
         if self._tool_execution_lock is None:
             self._tool_execution_lock = asyncio.Lock()
         
         # Serialize tool executions for this MCPTool instance to avoid stdio connection conflicts
         async with self._tool_execution_lock:
+            timing["started"] = time.perf_counter()
             for attempt in range(self.max_retries):
+                timing["attempts"] = attempt + 1
                 try:
                     # Recreate client on retry attempts to handle stdio connection issues
                     if attempt > 0:
@@ -652,9 +767,7 @@ class MCPTool(BaseTool):
                                 # Force re-discovery on next call (thread-safe)
                                 print(f"[MCP] ⚠️ FastMCP client doesn't recognize tool: {tool_name}")
                                 print(f"[MCP] Clearing tool cache to force re-discovery...")
-                                with self._discovery_lock:
-                                    self._tools_discovered = False
-                                    self._available_tools = None
+                                self._invalidate_tools()
                             
                             return f"[Tool execution error: {error_msg}]"
 
@@ -667,6 +780,8 @@ class MCPTool(BaseTool):
                         # Use FastMCP's structured data handling
                         if result.data is not None:
                             # FastMCP provides fully hydrated Python objects
+                            if structured:
+                                return result.data
                             return str(result.data)
                         elif result.content:
                             # Fallback to content blocks when no structured data
@@ -1008,9 +1123,7 @@ class MCPTool(BaseTool):
         )
 
         # Reset tool discovery cache to force re-discovery with new client (thread-safe)
-        with self._discovery_lock:
-            self._available_tools = None
-            self._tools_discovered = False
+        self._invalidate_tools()
 
         logger.info(
             f"MCPTool reconfiguration completed: {self._get_server_description()}"
@@ -1018,6 +1131,15 @@ class MCPTool(BaseTool):
 
     def close(self):
         """Clean up resources including MCP server subprocesses."""
+        self._close_client()
+
+        # Hand pooled servers back for the next task instead of stopping them
+        pool = get_server_pool()
+        if pool is not None:
+            pool.release()
+
+    def _close_client(self):
+        """Close the client and terminate any subprocesses it still owns."""
         try:
             if hasattr(self.client, "close"):
                 _run_async(self.client.close())
@@ -1047,7 +1169,9 @@ class MCPTool(BaseTool):
         """Cleanup on deletion."""
         if hasattr(self, "client") and self.client:
             try:
-                self.close()
+                # Pooled servers may already belong to a newer tool, so they
+                # are only released by an explicit close()
+                self._close_client()
             except Exception:
                 # Ignore cleanup errors during deletion
                 pass
@@ -1112,8 +1236,14 @@ class MCPTool(BaseTool):
         return fixed_schema
 
     def get_tool_function(self) -> List[Dict[str, Any]]:
-        """Get the tool function for the MCP tool."""
+        """Get the tool function for the MCP tool.
+
+        The converted schemas are cached until tools are re-discovered.
+        """
         tools = self.get_available_tools()
+        if self._tool_functions is not None:
+            return list(self._tool_functions)
+
         tool_functions = []
         for tool in sorted(tools, key=lambda t: t.get("name", "")):
             # Enhance description with server information for multi-server configs
@@ -1144,11 +1274,14 @@ class MCPTool(BaseTool):
                 },
             }
             tool_functions.append(func_def)
-        return tool_functions
+        self._tool_functions = tool_functions
+        return list(tool_functions)
 
     def instruction_string(self) -> str:
         """Return instruction string for using the MCP tool."""
         tools = self.get_available_tools()
+        if self._instruction_string is not None:
+            return self._instruction_string
 
         # Convert tools to the required JSON format
         tool_functions = []
@@ -1179,7 +1312,7 @@ class MCPTool(BaseTool):
             }
             tool_functions.append(json.dumps(func_def))
 
-        return (
+        self._instruction_string = (
             f"# Tool-Use Instructions\n\n"
             f"In this environment you have access to a set of tools you can use to answer the user's question.\n\n"
             f"You only have access to the tools provided below. You can only use one tool per message, and will receive the result of that tool in the user's next response. You use tools step-by-step to accomplish a given task, with each tool-use informed by the result of the previous tool-use.\n\n"
@@ -1201,6 +1334,7 @@ class MCPTool(BaseTool):
             f"Here are the functions available within <tools></tools> XML tags:\n\n"
             f"<tools>\n" + "\n".join(tool_functions) + f"\n</tools>"
         )
+        return self._instruction_string
 
     def _get_server_names(self) -> List[str]:
         """Get list of server names from configuration."""
@@ -1211,6 +1345,18 @@ class MCPTool(BaseTool):
         else:
             return ["default"]
 
+    def _server_for_tool(self, tool_name: str) -> str:
+        """Return the server providing a tool.
+
+        FastMCP prefixes tools of multi-server configurations with
+        ``<server>_``; the longest matching server name wins.
+        """
+        server_names = self._get_server_names()
+        if len(server_names) == 1:
+            return server_names[0]
+        matches = [name for name in server_names if tool_name.startswith(f"{name}_")]
+        return max(matches, key=len) if matches else "unknown"
+
     def _is_multi_server(self) -> bool:
         """Check if this is a multi-server configuration."""
         return len(self._get_server_names()) > 1
@@ -1251,21 +1397,16 @@ class MCPTool(BaseTool):
 
         # Check if the requested tool exists
         # Note: We still check cached tools for quick validation
-        available_tools = self.get_available_tools()
-        tool_names = [tool["name"] for tool in available_tools]
-
-        if tool_name not in tool_names:
+        if not self._has_tool(tool_name):
+            tool_names = [tool["name"] for tool in self.get_available_tools()]
             error_msg = f"Tool '{tool_name}' not found. Available tools ({len(tool_names)}): {', '.join(tool_names[:10])}"
             print(f"[MCP] ❌ Tool not found in cache: {tool_name}")
             print(f"[MCP] Cached tools: {len(tool_names)}")
             print(f"[MCP] Re-discovering tools to verify...")
             # Force re-discovery to check if tools changed (thread-safe)
-            with self._discovery_lock:
-                self._tools_discovered = False
-                self._available_tools = None
-            available_tools = self.get_available_tools()
-            tool_names = [tool["name"] for tool in available_tools]
-            if tool_name in tool_names:
+            self._invalidate_tools()
+            tool_names = [tool["name"] for tool in self.get_available_tools()]
+            if self._has_tool(tool_name):
                 print(f"[MCP] ✓ Tool found after re-discovery: {tool_name}")
             else:
                 print(f"[MCP] Still not found. Available: {', '.join(tool_names[:10])}")
@@ -1305,22 +1446,23 @@ class MCPTool(BaseTool):
             parameters: The parameters of the tool to execute
 
         Returns:
-            The result of the tool execution
+            The result of the tool execution. Successful calls return the
+            structured result data when the server provides it; use
+            gem.tools.base_tool.render_tool_result to turn it into message text.
         """
 
+        self.last_call_timing = None
+
         # Check if the requested tool exists
         # Note: We still check cached tools for quick validation
-        available_tools = self.get_available_tools()
-        tool_names = [tool["name"] for tool in available_tools]
-
-        if tool_name not in tool_names:
+        if not self._has_tool(tool_name):
             error_msg = f"Tool '{tool_name}' not found."
             return False, True, error_msg, tool_name, tool_call_id
 
         try:
-            response = self._execute_mcp_tool(tool_name, parameters)
+            response = self._execute_mcp_tool(tool_name, parameters, structured=True)
             ERROR_PREFIXES = ("[Tool execution error", "[Tool execution failed")
-            has_error = response.startswith(ERROR_PREFIXES)
+            has_error = isinstance(response, str) and response.startswith(ERROR_PREFIXES)
             observation = response
 
             return True, has_error, observation, tool_name, tool_call_id
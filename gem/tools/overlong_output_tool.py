@@ -16,6 +16,11 @@
 
 This tool provides functionality to search, view, and navigate through
 overlong tool outputs that are stored in files.
+
+Each stored output gets a sidecar line-offset index (``<shortuuid>.lineidx``)
+mapping character offsets to byte offsets and line numbers, so pages and
+match contexts are read by seeking instead of loading the whole file, and
+searches stream the file line by line.
 """
 
 import json
@@ -23,6 +28,7 @@ import os
 import re
 import time
 import uuid
+from bisect import bisect_right
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 
@@ -36,6 +42,10 @@ SEARCH_PAGE_SIZE = 10
 VIEW_PAGE_SIZE = 10000
 MAX_VIEW_PAGE_SIZE = 100000
 CONTEXT_SIZE = 1000
+MAX_SEARCH_MATCHES = 1000
+LINE_INDEX_SUFFIX = '.lineidx'
+# Extra index checkpoint every this many characters inside long lines
+LINE_INDEX_SPAN = 65536
 
 
 class OverlongOutputTool(BaseTool):
@@ -47,6 +57,9 @@ class OverlongOutputTool(BaseTool):
     - Viewing file content with pagination
     - Navigating through search/view results
     - Automatic cleanup of old files
+    
+    Stored outputs are treated as write-once: a sidecar index is reused as
+    long as the size of its output file is unchanged.
     """
     
     tool_type = "overlong_output"
@@ -58,6 +71,7 @@ class OverlongOutputTool(BaseTool):
         search_page_size: int = SEARCH_PAGE_SIZE,
         view_page_size: int = VIEW_PAGE_SIZE,
         context_size: int = CONTEXT_SIZE,
+        max_search_matches: int = MAX_SEARCH_MATCHES,
         num_workers: int = 1,
     ):
         """Initialize the Overlong Output Tool.
@@ -68,6 +82,7 @@ class OverlongOutputTool(BaseTool):
             search_page_size: Default page size for search results
             view_page_size: Default page size for viewing content
             context_size: Characters of context around search matches
+            max_search_matches: Stop searching after this many matches
             num_workers: Number of worker processes
         """
         super().__init__(num_workers)
@@ -76,10 +91,13 @@ class OverlongOutputTool(BaseTool):
         self.search_page_size = search_page_size
         self.view_page_size = view_page_size
         self.context_size = context_size
+        self.max_search_matches = max_search_matches
         
         # Session storage for pagination
         self.search_sessions = {}
         self.view_sessions = {}
+        # file_path -> line-offset index, see _get_line_index
+        self._line_indexes = {}
 
     def _get_overlong_dir(self) -> str:
         """Get the overlong outputs directory path."""
@@ -111,6 +129,17 @@ class OverlongOutputTool(BaseTool):
                 except OSError:
                     continue
         
+        # Drop indexes whose output file is gone
+        for filename in os.listdir(overlong_dir):
+            if filename.endswith(LINE_INDEX_SUFFIX):
+                source_path = os.path.join(overlong_dir, filename[:-len(LINE_INDEX_SUFFIX)] + '.json')
+                if not os.path.exists(source_path):
+                    self._line_indexes.pop(source_path, None)
+                    try:
+                        os.remove(os.path.join(overlong_dir, filename))
+                    except OSError:
+                        continue
+        
         return removed_files
 
     def _get_file_list(self) -> List[Dict[str, Any]]:
@@ -144,37 +173,138 @@ class OverlongOutputTool(BaseTool):
         files.sort(key=lambda x: x['age_hours'])
         return files
 
-    def _search_in_content(self, content: str, pattern: str, context_size: int) -> List[Dict[str, Any]]:
-        """Search for regex pattern in content and return matches with context."""
+    def _get_line_index(self, file_path: str) -> Dict[str, Any]:
+        """Return the line-offset index of an output file, building it if needed.
+        
+        The index holds parallel lists of checkpoints - the start of every line
+        plus one every LINE_INDEX_SPAN characters inside long lines - giving
+        the character offset (as seen when reading the file in text mode),
+        byte offset and line number of each checkpoint. It is kept in memory
+        and in a sidecar file next to the output.
+        """
+        size = os.path.getsize(file_path)
+        index = self._line_indexes.get(file_path)
+        if index is not None and index['size'] == size:
+            return index
+        
+        index_path = file_path[:-len('.json')] + LINE_INDEX_SUFFIX
         try:
-            regex_pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('size') != size:
+                index = None
+        except (OSError, ValueError):
+            index = None
+        
+        if index is None:
+            index = self._build_line_index(file_path, size)
+            try:
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    json.dump(index, f, separators=(',', ':'))
+            except OSError:
+                pass
+        
+        self._line_indexes[file_path] = index
+        return index
+
+    def _build_line_index(self, file_path: str, size: int) -> Dict[str, Any]:
+        """Scan an output file once and record its checkpoints."""
+        chars = [0]
+        byte_offsets = [0]
+        lines = [1]
+        char_pos = 0
+        byte_pos = 0
+        line_num = 1
+        carry = ''
+        
+        # newline='' keeps line endings untranslated so byte offsets are exact;
+        # '\r\n' counts as a single character, as in text-mode reads
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            while True:
+                piece = carry + f.readline(LINE_INDEX_SPAN)
+                carry = ''
+                if not piece:
+                    break
+                if piece.endswith('\r'):
+                    # Do not split a '\r\n' pair across checkpoints
+                    carry = f.read(1)
+                    if carry == '\n':
+                        piece += carry
+                        carry = ''
+                
+                char_pos += len(piece) - (1 if piece.endswith('\r\n') else 0)
+                byte_pos += len(piece.encode('utf-8'))
+                if piece.endswith(('\n', '\r')):
+                    line_num += 1
+                
+                chars.append(char_pos)
+                byte_offsets.append(byte_pos)
+                lines.append(line_num)
+        
+        return {
+            'size': size,
+            'length': char_pos,
+            'chars': chars,
+            'bytes': byte_offsets,
+            'lines': lines,
+        }
+
+    def _read_range(self, file_path: str, index: Dict[str, Any], start: int, end: int) -> str:
+        """Read characters [start, end) of an output file by seeking via its index."""
+        start = max(0, start)
+        end = min(end, index['length'])
+        if end <= start:
+            return ''
+        
+        i = bisect_right(index['chars'], start) - 1
+        with open(file_path, 'r', encoding='utf-8') as f:
+            f.seek(index['bytes'][i])
+            skip = start - index['chars'][i]
+            if skip:
+                f.read(skip)
+            return f.read(end - start)
+
+    def _search_in_file(self, file_path: str, pattern: str, max_matches: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Stream a file line by line and collect regex matches.
+        
+        Patterns are matched within single lines. Scanning stops once
+        ``max_matches`` matches were found.
+        
+        Returns:
+            tuple: (matches, characters scanned, truncated)
+        """
+        try:
+            regex_pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
         
         matches = []
-        for match in regex_pattern.finditer(content):
-            start_pos = match.start()
-            end_pos = match.end()
-            
-            context_start = max(0, start_pos - context_size // 2)
-            context_end = min(len(content), end_pos + context_size // 2)
-            
-            before_context = content[context_start:start_pos]
-            match_text = content[start_pos:end_pos]
-            after_context = content[end_pos:context_end]
-            
-            line_num = content[:start_pos].count('\n') + 1
-            
-            matches.append({
-                'match_text': match_text,
-                'start_pos': start_pos,
-                'end_pos': end_pos,
-                'line_num': line_num,
-                'before_context': before_context,
-                'after_context': after_context,
-            })
-        
-        return matches
+        char_pos = 0
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, start=1):
+                text = line[:-1] if line.endswith('\n') else line
+                for match in regex_pattern.finditer(text):
+                    if len(matches) >= max_matches:
+                        return matches, char_pos, True
+                    matches.append({
+                        'match_text': match.group(0),
+                        'start_pos': char_pos + match.start(),
+                        'end_pos': char_pos + match.end(),
+                        'line_num': line_num,
+                    })
+                char_pos += len(line)
+        
+        return matches, char_pos, False
+
+    def _match_context(self, file_path: str, index: Dict[str, Any], match: Dict[str, Any],
+                       context_size: int) -> Tuple[str, str]:
+        """Return (before_context, after_context) around a match."""
+        start_pos = match['start_pos']
+        end_pos = match['end_pos']
+        context_start = max(0, start_pos - context_size // 2)
+        before_context = self._read_range(file_path, index, context_start, start_pos)
+        after_context = self._read_range(file_path, index, end_pos, end_pos + context_size // 2)
+        return before_context, after_context
 
     def _parse_action(self, action: str) -> Tuple[str, str, dict, bool]:
         """Parse action to extract operation and parameters.
@@ -269,13 +399,14 @@ class OverlongOutputTool(BaseTool):
         try:
             self._touch_file(file_path)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            matches = self._search_in_content(content, pattern, context_size)
+            matches, content_length, truncated = self._search_in_file(
+                file_path, pattern, self.max_search_matches
+            )
             
             if not matches:
-                return f"No matches found for pattern '{pattern}' in {shortuuid}\nFile size: {len(content)} characters"
+                return f"No matches found for pattern '{pattern}' in {shortuuid}\nFile size: {content_length} characters"
+            
+            index = self._get_line_index(file_path)
             
             # Create search session
             search_session_id = str(uuid.uuid4())[:8]
@@ -285,7 +416,8 @@ class OverlongOutputTool(BaseTool):
                 'matches': matches,
                 'page_size': page_size,
                 'context_size': context_size,
-                'content_length': len(content),
+                'content_length': index['length'],
+                'truncated': truncated,
                 'current_page': 1,
             }
             
@@ -295,14 +427,18 @@ class OverlongOutputTool(BaseTool):
             page_matches = matches[:page_size]
             
             result = f"Search Results in {shortuuid} (Page 1/{total_pages})\n"
-            result += f"Pattern: '{pattern}' | Total matches: {total_matches}\n"
+            result += f"Pattern: '{pattern}' | Total matches: {total_matches}"
+            if truncated:
+                result += f" (search stopped after the first {total_matches})"
+            result += "\n"
             result += f"Session ID: {search_session_id}\n"
             result += "=" * 80 + "\n\n"
             
             for i, match in enumerate(page_matches):
                 result += f"Match {i+1} (Line ~{match['line_num']}, Pos {match['start_pos']}):\n"
                 result += "-" * 60 + "\n"
-                context_text = match['before_context'] + f">>>{match['match_text']}<<<" + match['after_context']
+                before_context, after_context = self._match_context(file_path, index, match, context_size)
+                context_text = before_context + f">>>{match['match_text']}<<<" + after_context
                 result += context_text + "\n\n"
             
             result += f"Use session ID '{search_session_id}' for navigation"
@@ -331,10 +467,8 @@ class OverlongOutputTool(BaseTool):
         try:
             self._touch_file(file_path)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            total_length = len(content)
+            index = self._get_line_index(file_path)
+            total_length = index['length']
             total_pages = (total_length + page_size - 1) // page_size
             
             # Create view session
@@ -348,7 +482,7 @@ class OverlongOutputTool(BaseTool):
             
             # Get first page
             end_pos = min(page_size, total_length)
-            excerpt = content[:end_pos]
+            excerpt = self._read_range(file_path, index, 0, end_pos)
             
             result = f"Viewing {shortuuid} (Page 1/{total_pages})\n"
             result += f"Characters 0-{end_pos} of {total_length}\n"
@@ -388,7 +522,7 @@ class OverlongOutputTool(BaseTool):
             "2. Search within a file:\n"
             "<overlong_search>\n"
             "<shortuuid>file_uuid</shortuuid>\n"
-            "<pattern>regex_pattern</pattern>\n"
+            "<pattern>regex_pattern</pattern>  <!-- Matched within single lines -->\n"
             "<page_size>10</page_size>  <!-- Optional -->\n"
             "<context_size>1000</context_size>  <!-- Optional -->\n"
             "</overlong_search>\n\n"
@@ -18,7 +18,8 @@ import argparse
 import json
 import os
 import warnings
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 import datasets
 import faiss
@@ -326,6 +327,32 @@ def get_retriever(config):
         return DenseRetriever(config)
 
 
+class QueryCache:
+    """LRU of search results keyed by (retriever, query, topk).
+
+    Many parallel rollouts issue identical queries; the retrievers are
+    deterministic, so repeated queries are served from memory.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Tuple[str, str, int]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Tuple[str, str, int], value: Tuple[List[Dict], List[float]]):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
 #####################################
 # Mosec server
 #####################################
@@ -351,6 +378,7 @@ class Config:
         retrieval_query_max_length: int = 256,
         retrieval_use_fp16: bool = False,
         retrieval_batch_size: int = 128,
+        retrieval_cache_size: int = 10000,
     ):
         self.retrieval_method = retrieval_method
         self.retrieval_topk = retrieval_topk
@@ -364,6 +392,7 @@ class Config:
         self.retrieval_query_max_length = retrieval_query_max_length
         self.retrieval_use_fp16 = retrieval_use_fp16
         self.retrieval_batch_size = retrieval_batch_size
+        self.retrieval_cache_size = retrieval_cache_size
 
 
 class QueryRequest(Struct):
@@ -381,32 +410,59 @@ class RetrievalWorker(TypedMsgPackMixin, Worker):
         super().__init__()
         self.config = Config(**json.loads(os.environ.get("CONFIG")))
         self.retriever = get_retriever(self.config)
+        self.cache = QueryCache(self.config.retrieval_cache_size)
 
     def forward(self, requests: List[QueryRequest]) -> RetrievalResponse:
         """
         Perform retrieval based on the request.
+
+        mosec groups concurrent single-query requests into one call (see
+        max_batch_size/max_wait_time). Cached queries are answered from the
+        LRU and the remaining distinct queries go through one batch search
+        per topk.
         """
-        if not requests[0].topk:
-            topk = self.config.retrieval_topk  # fallback to default
-        else:
-            topk = requests[0].topk
-        return_scores = requests[0].return_scores
-
-        # Perform batch retrieval
-        query_list = [request.query for request in requests]
-        results, scores = self.retriever.batch_search(
-            query_list=query_list,
-            num=topk,
-            return_score=return_scores,
-        )
+        topks = [request.topk or self.config.retrieval_topk for request in requests]
+        keys = [
+            (self.config.retrieval_method, request.query, topk)
+            for request, topk in zip(requests, topks)
+        ]
+
+        # Collect the cache hits and the distinct uncached queries for each
+        # topk. Hits are kept locally: storing the misses below may evict them
+        # when the cache is smaller than the batch.
+        hits = {}
+        misses: Dict[int, List[str]] = {}
+        for key in keys:
+            _, query, topk = key
+            if key in hits:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                hits[key] = cached
+            elif query not in misses.setdefault(topk, []):
+                misses[topk].append(query)
+
+        found = {}
+        for topk, query_list in misses.items():
+            # Perform batch retrieval
+            results, scores = self.retriever.batch_search(
+                query_list=query_list,
+                num=topk,
+                return_score=True,
+            )
+            for query, single_result, single_scores in zip(query_list, results, scores):
+                key = (self.config.retrieval_method, query, topk)
+                found[key] = (single_result, single_scores)
+                self.cache.put(key, found[key])
 
         # Format response
         resps = []
-        for i, single_result in enumerate(results):
-            if return_scores:
+        for request, key in zip(requests, keys):
+            single_result, single_scores = hits[key] if key in hits else found[key]
+            if request.return_scores:
                 # If scores are returned, combine them with results
                 combined = []
-                for doc, score in zip(single_result, scores[i]):
+                for doc, score in zip(single_result, single_scores):
                     combined.append({"document": doc, "score": score})
                 resps.append(combined)
             else:
@@ -462,6 +518,12 @@ if __name__ == "__main__":
         default=10,
         help="Maximum batch size for the retrieval server.",
     )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=10000,
+        help="Number of query results cached per worker (0 disables caching).",
+    )
     parser.add_argument(
         "--num_workers",
         type=int,
@@ -483,6 +545,7 @@ if __name__ == "__main__":
         "retrieval_query_max_length": 256,
         "retrieval_use_fp16": True,
         "retrieval_batch_size": 512,
+        "retrieval_cache_size": args.cache_size,
     }
 
     # 2) Launch the mosec server
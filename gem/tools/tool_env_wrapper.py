@@ -15,8 +15,9 @@
 from typing import Any, List, Optional, SupportsFloat, Tuple
 
 from gem.core import Env, EnvWrapper
-from gem.tools.base_tool import BaseTool
+from gem.tools.base_tool import BaseTool, render_tool_result
 import json
+import time
 
 class ToolEnvWrapper(EnvWrapper):
     def __init__(
@@ -304,17 +305,55 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
         info["use_tool"] = False  # The initial context is not a tool result
         return obs, info, user_prompt, tool_functions
 
+    @staticmethod
+    def _tool_call_timing(
+        tool: BaseTool,
+        tool_name: str,
+        tool_call_id: str,
+        has_error: bool,
+        call_start: float,
+        render_start: float,
+        call_end: float,
+    ) -> dict[str, Any]:
+        """Build the timing record of one tool call.
+
+        Tools that report phase timings (MCPTool.last_call_timing) split the
+        execute_tool() time into queue wait, execution and result hand-off;
+        for other tools all of it counts as execution.
+        """
+        phases = getattr(tool, "last_call_timing", None) or {}
+        execute_time = render_start - call_start
+        queue_wait = phases.get("queue_wait_s", 0.0)
+        handoff = phases.get("serialization_s", 0.0)
+        return {
+            "tool": tool_name,
+            "tool_call_id": tool_call_id,
+            "server": phases.get("server", tool.tool_type),
+            "queue_wait_s": round(queue_wait, 6),
+            "execution_s": round(max(execute_time - queue_wait - handoff, 0.0), 6),
+            "serialization_s": round(handoff + (call_end - render_start), 6),
+            "total_s": round(call_end - call_start, 6),
+            "attempts": phases.get("attempts", 1),
+            "error": bool(has_error),
+        }
+
     def step_openai(
         self, 
         action: dict[str, Any], 
         verbose: bool = False,
-    ) -> Tuple[str, SupportsFloat, bool, bool, dict[str, Any]]:
+    ) -> Tuple[Any, SupportsFloat, bool, bool, dict[str, Any]]:
+        """Execute OpenAI-style tool calls.
+
+        For tool and error actions the observation is the list of messages to
+        append to the conversation (not a JSON string); structured tool
+        results are rendered to text once, when their message is built.
+        """
         tool_parsed = False
         
         # Handle error responses
         if action["type"] == "error":
             error_msg = action.get("data", ["Unknown error"])[0] if action.get("data") else "Unknown error"
-            observation = json.dumps([{"role": "assistant", "content": f"API Error: {error_msg}"}])
+            observation = [{"role": "assistant", "content": f"API Error: {error_msg}"}]
             reward = 0.0
             terminated = True  # Terminate on API errors
             truncated = False
@@ -397,6 +436,9 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
             
             # Track the last successfully executed tool
             last_executed_tool = None
+
+            # Wall time of each executed tool call (see gem.utils.tool_timing)
+            tool_timings = []
             
             # Execute each tool call
             if self.tool_use_counter < self.max_tool_uses:
@@ -408,6 +450,7 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
                     # Find the matching tool and execute it
                     tool_executed = False
                     for tool in self.tools:
+                        call_start = time.perf_counter()
                         tool_parsed, tool_execute_error, observation, returned_tool_name, returned_tool_call_id = (
                             tool.execute_tool(tool_name, tool_args, tool_call_id)
                         )
@@ -415,6 +458,15 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
                         if tool_parsed:
                             tool_executed = True
                             last_executed_tool = tool  # Track the last executed tool
+                            render_start = time.perf_counter()
+                            observation = render_tool_result(observation)
+                            call_end = time.perf_counter()
+                            tool_timings.append(
+                                self._tool_call_timing(
+                                    tool, returned_tool_name, returned_tool_call_id, tool_execute_error,
+                                    call_start, render_start, call_end,
+                                )
+                            )
                             tool_result.append({
                                 "role": "tool", 
                                 "tool_call_id": returned_tool_call_id, 
@@ -468,7 +520,7 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
                 tool_parsed = True
             else:
                 # Normal tool execution (not claim_done)
-                observation = json.dumps(tool_result)
+                observation = tool_result
                 reward += self.tool_reward
                 terminated, truncated = False, False
                 
@@ -488,6 +540,8 @@ class ToolEnvWrapperOpenAI(EnvWrapper):
                 if verbose:
                     print(f"Tools executed: {len(tool_result)}, tool use count: {self.tool_use_counter}")
                     print(f"Observation: {observation}")
+
+            info["tool_timings"] = tool_timings
         else:
             # Not a tool action, pass to environment
             observation, reward, terminated, truncated, info = self.env.step(action)
@@ -14,9 +14,15 @@
 
 """Reference: https://github.com/sail-sg/understand-r1-zero."""
 
+import atexit
+import functools
 import logging
+import multiprocessing
+import os
+import queue
 import re
 import signal
+import threading
 import types
 from itertools import islice, zip_longest
 from math import isclose
@@ -33,8 +39,51 @@ from sympy.parsing.sympy_parser import parse_expr
 
 logger = logging.getLogger(__name__)
 
+# Size of the memoization caches for normalized answers and parsed expressions.
+# Ground truths are graded against many sampled answers, so their parses are
+# reused heavily.
+GRADER_CACHE_SIZE = 4096
+
+# Number of grader timeouts raised so far (SIGALRM handlers run on the main
+# thread only). sympy, math_verify and the normalizers below catch broad
+# exceptions, so an interrupted call can still return an ordinary-looking
+# value; _grader_cache compares this counter to keep such values uncached.
+_timeouts_fired = 0
+
+
+class _Uncacheable(Exception):
+    """Raised inside a _grader_cache function to return a value uncached."""
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+
+def _grader_cache(func):
+    """lru_cache that skips errors and results computed during a timeout."""
+
+    @functools.lru_cache(maxsize=GRADER_CACHE_SIZE)
+    def cached(*args, **kwargs):
+        timeouts_fired = _timeouts_fired
+        value = func(*args, **kwargs)
+        if _timeouts_fired != timeouts_fired:
+            raise _Uncacheable(value)
+        return value
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except _Uncacheable as e:
+            return e.value
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
 
 # Dan Hendrycks' code
+@_grader_cache
 def mathd_normalize_answer(answer: Optional[str]) -> Optional[str]:
     if answer is None:
         return None
@@ -491,22 +540,43 @@ def repeatness(s: str):
     return (cnt * 2 / (n * (n + 1))) > 0.2
 
 
+def _signal_timeouts_available() -> bool:
+    """SIGALRM handlers can only be installed from the main thread."""
+    return threading.current_thread() is threading.main_thread()
+
+
 class timeout:
+    """SIGALRM-based timeout for the main thread.
+
+    Signals cannot be used from other threads, so there the context manager
+    does nothing and the caller is expected to enforce the deadline, e.g. with
+    run_with_timeout().
+    """
+
     def __init__(self, seconds=1, error_message="Timeout"):
         self.seconds = seconds
         self.error_message = error_message
+        self.enabled = False
+        self.old_handler = None
 
     def handle_timeout(self, signum, frame):
+        global _timeouts_fired
+        _timeouts_fired += 1
         raise TimeoutError(self.error_message)
 
     def __enter__(self):
-        signal.signal(signal.SIGALRM, self.handle_timeout)
-        signal.alarm(self.seconds)
+        self.enabled = _signal_timeouts_available()
+        if self.enabled:
+            self.old_handler = signal.signal(signal.SIGALRM, self.handle_timeout)
+            signal.alarm(self.seconds)
 
     def __exit__(self, type, value, traceback):
-        signal.alarm(0)
+        if self.enabled:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, self.old_handler)
 
 
+@_grader_cache
 def latex_eval(latex):
     sym = parse_latex(latex)
     val = sym.evalf()
@@ -599,7 +669,30 @@ def _is_latex_equal(str1, str2):
     return False
 
 
+@_grader_cache
+def _math_verify_parse(text: str, parsing_timeout: Optional[int]) -> tuple:
+    parsed = tuple(
+        parse(
+            text,
+            extraction_config=(
+                LatexExtractionConfig(boxed_match_priority=0),
+                ExprExtractionConfig(),
+            ),
+            fallback_mode="no_fallback",
+            extraction_mode=["first_match"],
+            parsing_timeout=parsing_timeout,
+        )
+    )
+    if not parsed:
+        # parse() also returns [] on errors and on its own timeouts
+        raise _Uncacheable(parsed)
+    return parsed
+
+
 def is_latex_equal(given_answer: str, ground_truth: str) -> bool:
+    # math_verify's own timeouts are signal-based too; outside the main thread
+    # they must be disabled, otherwise every comparison fails.
+    math_verify_timeout = 1 if _signal_timeouts_available() else None
     try:
         with timeout(1):
             try:
@@ -623,27 +716,9 @@ def is_latex_equal(given_answer: str, ground_truth: str) -> bool:
                 if not "$" in ground_truth:
                     ground_truth = f"${ground_truth}$"
                 return verify(
-                    parse(
-                        ground_truth,
-                        extraction_config=(
-                            LatexExtractionConfig(boxed_match_priority=0),
-                            ExprExtractionConfig(),
-                        ),
-                        fallback_mode="no_fallback",
-                        extraction_mode=["first_match"],
-                        parsing_timeout=1,
-                    ),
-                    parse(
-                        given_answer,
-                        extraction_config=(
-                            LatexExtractionConfig(boxed_match_priority=0),
-                            ExprExtractionConfig(),
-                        ),
-                        fallback_mode="no_fallback",
-                        extraction_mode=["first_match"],
-                        parsing_timeout=1,
-                    ),
-                    timeout_seconds=1,
+                    list(_math_verify_parse(ground_truth, math_verify_timeout)),
+                    list(_math_verify_parse(given_answer, math_verify_timeout)),
+                    timeout_seconds=math_verify_timeout,
                 )
                 # or symbolic_equal(ground_truth, given_answer)
             except Exception:
@@ -673,6 +748,7 @@ BAD_REGEXES = ["\^[0-9]+\^", "\^[0-9][0-9]+"]
 TUPLE_CHARS = "()[]"
 
 
+@_grader_cache
 def _sympy_parse(expr: str):
     """Parses an expression with sympy."""
     py_expr = expr.replace("^", "**")
@@ -685,6 +761,7 @@ def _sympy_parse(expr: str):
     )
 
 
+@_grader_cache
 def _parse_latex(expr: str) -> str:
     """Attempts to parse latex to an expression sympy can read."""
     expr = expr.replace("\\tfrac", "\\frac")
@@ -758,6 +835,7 @@ def _strip_properly_formatted_commas(expr: str):
     return next_expr
 
 
+@_grader_cache
 def _normalize(expr: str) -> str:
     """Normalize answer expressions."""
     if expr is None:
@@ -854,6 +932,7 @@ def should_allow_eval(expr: str):
     return True
 
 
+@_grader_cache
 def are_equal_under_sympy(ground_truth_normalized: str, given_normalized: str):
     are_equal = False
     try:
@@ -864,7 +943,7 @@ def are_equal_under_sympy(ground_truth_normalized: str, given_normalized: str):
             if simplified == 0:
                 are_equal = True
     except:
-        pass
+        raise _Uncacheable(are_equal)
     return are_equal
 
 
@@ -1111,6 +1190,8 @@ class TimeoutException(Exception):
 
 # The handler function that raises the exception
 def _timeout_handler(signum: int, frame: types.FrameType | None) -> None:
+    global _timeouts_fired
+    _timeouts_fired += 1
     raise TimeoutException("Function call timed out")
 
 
@@ -1153,3 +1234,152 @@ def run_with_timeout_signal(
         signal.signal(signal.SIGALRM, old_handler)
 
     return result
+
+
+def _grading_worker_loop(conn) -> None:
+    """Run grading calls sent over a pipe until it is closed."""
+    while True:
+        try:
+            func, args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = ("ok", func(*args, **kwargs))
+        except Exception as e:
+            result = ("error", repr(e))
+        conn.send(result)
+
+
+class _GradingWorker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_grading_worker_loop, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+class GradingWorkerPool:
+    """A small pool of grading processes with per-call deadlines.
+
+    Calls run in the main thread of a worker process, so the signal-based
+    timeouts inside the grader stay effective, while the deadline itself is
+    enforced from the calling process. This works from any thread (e.g. the
+    ThreadPoolExecutor of AsyncVectorEnv). A worker that overruns its deadline
+    is killed and replaced lazily; other workers, and the memoized parses they
+    hold, are reused across calls.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = num_workers or min(8, os.cpu_count() or 1)
+        self._ctx = multiprocessing.get_context()
+        # One slot per worker; None marks a worker that has not been started yet
+        self._slots: "queue.Queue[Optional[_GradingWorker]]" = queue.Queue()
+        for _ in range(self.num_workers):
+            self._slots.put(None)
+        self._workers = set()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...] = (),
+        kwargs: Dict[str, Any] = {},
+        timeout_seconds: float = 5,
+    ) -> Optional[Any]:
+        """Run a picklable function in a worker process.
+
+        Returns:
+            The result of the function call, or None if it times out or raises.
+        """
+        worker = self._slots.get()
+        try:
+            if worker is not None and not worker.process.is_alive():
+                self._kill_worker(worker)
+                worker = None
+            if worker is None:
+                worker = self._start_worker()
+            worker.conn.send((func, args, kwargs))
+            if not worker.conn.poll(timeout_seconds):
+                logger.warning(f"Function timed out after {timeout_seconds} seconds.")
+                self._kill_worker(worker)
+                worker = None
+                return None
+            status, value = worker.conn.recv()
+        except Exception as e:
+            logger.warning(f"Grading worker failed: {e}")
+            if worker is not None:
+                self._kill_worker(worker)
+                worker = None
+            return None
+        finally:
+            self._slots.put(worker)
+
+        if status == "error":
+            logger.warning(f"Function raised an exception: {value}")
+            return None
+        return value
+
+    def _start_worker(self) -> _GradingWorker:
+        worker = _GradingWorker(self._ctx)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _kill_worker(self, worker: _GradingWorker) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.kill()
+
+
+_grading_pool: Optional[GradingWorkerPool] = None
+_grading_pool_lock = threading.Lock()
+
+
+def get_grading_pool() -> GradingWorkerPool:
+    """Return the process-wide grading worker pool, creating it on first use."""
+    global _grading_pool
+    with _grading_pool_lock:
+        if _grading_pool is None:
+            _grading_pool = GradingWorkerPool()
+            atexit.register(_grading_pool.close)
+        return _grading_pool
+
+
+def run_with_timeout(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...] = (),
+    kwargs: Dict[str, Any] = {},
+    timeout_seconds: int = 5,
+) -> Optional[Any]:
+    """
+    Runs a function with a timeout from any thread.
+
+    The main thread uses the cheaper signal-based timeout; other threads, where
+    signals are unavailable, hand the call to the grading worker pool.
+
+    Args:
+        func: The function to execute. Must be picklable outside the main thread.
+        args: Positional arguments for the function.
+        kwargs: Keyword arguments for the function.
+        timeout_seconds: Maximum time allowed in seconds.
+
+    Returns:
+        The result of the function call, or None if it times out.
+    """
+    if _signal_timeouts_available():
+        return run_with_timeout_signal(func, args, kwargs, timeout_seconds)
+    return get_grading_pool().run(func, args, kwargs, timeout_seconds)
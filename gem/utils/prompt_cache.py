@@ -0,0 +1,221 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Placement of Claude prompt-caching breakpoints.
+
+A ``cache_control`` breakpoint on message ``k`` caches the prompt prefix up
+to ``k``; a later request reads that entry only if its prefix is unchanged.
+Agent loops append to the conversation, so the most useful placement is:
+
+- the last message, which lets the next request read everything sent now;
+- the longest prefix written by an earlier request that is still intact,
+  which guarantees that read even after trims, resets or many new blocks;
+- the first message (the task prompt), which survives trimming.
+
+Prefixes are tracked by content digest rather than by index, so the planner
+needs no bookkeeping when context management removes or rewrites messages.
+:func:`simulate_prompt_cache` replays a sequence of requests to estimate
+cache reads and writes offline, e.g. over recorded trajectories.
+"""
+
+import hashlib
+from typing import Any, Collection, Dict, List, Optional, Sequence
+
+from gem.utils.trajectory import message_hash
+
+# Anthropic allows 4 breakpoints per request; one is used for the tools.
+MAX_MESSAGE_CACHE_BREAKPOINTS = 3
+
+# How many earlier positions the API checks for a cache hit before a breakpoint
+CACHE_LOOKBACK = 20
+
+
+def prefix_digests(messages: Sequence[Dict[str, Any]]) -> List[str]:
+    """Return a digest identifying each prefix ``messages[: i + 1]``."""
+    digests = []
+    digest = hashlib.sha1()
+    for message in messages:
+        digest.update(message_hash(message).encode("ascii"))
+        digests.append(digest.hexdigest())
+    return digests
+
+
+class CacheBreakpointPlanner:
+    """Chooses cache_control positions for each request of an episode.
+
+    Args:
+        max_breakpoints: Number of breakpoints available for messages
+        pin_first: Keep a breakpoint on the first message
+    """
+
+    def __init__(
+        self,
+        max_breakpoints: int = MAX_MESSAGE_CACHE_BREAKPOINTS,
+        pin_first: bool = True,
+    ):
+        self.max_breakpoints = max_breakpoints
+        self.pin_first = pin_first
+        # Digests of the prefixes written by earlier requests, most recent last
+        self._written: Dict[str, None] = {}
+        # Breakpoints returned by the most recent plan() call
+        self.last_breakpoints: List[int] = []
+
+    def plan(
+        self,
+        messages: Sequence[Dict[str, Any]],
+        ineligible: Collection[int] = (),
+        prefix_stable: bool = True,
+    ) -> List[int]:
+        """Return the sorted message indices to mark with cache_control.
+
+        Args:
+            messages: Messages of the request about to be sent
+            ineligible: Indices that cannot carry cache_control
+            prefix_stable: False when context management (trimming, resets,
+                tool-result clearing) is expected to rewrite the conversation
+                before the next request. The end of the conversation is then
+                not written to the cache, since it would never be read.
+        """
+        if not messages or self.max_breakpoints <= 0:
+            return []
+        digests = prefix_digests(messages)
+        eligible = [i for i in range(len(messages)) if i not in ineligible]
+        if not eligible:
+            return []
+
+        candidates = []
+        if prefix_stable:
+            candidates.append(eligible[-1])
+        # Read point: the longest prefix still matching an earlier write
+        for i in reversed(eligible):
+            if digests[i] in self._written:
+                candidates.append(i)
+                break
+        if self.pin_first:
+            candidates.append(eligible[0])
+
+        breakpoints = []
+        for i in candidates:
+            if i not in breakpoints and len(breakpoints) < self.max_breakpoints:
+                breakpoints.append(i)
+
+        for i in breakpoints:
+            self._written.pop(digests[i], None)
+            self._written[digests[i]] = None
+        # Only recent prefixes can still be read; keep the set small
+        while len(self._written) > 4 * self.max_breakpoints:
+            self._written.pop(next(iter(self._written)))
+        self.last_breakpoints = sorted(breakpoints)
+        return self.last_breakpoints
+
+
+def cache_ineligible_indices(
+    messages: Sequence[Dict[str, Any]],
+    roles: Collection[str] = ("system", "user", "tool"),
+) -> List[int]:
+    """Return indices of OpenAI-format messages that cannot carry cache_control.
+
+    A breakpoint needs a text part to attach to, so messages of other roles
+    and messages without text content (e.g. tool-call-only assistant turns)
+    are excluded.
+    """
+    ineligible = []
+    for i, message in enumerate(messages):
+        content = message.get("content")
+        if message.get("role") not in roles:
+            ineligible.append(i)
+        elif isinstance(content, str):
+            if not content:
+                ineligible.append(i)
+        elif not (
+            isinstance(content, list)
+            and content
+            and isinstance(content[-1], dict)
+            and content[-1].get("type") == "text"
+        ):
+            ineligible.append(i)
+    return ineligible
+
+
+def mark_cache_breakpoints(
+    messages: Sequence[Dict[str, Any]], breakpoints: Collection[int]
+) -> List[Dict[str, Any]]:
+    """Return a copy of OpenAI-format messages with cache_control at breakpoints.
+
+    String content is converted to a single text part. Only the marked
+    messages are copied; the input list is not modified.
+    """
+    marked = list(messages)
+    for i in breakpoints:
+        message = dict(marked[i])
+        content = message["content"]
+        if isinstance(content, str):
+            parts = [{"type": "text", "text": content}]
+        else:
+            parts = [dict(part) for part in content]
+        parts[-1]["cache_control"] = {"type": "ephemeral"}
+        message["content"] = parts
+        marked[i] = message
+    return marked
+
+
+def simulate_prompt_cache(
+    requests: Sequence[Dict[str, Any]],
+    lookback: int = CACHE_LOOKBACK,
+) -> List[Dict[str, int]]:
+    """Estimate prompt-cache reads and writes for a sequence of requests.
+
+    Args:
+        requests: One dict per API call with ``messages``, per-message
+            ``message_tokens`` and the ``breakpoints`` that were marked
+        lookback: Positions before each breakpoint checked for a cache hit
+
+    Returns:
+        Per request: ``cache_read_tokens`` (prefix served from the cache),
+        ``cache_write_tokens`` (prefix newly written) and
+        ``uncached_tokens`` (the rest of the prompt)
+    """
+    cache = set()
+    results = []
+    for request in requests:
+        digests = prefix_digests(request["messages"])
+        tokens = request["message_tokens"]
+        prefix_tokens = []
+        total = 0
+        for count in tokens:
+            total += count
+            prefix_tokens.append(total)
+
+        breakpoints = sorted(request["breakpoints"])
+        read_idx: Optional[int] = None
+        for b in breakpoints:
+            for i in range(b, max(b - lookback, 0) - 1, -1):
+                if digests[i] in cache:
+                    if read_idx is None or i > read_idx:
+                        read_idx = i
+                    break
+
+        read = prefix_tokens[read_idx] if read_idx is not None else 0
+        written = [b for b in breakpoints if read_idx is None or b > read_idx]
+        write = prefix_tokens[written[-1]] - read if written else 0
+        cache.update(digests[b] for b in written)
+
+        results.append(
+            {
+                "cache_read_tokens": read,
+                "cache_write_tokens": write,
+                "uncached_tokens": total - read - write,
+            }
+        )
+    return results
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import copy
+import json
 import os
 import shlex
 import shutil
@@ -21,13 +22,148 @@ import sys
 import tempfile
 import uuid
 from tempfile import NamedTemporaryFile
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from gem.utils.constants import BASE_IMPORTS
 
 DEFAULT_TIMEOUT = 10
 CLI_ARG_SIZE_LIMIT = 1024 * 3
 ERROR_MSG_PREFIX = "Failed to execute program: "
+FORBIDDEN_MSG = (
+    "Execution blocked: Code contains potentially dangerous operations or imports."
+)
+
+# Driver for run_python_batch. It reads {"code", "base_imports", "inputs",
+# "timeout"} as JSON from stdin and stays warm: for each input it forks a child
+# that runs the code with fds 0/1/2 on in-memory files, as a fresh `python -c`
+# process would, while the parent waits for it, enforces the timeout and
+# writes one JSON result line per input to its own stdout. The child gets no
+# fd of that channel and the parent is made non-dumpable, so the submitted
+# code can reach neither the results nor the parent through /proc.
+BATCH_RUNNER = r"""
+import builtins, ctypes, io, json, os, signal, sys, traceback, types
+
+PR_SET_DUMPABLE = 4
+
+class _Timeout(BaseException):
+    pass
+
+def _alarm(signum, frame):
+    raise _Timeout()
+
+def _set_dumpable(value):
+    if libc.prctl(PR_SET_DUMPABLE, value, 0, 0, 0) != 0:
+        raise OSError(ctypes.get_errno(), "prctl(PR_SET_DUMPABLE) failed")
+
+def _memfile(data=b""):
+    try:
+        fd = os.memfd_create("io")
+    except (AttributeError, OSError):
+        import tempfile
+        with tempfile.TemporaryFile() as f:
+            fd = os.dup(f.fileno())
+    os.write(fd, data)
+    os.lseek(fd, 0, 0)
+    return fd
+
+def _drain(fd):
+    os.lseek(fd, 0, 0)
+    with os.fdopen(fd, "rb") as f:
+        return f.read().decode(errors="replace")
+
+def _child(code, fds):
+    # Runs in the forked child and never returns
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+    _set_dumpable(1)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+    os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+    inputs.clear()
+    sys.stdin = io.TextIOWrapper(io.FileIO(0, "r", closefd=False), encoding=encodings[0])
+    sys.stdout = io.TextIOWrapper(io.FileIO(1, "w", closefd=False), encoding=encodings[1])
+    sys.stderr = io.TextIOWrapper(
+        io.FileIO(2, "w", closefd=False), encoding=encodings[2],
+        errors="backslashreplace", line_buffering=True,
+    )
+    sys.argv = ["-c"]
+    main = types.ModuleType("__main__")
+    main.__builtins__ = builtins
+    sys.modules["__main__"] = main
+    returncode = 0
+    try:
+        exec(compile(code, "<string>", "exec"), main.__dict__)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            returncode = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException as e:
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        returncode = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            # Like the interpreter, a failed stdout flush at exit is an error
+            if stream is sys.stdout and not returncode:
+                returncode = 120
+    os._exit(returncode & 0xFF)
+
+def _run(code, stdin, timeout):
+    fds = [_memfile(stdin.encode()), _memfile(), _memfile()]
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _child(code, fds)
+        finally:
+            os._exit(1)
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    status = None
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        status = os.waitpid(pid, 0)[1]
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    except _Timeout:
+        pass
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    # Also stops anything the code left running in the background
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    timed_out = status is None
+    if timed_out:
+        status = os.waitpid(pid, 0)[1]
+    os.close(fds[0])
+    return os.waitstatus_to_exitcode(status), timed_out, _drain(fds[1]), _drain(fds[2]).strip()
+
+payload = json.loads(sys.stdin.read())
+inputs = payload.pop("inputs")
+encodings = [sys.stdin.encoding, sys.stdout.encoding, sys.stderr.encoding]
+libc = ctypes.CDLL(None, use_errno=True)
+# Keeps the children out of /proc/<ppid>/fd and /proc/<ppid>/mem; without
+# it no results are written and run_python_batch falls back to run_python
+_set_dumpable(0)
+signal.signal(signal.SIGALRM, _alarm)
+timeout = payload["timeout"]
+for index, stdin in enumerate(inputs):
+    code = payload["code"]
+    returncode, timed_out, stdout, stderr = _run(code, stdin, timeout)
+    if returncode and not timed_out and "is not defined" in stderr:
+        code = payload["base_imports"] + "\n" + code
+        returncode, timed_out, stdout, stderr = _run(code, stdin, timeout)
+    if timed_out:
+        result = [False, "", "\nExecution timed out after %s seconds." % timeout]
+    else:
+        result = [returncode == 0, stdout, stderr]
+    sys.stdout.write(json.dumps([index] + result) + "\n")
+    sys.stdout.flush()
+"""
 
 
 def check_forbidden_imports(code: str) -> bool:
@@ -71,20 +207,8 @@ def check_forbidden_imports(code: str) -> bool:
     return False
 
 
-def subprocess_run(
-    code: str,
-    cmd_list: List[str],
-    sandbox_type: str,
-    stdin: Optional[str] = None,
-    timeout: int = DEFAULT_TIMEOUT,
-):
-    # Dealing with special cases for immediate return.
-    if code == "...":
-        stdout = ""
-        stderr = "SyntaxError: invalid syntax"
-        return False, stdout, stderr
-
-    # Create a minimal environment instead of copying everything
+def _sandbox_env() -> dict:
+    """Create a minimal environment instead of copying everything."""
     original_env = os.environ.copy()
     env = {}
 
@@ -126,6 +250,23 @@ def subprocess_run(
 
     if "PYTHONPATH" in env:
         del env["PYTHONPATH"]
+    return env
+
+
+def subprocess_run(
+    code: str,
+    cmd_list: List[str],
+    sandbox_type: str,
+    stdin: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+):
+    # Dealing with special cases for immediate return.
+    if code == "...":
+        stdout = ""
+        stderr = "SyntaxError: invalid syntax"
+        return False, stdout, stderr
+
+    env = _sandbox_env()
 
     if len(code) < CLI_ARG_SIZE_LIMIT:
         temp_dir = tempfile.mkdtemp(dir=".")
@@ -169,12 +310,8 @@ def subprocess_run(
     return False, stdout, stderr
 
 
-def run_python(
-    code: str,
-    sandbox_type: str,
-    stdin: Optional[str] = None,
-    timeout: int = DEFAULT_TIMEOUT,
-):
+def _sandbox_command(sandbox_type: str) -> List[str]:
+    """Command prefix that runs `python` inside the requested sandbox."""
     if sandbox_type == "bwrap":
         command = """bwrap \
     --unshare-all \
@@ -189,14 +326,19 @@ def run_python(
         command = command.format(python_env=sys.prefix)
     elif sandbox_type == "none":
         command = ""
-        if check_forbidden_imports(code):
-            return (
-                False,
-                "",
-                "Execution blocked: Code contains potentially dangerous operations or imports.",
-            )
+    return shlex.split(command)
+
 
-    cmd_list = shlex.split(command)
+def run_python(
+    code: str,
+    sandbox_type: str,
+    stdin: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+):
+    if sandbox_type == "none" and check_forbidden_imports(code):
+        return False, "", FORBIDDEN_MSG
+
+    cmd_list = _sandbox_command(sandbox_type)
     try:
         # 1) Run the code without extra imports first
         run_success, stdout, stderr = subprocess_run(
@@ -215,3 +357,76 @@ def run_python(
             f"\nExecution timed out after {timeout} seconds.",
         )
     return run_success, stdout, stderr
+
+
+def run_python_batch(
+    code: str,
+    sandbox_type: str,
+    stdins: List[Optional[str]],
+    timeout: int = DEFAULT_TIMEOUT,
+    total_timeout: Optional[float] = None,
+) -> List[Tuple[bool, str, str]]:
+    """Run code against several stdins in a single sandboxed interpreter.
+
+    Equivalent to ``[run_python(code, sandbox_type, stdin, timeout) for stdin
+    in stdins]``, but the interpreter is started once per submission. Each
+    input runs in a child forked from that interpreter, so no state carries
+    over between inputs, and its exit status and output are collected by
+    the parent rather than reported by the submitted code. The whole batch
+    is bounded by ``total_timeout``; inputs the batch did not report on
+    (hard timeout or a crashed interpreter) are re-run individually with
+    run_python.
+
+    Returns:
+        List of (success, stdout, stderr) tuples, one per input
+    """
+    if not stdins:
+        return []
+    if code == "...":
+        return [(False, "", "SyntaxError: invalid syntax")] * len(stdins)
+    if sandbox_type == "none" and check_forbidden_imports(code):
+        return [(False, "", FORBIDDEN_MSG)] * len(stdins)
+
+    if total_timeout is None:
+        # Every input may be run twice (see the NameError retry in run_python)
+        total_timeout = 2 * timeout * len(stdins) + DEFAULT_TIMEOUT
+
+    payload = json.dumps(
+        {
+            "code": code,
+            "base_imports": BASE_IMPORTS,
+            "inputs": [stdin or "" for stdin in stdins],
+            "timeout": timeout,
+        }
+    )
+    cmd_list = _sandbox_command(sandbox_type) + ["python", "-c", BATCH_RUNNER]
+    temp_dir = tempfile.mkdtemp(dir=".")
+    try:
+        process = subprocess.Popen(
+            cmd_list,
+            cwd=temp_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=_sandbox_env(),
+        )
+        try:
+            output, _ = process.communicate(payload.encode(), timeout=total_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            output, _ = process.communicate()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    results: List[Optional[Tuple[bool, str, str]]] = [None] * len(stdins)
+    for line in output.decode(errors="replace").splitlines():
+        try:
+            index, success, stdout, stderr = json.loads(line)
+        except ValueError:
+            continue
+        results[index] = (success, stdout, stderr)
+
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = run_python(code, sandbox_type, stdins[index], timeout)
+    return results
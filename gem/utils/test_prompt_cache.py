@@ -0,0 +1,94 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Replays an agent conversation through the cache breakpoint planner."""
+
+from gem.utils.prompt_cache import (
+    CacheBreakpointPlanner,
+    cache_ineligible_indices,
+    mark_cache_breakpoints,
+    simulate_prompt_cache,
+)
+
+TOKENS_PER_MESSAGE = 10
+
+
+def _step(i):
+    return [
+        {"role": "assistant", "content": "", "tool_calls": [{"id": f"call_{i}"}]},
+        {"role": "tool", "tool_call_id": f"call_{i}", "content": f"result {i}"},
+    ]
+
+
+def _request(planner, messages, prefix_stable=True):
+    breakpoints = planner.plan(
+        messages,
+        ineligible=set(cache_ineligible_indices(messages)),
+        prefix_stable=prefix_stable,
+    )
+    return {
+        "messages": list(messages),
+        "message_tokens": [TOKENS_PER_MESSAGE] * len(messages),
+        "breakpoints": breakpoints,
+    }
+
+
+def test_growing_then_trimmed_conversation():
+    planner = CacheBreakpointPlanner()
+    messages = [{"role": "user", "content": "task"}]
+    requests = [_request(planner, messages)]
+    for i in range(5):
+        messages = messages + _step(i)
+        requests.append(_request(planner, messages))
+    # Context management is about to rewrite the conversation
+    messages = messages + _step(5)
+    requests.append(_request(planner, messages, prefix_stable=False))
+    # Trim everything but the task and the last two steps
+    messages = messages[:1] + messages[-4:]
+    requests.append(_request(planner, messages))
+    messages = messages + _step(6)
+    requests.append(_request(planner, messages))
+
+    usage = simulate_prompt_cache(requests)
+
+    # The first request writes the task; each growing request reads the
+    # previous prompt and writes only the new step
+    assert usage[0] == {"cache_read_tokens": 0, "cache_write_tokens": 10, "uncached_tokens": 0}
+    for n, stats in enumerate(usage[1:6], start=1):
+        assert stats == {
+            "cache_read_tokens": 10 * (2 * n - 1),
+            "cache_write_tokens": 20,
+            "uncached_tokens": 0,
+        }
+    # Before a rewrite the tail is not written
+    assert usage[6] == {"cache_read_tokens": 110, "cache_write_tokens": 0, "uncached_tokens": 20}
+    # After the trim only the pinned task is still cached
+    assert usage[7] == {"cache_read_tokens": 10, "cache_write_tokens": 40, "uncached_tokens": 0}
+    assert usage[8] == {"cache_read_tokens": 50, "cache_write_tokens": 20, "uncached_tokens": 0}
+
+
+def test_mark_cache_breakpoints_copies_marked_messages():
+    messages = [
+        {"role": "user", "content": "task"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "call_0"}]},
+        {"role": "tool", "tool_call_id": "call_0", "content": "result"},
+    ]
+    assert cache_ineligible_indices(messages) == [1]
+
+    marked = mark_cache_breakpoints(messages, [2])
+    assert marked[2]["content"] == [
+        {"type": "text", "text": "result", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert marked[0] is messages[0]
+    assert messages[2]["content"] == "result"
@@ -0,0 +1,94 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""tiktoken-based token counting shared by inference and analysis scripts.
+
+Encoders are built once per model, and counts are memoized per string, so
+re-estimating a growing conversation only tokenizes the messages added since
+the last estimate.
+"""
+
+import functools
+import json
+from typing import Any, List, Optional
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Number of distinct strings whose token counts are memoized
+TOKEN_COUNT_CACHE_SIZE = 16384
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(model_name: Optional[str] = None):
+    """Return the tiktoken encoder for a model, falling back to cl100k_base.
+
+    Returns None if tiktoken is not installed; token counts then fall back to
+    ~4 characters per token.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    if model_name:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            pass
+    return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+@functools.lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+def _count_tokens(text: str, encoding_name: Optional[str]) -> int:
+    if encoding_name is None:
+        return len(text) // 4
+    import tiktoken
+
+    return len(tiktoken.get_encoding(encoding_name).encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str, tokenizer=None) -> int:
+    """Count the tokens of a string.
+
+    Args:
+        text: Text to count
+        tokenizer: Encoder from get_tokenizer() (defaults to cl100k_base)
+    """
+    if tokenizer is None:
+        tokenizer = get_tokenizer()
+    return _count_tokens(text, tokenizer.name if tokenizer is not None else None)
+
+
+def estimate_item_tokens(items: List[Any], tokenizer=None) -> List[int]:
+    """Return the token cost of each element of a list.
+
+    A non-empty list is estimated as ``sum(costs) + len(items) + 1`` by
+    estimate_tokens(), which lets callers that drop elements (e.g. context
+    trimming) update the estimate without re-counting.
+    """
+    return [
+        count_tokens(json.dumps(item, ensure_ascii=False), tokenizer)
+        for item in items
+    ]
+
+
+def estimate_tokens(obj: Any, tokenizer=None) -> int:
+    """Estimate the tokens of a JSON-serializable object sent to an API.
+
+    Lists, such as message or tool lists, are estimated element by element
+    plus one token per bracket and separator, so unchanged elements hit the
+    count cache. Other objects are counted from their JSON encoding.
+    """
+    if isinstance(obj, list) and obj:
+        return sum(estimate_item_tokens(obj, tokenizer)) + len(obj) + 1
+    return count_tokens(json.dumps(obj, ensure_ascii=False), tokenizer)
@@ -0,0 +1,78 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wall-time accounting for tool calls.
+
+Each executed tool call produces one timing record (a plain dict) with the
+phases below, all in seconds:
+
+- ``queue_wait_s``: from submission until the call starts executing, i.e.
+  waiting for the event loop and for earlier calls on the same MCP client;
+- ``execution_s``: connecting to the server and running the tool, including
+  retries;
+- ``serialization_s``: handing the result back to the caller and rendering
+  it as message text;
+- ``total_s``: the whole call as seen by the environment wrapper.
+
+Records are stored per episode in token_stats.json and aggregated per tool or
+per server by :func:`summarize_tool_timings`.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List
+
+TIMING_PHASES = ("queue_wait_s", "execution_s", "serialization_s")
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize_tool_timings(
+    records: Iterable[Dict[str, Any]], key: str = "tool"
+) -> Dict[str, Dict[str, Any]]:
+    """Aggregate timing records by tool (or by ``key="server"``).
+
+    Returns:
+        Mapping from tool/server name to call and error counts, total, mean,
+        p50/p95/max call time and the summed time of each phase, ordered by
+        total time, slowest first
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        grouped.setdefault(record.get(key) or "unknown", []).append(record)
+
+    summary = {}
+    for name, group in grouped.items():
+        totals = sorted(record.get("total_s", 0.0) for record in group)
+        entry = {
+            "calls": len(group),
+            "errors": sum(1 for record in group if record.get("error")),
+            "total_s": sum(totals),
+            "mean_s": sum(totals) / len(totals),
+            "p50_s": _percentile(totals, 50),
+            "p95_s": _percentile(totals, 95),
+            "max_s": totals[-1],
+        }
+        if key != "server":
+            servers = {record.get("server") for record in group if record.get("server")}
+            entry["server"] = ", ".join(sorted(servers)) if servers else "-"
+        for phase in TIMING_PHASES:
+            entry[phase] = sum(record.get(phase, 0.0) for record in group)
+        summary[name] = entry
+    return dict(sorted(summary.items(), key=lambda item: item[1]["total_s"], reverse=True))
@@ -0,0 +1,90 @@
+# Copyright 2025 AxonRL Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed message snapshots for trajectory files.
+
+Context-management events (resets, trims, summaries) record the messages
+around the event. Instead of a full copy per event, each snapshot is stored
+as a list of message hashes under a ``<key>_refs`` field, and every distinct
+message is kept once in the trajectory's ``message_table``.
+:func:`resolve_message_refs` expands the references back to the original
+``<key>`` fields for readers.
+"""
+
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List
+
+REFS_SUFFIX = "_refs"
+
+
+def message_hash(message: Dict[str, Any]) -> str:
+    """Return a stable content hash for a message."""
+    encoded = json.dumps(message, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class MessageTable:
+    """Stores each distinct message once and hands out references to it."""
+
+    def __init__(self):
+        self.messages: Dict[str, Dict[str, Any]] = {}
+
+    def refs(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Snapshot a message list and return its references.
+
+        Messages are copied on first insertion, so later in-place edits of the
+        live conversation do not change recorded snapshots.
+        """
+        refs = []
+        for message in messages:
+            key = message_hash(message)
+            if key not in self.messages:
+                self.messages[key] = copy.deepcopy(message)
+            refs.append(key)
+        return refs
+
+
+def resolve_message_refs(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand ``<key>_refs`` fields in a trajectory's events in place.
+
+    Trajectories without a ``message_table`` are returned unchanged, so files
+    written with full snapshots keep working.
+
+    Args:
+        data: Parsed trajectory.json contents
+
+    Returns:
+        The same dictionary, with ``message_table`` removed and every event
+        reference list replaced by the referenced messages
+    """
+    table = data.pop("message_table", None)
+    if table is None:
+        return data
+
+    def resolve(value):
+        if isinstance(value, dict):
+            for key in list(value):
+                if key.endswith(REFS_SUFFIX) and isinstance(value[key], list):
+                    refs = value.pop(key)
+                    value[key[: -len(REFS_SUFFIX)]] = [table[ref] for ref in refs]
+                else:
+                    resolve(value[key])
+        elif isinstance(value, list):
+            for item in value:
+                resolve(item)
+
+    resolve(data.get("events"))
+    return data
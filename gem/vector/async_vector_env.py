@@ -15,7 +15,6 @@
 """Asynchronous (thread pool) vectorized environment execution."""
 
 from concurrent.futures import ThreadPoolExecutor
-from copy import deepcopy
 from typing import Any, Dict, Sequence, Tuple, Union
 
 import numpy as np
@@ -86,9 +85,9 @@ class AsyncVectorEnv(VectorEnv):
         self._autoreset_envs = np.logical_or(self._terminations, self._truncations)
 
         return (
-            [deepcopy(self._env_obs[i]) for i in actions.keys()],
+            self._outputs([self._env_obs[i] for i in actions.keys()]),
             np.copy(self._rewards)[active_env_indices],
             np.copy(self._terminations)[active_env_indices],
             np.copy(self._truncations)[active_env_indices],
-            [deepcopy(self._env_infos[i]) for i in actions.keys()],
+            self._outputs([self._env_infos[i] for i in actions.keys()]),
         )
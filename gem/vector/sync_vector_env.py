@@ -14,7 +14,6 @@
 
 """Synchronous (for loop) vectorized environment execution."""
 
-from copy import deepcopy
 from typing import Any, Dict, Sequence, Tuple, Union
 
 import numpy as np
@@ -68,9 +67,9 @@ class SyncVectorEnv(VectorEnv):
         self._autoreset_envs = np.logical_or(self._terminations, self._truncations)
 
         return (
-            [deepcopy(self._env_obs[i]) for i in actions.keys()],
+            self._outputs([self._env_obs[i] for i in actions.keys()]),
             np.copy(self._rewards)[active_env_indices],
             np.copy(self._terminations)[active_env_indices],
             np.copy(self._truncations)[active_env_indices],
-            [deepcopy(self._env_infos[i]) for i in actions.keys()],
+            self._outputs([self._env_infos[i] for i in actions.keys()]),
         )
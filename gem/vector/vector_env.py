@@ -22,6 +22,27 @@ from gem.core import Env, ObsType
 
 ArrayType = TypeVar("ArrayType")
 
+# Values that can be handed out without copying
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def copy_env_output(value: Any) -> Any:
+    """Copy an observation or info so callers cannot mutate env state.
+
+    Equivalent to ``deepcopy`` but skips the traversal when it cannot matter:
+    immutable values (e.g. text observations) are returned as is, and
+    dicts/lists holding only immutable values are copied shallowly.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if type(value) is dict:
+        if all(isinstance(v, _IMMUTABLE_TYPES) for v in value.values()):
+            return dict(value)
+    elif type(value) is list:
+        if all(isinstance(v, _IMMUTABLE_TYPES) for v in value):
+            return list(value)
+    return deepcopy(value)
+
 
 class AutoresetMode(Enum):
     """Enum representing the different autoreset modes, next step and same step."""
@@ -31,13 +52,21 @@ class AutoresetMode(Enum):
 
 
 class VectorEnv(Env):
-    """Defaults to NEXT_STEP AutoresetMode, see https://farama.org/Vector-Autoreset-Mode."""
+    """Defaults to NEXT_STEP AutoresetMode, see https://farama.org/Vector-Autoreset-Mode.
+
+    With ``copy=True`` (default), ``reset`` and ``step`` return copies of the
+    observations and infos, which the caller owns. With ``copy=False`` they
+    return the objects produced by the sub-envs without copying: the caller
+    must treat them as read-only, since sub-envs may keep references to them
+    (e.g. a wrapper's history) and mutating them could corrupt env state.
+    """
 
     def __init__(
         self,
         env_ids: Sequence[str],
         env_fns: Sequence[Callable[[], Env]],
         autoreset_mode: Union[str, AutoresetMode] = AutoresetMode.SAME_STEP,
+        copy: bool = True,
     ) -> None:
         super().__init__()
         self.env_ids = env_ids
@@ -45,6 +74,7 @@ class VectorEnv(Env):
         self.envs = [env_fn() for env_fn in env_fns]
         self.num_envs = len(env_fns)
         self.autoreset_mode = autoreset_mode
+        self.copy = copy
 
         # Initialize attributes used in `step` and `reset`
         self._env_obs = [None for _ in range(self.num_envs)]
@@ -76,4 +106,10 @@ class VectorEnv(Env):
         self._truncations = np.zeros((self.num_envs,), dtype=np.bool_)
         self._autoreset_envs = np.zeros((self.num_envs,), dtype=np.bool_)
 
-        return deepcopy(self._env_obs), deepcopy(self._env_infos)
+        return self._outputs(self._env_obs), self._outputs(self._env_infos)
+
+    def _outputs(self, values: Sequence[Any]) -> list:
+        """Return the observations or infos to hand to the caller."""
+        if not self.copy:
+            return list(values)
+        return [copy_env_output(value) for value in values]
@@ -21,6 +21,12 @@ from gem.core import Env, EnvWrapper
 
 WrapperObsType = TypeVar("WrapperObsType")
 
+# Number of incremental chat-template renders checked against a full render.
+# This only catches templates that are broken from the start; templates whose
+# earlier turns depend on later messages (e.g. Qwen3's last_query_index) can
+# pass these checks and drift later, so incremental rendering is opt-in.
+INCREMENTAL_RENDER_CHECKS = 2
+
 
 def maybe_add_new_line(text: str):
     if text and not text.endswith("\n"):
@@ -37,7 +43,17 @@ class ObservationWrapper(EnvWrapper):
         apply_chat_template_on_reset: bool = False,
         max_history_length: Optional[int] = None,
         tokenizer=None,
+        incremental_chat_template: bool = False,
     ):
+        """
+        Args:
+            incremental_chat_template: Render only the newest turn of the chat
+                template each step instead of the whole history. Only enable
+                this for prefix-stable templates, i.e. templates where adding
+                messages never changes the rendering of earlier ones (ChatML,
+                Qwen2.5, Llama 3, Gemma, Mistral). Ignored with a bounded
+                max_history_length.
+        """
         super().__init__(env)
         self.include_action = include_action
         self.include_chat_template = include_chat_template
@@ -48,6 +64,15 @@ class ObservationWrapper(EnvWrapper):
         self.act_queue = deque(maxlen=max_history_length)
         self.tokenizer = tokenizer
 
+        # Incremental chat-template rendering state (unbounded history only).
+        # _rendered_prefix is the template output, without generation prompt,
+        # for the conversation up to the latest observation.
+        self._incremental_render = incremental_chat_template and max_history_length is None
+        self._render_checks_left = INCREMENTAL_RENDER_CHECKS
+        self._rendered_prefix = None
+        self._rendered_actions = 0
+        self._last_message = None
+
         if include_chat_template and apply_chat_template_on_reset:
             raise ValueError(
                 "include_chat_template and apply_chat_template_on_reset cannot both be True at the same time."
@@ -66,6 +91,7 @@ class ObservationWrapper(EnvWrapper):
     def reset(self, seed: Optional[int] = None, **kwargs) -> Tuple[str, dict[str, Any]]:
         self.act_queue.clear()
         self.obs_queue.clear()
+        self._rendered_prefix = None
         obs, info = self.env.reset(seed=seed, **kwargs)
         if self.apply_chat_template_on_reset:
             obs = self.tokenizer.apply_chat_template(
@@ -94,30 +120,15 @@ class ObservationWrapper(EnvWrapper):
                 f"\n{self.obs_queue=}\n{self.act_queue=}"
             )
 
-            obs_list = list(self.obs_queue)[:-1]
-            act_list = list(self.act_queue)
-
             if self.include_chat_template:
-                chat_messages = []
-                for (o, use_tool), a in zip(obs_list, act_list):
-                    if use_tool:
-                        chat_messages.append({"role": "tool", "content": o})
-                    else:
-                        chat_messages.append({"role": "user", "content": o})
-                    chat_messages.append({"role": "assistant", "content": a})
-
-                next_obs, use_tool = self.obs_queue[-1]
-                if use_tool:
-                    chat_messages.append({"role": "tool", "content": next_obs})
-                else:
-                    chat_messages.append({"role": "user", "content": next_obs})
-
-                wrapped_obs = self.tokenizer.apply_chat_template(
-                    chat_messages,
-                    tokenize=False,
-                    add_generation_prompt=True,
-                )
+                wrapped_obs = None
+                if self._incremental_render:
+                    wrapped_obs = self._render_incremental()
+                if wrapped_obs is None:
+                    wrapped_obs = self._render(self._chat_messages())
             else:
+                obs_list = list(self.obs_queue)[:-1]
+                act_list = list(self.act_queue)
                 wrapped_obs = ""
                 for (o, use_tool), a in zip(obs_list, act_list):
                     # We may need a unified way to format tool's output,
@@ -134,3 +145,79 @@ class ObservationWrapper(EnvWrapper):
         if "suffix" in info:
             wrapped_obs = wrapped_obs + info["suffix"]
         return wrapped_obs
+
+    @staticmethod
+    def _chat_message(obs: str, use_tool: bool) -> dict[str, str]:
+        return {"role": "tool" if use_tool else "user", "content": obs}
+
+    def _chat_messages(self) -> list[dict[str, str]]:
+        """Build the chat messages for the whole history in the queues."""
+        chat_messages = []
+        for (o, use_tool), a in zip(list(self.obs_queue)[:-1], self.act_queue):
+            chat_messages.append(self._chat_message(o, use_tool))
+            chat_messages.append({"role": "assistant", "content": a})
+        chat_messages.append(self._chat_message(*self.obs_queue[-1]))
+        return chat_messages
+
+    def _render(self, chat_messages, add_generation_prompt: bool = True) -> str:
+        return self.tokenizer.apply_chat_template(
+            chat_messages,
+            tokenize=False,
+            add_generation_prompt=add_generation_prompt,
+        )
+
+    def _render_incremental(self) -> Optional[str]:
+        """Render the chat history by appending only the newest turn.
+
+        The new (action, observation) turn is rendered after the previous
+        message as an anchor, and the anchor's own rendering is stripped, so
+        role-dependent formatting (e.g. grouped tool responses) is kept. The
+        first few results are checked against a full render as a sanity
+        check; the template itself must be prefix-stable, since later drift
+        is not detected.
+
+        Returns:
+            The rendered observation, or None to fall back to a full render.
+        """
+        next_message = self._chat_message(*self.obs_queue[-1])
+        num_actions = len(self.act_queue)
+
+        if self._rendered_prefix is None or num_actions != self._rendered_actions + 1:
+            # Start (or restart) from a full render of the current history
+            chat_messages = self._chat_messages()
+            self._rendered_prefix = self._render(chat_messages, add_generation_prompt=False)
+            self._rendered_actions = num_actions
+            self._last_message = next_message
+            return None
+
+        new_messages = [
+            self._last_message,
+            {"role": "assistant", "content": self.act_queue[-1]},
+            next_message,
+        ]
+        try:
+            anchor = self._render(new_messages[:1], add_generation_prompt=False)
+            extended = self._render(new_messages, add_generation_prompt=False)
+            prompted = self._render(new_messages)
+        except Exception:
+            # Some templates reject conversations that do not start at the
+            # beginning (e.g. strict role alternation checks)
+            self._incremental_render = False
+            return None
+        if not (extended.startswith(anchor) and prompted.startswith(extended)):
+            self._incremental_render = False
+            return None
+
+        rendered_prefix = self._rendered_prefix + extended[len(anchor):]
+        wrapped_obs = rendered_prefix + prompted[len(extended):]
+
+        if self._render_checks_left > 0:
+            self._render_checks_left -= 1
+            if wrapped_obs != self._render(self._chat_messages()):
+                self._incremental_render = False
+                return None
+
+        self._rendered_prefix = rendered_prefix
+        self._rendered_actions = num_actions
+        self._last_message = next_message
+        return wrapped_obs
@@ -72,6 +72,13 @@ WRAPPER_FACTORY = {
         include_chat_template=True,
         # Requires tokenizer to be passed later
     ),
+    "concat_chat_incremental": partial(
+        ObservationWrapper,
+        include_action=True,
+        include_chat_template=True,
+        # Only for prefix-stable chat templates; requires tokenizer to be passed later
+        incremental_chat_template=True,
+    ),
     "concat_with_action": partial(
         ObservationWrapper,
         include_action=True,
@@ -87,7 +94,7 @@ WRAPPER_FACTORY = {
     "episode_tracking": EpisodeTrackingWrapper,
 }
 
-TOKENIZER_REQUIRED = ["concat_chat", "concat_chat_on_reset"]
+TOKENIZER_REQUIRED = ["concat_chat", "concat_chat_incremental", "concat_chat_on_reset"]
 
 
 def get_wrapper_fns(wrappers: str, tokenizer=None):
@@ -2,28 +2,13 @@ import json
 import numpy as np
 import os
 import glob
-import tiktoken
 import csv
 import argparse
 import sys
 
-# Initialize tokenizer
-def get_tokenizer(model_name="gpt-4o"):
-    """Get tokenizer"""
-    try:
-        return tiktoken.encoding_for_model(model_name)
-    except:
-        return tiktoken.get_encoding("cl100k_base")
-
-def count_tokens_tiktoken(text, tokenizer):
-    """Count tokens using tiktoken"""
-    if isinstance(text, str):
-        try:
-            return len(tokenizer.encode(text, disallowed_special=()))
-        except Exception as e:
-            print(f"Warning: tiktoken encoding failed: {e}")
-            return len(text.split())
-    return 0
+from gem.utils.token_count import estimate_item_tokens, estimate_tokens, get_tokenizer
+from gem.utils.tool_timing import summarize_tool_timings
+from gem.utils.trajectory import resolve_message_refs
 
 def count_tokens_simple(text):
     """Simple token counting method (split by whitespace)"""
@@ -113,7 +98,7 @@ def analyze_config_file(json_path, tokenizer):
     """Analyze a single config file (single run)"""
     try:
         with open(json_path, "r") as f:
-            data = json.load(f)
+            data = resolve_message_refs(json.load(f))
 
         stats = {
             'total_messages': 0,
@@ -146,6 +131,8 @@ def analyze_config_file(json_path, tokenizer):
             'thinking_reset_tokens_total': 0,  # Total tokens from thinking_reset
             'summary_tokens_total': 0,  # Total tokens from summary
             'has_error': False,  # Whether contains error type action (for excluding from token statistics)
+            'api_latency_s': 0.0,  # Wall time spent waiting for the LLM API
+            'tool_timings': [],  # Per-call tool timing records
         }
         
         # Check if there are error type actions in steps
@@ -362,6 +349,8 @@ def analyze_config_file(json_path, tokenizer):
                         stats['api_prompt_tokens'] = step_usage.get("prompt_tokens", 0)
                     # completion_tokens are per-step output (not cumulative), so sum them
                     stats['api_completion_tokens'] += step_usage.get("completion_tokens", 0)
+                    stats['api_latency_s'] += step_usage.get("api_latency_s", 0.0)
+                stats['tool_timings'] = stats_data.get("tool_timings", [])
             except Exception as e:
                 print(f"  Warning: Failed to load token_stats.json: {e}")
 
@@ -372,6 +361,8 @@ def analyze_config_file(json_path, tokenizer):
             stats['api_prompt_tokens'] = total_usage.get("input_tokens", 0)
             stats['api_completion_tokens'] = total_usage.get("output_tokens", 0)
             stats['api_total_cost'] = total_usage.get("total_cost_usd", 0.0) or 0.0
+            stats['api_latency_s'] = sum(step.get("api_latency_s", 0.0) for step in data.get("usage_tracking", []))
+            stats['tool_timings'] = data.get("tool_timings", [])
 
             # api_total_tokens extracted from the last step's usage_tracking (includes all token types)
             # Formula: input_tokens + cache_creation_input_tokens + cache_read_input_tokens + output_tokens
@@ -544,15 +535,19 @@ def analyze_config_file(json_path, tokenizer):
         
         if messages:
             stats['total_messages'] = len(messages)
+            # Token counts use the same structural estimate as run_react.py's
+            # context trimming: each message is counted as the JSON sent to
+            # the API, and a list of n messages costs sum + n + 1 tokens
+            message_costs = estimate_item_tokens(messages, tokenizer)
             
-            for item in messages:
+            for index, item in enumerate(messages):
                 role = item.get("role", "")
                 
                 # If encountering an assistant message, record the current cumulative tokens (before processing this assistant message)
                 if role == "assistant":
                     stats['tokens_before_each_assistant'].append({
                         'assistant_index': stats['assistant_messages'],  # Which assistant message
-                        'cumulative_tokens': stats['all_content_tokens']  # Cumulative token count
+                        'cumulative_tokens': stats['all_content_tokens'] + index + 1  # estimate_tokens(messages[:index])
                     })
 
                 # Collect all content of this message for statistics
@@ -569,7 +564,7 @@ def analyze_config_file(json_path, tokenizer):
                         # Count tool content separately
                         char_count = count_characters(content_text)
                         word_count = count_tokens_simple(content_text)
-                        token_count = count_tokens_tiktoken(content_text, tokenizer)
+                        token_count = message_costs[index]
 
                         stats['tool_content_chars'] += char_count
                         stats['tool_content_words'] += word_count
@@ -599,7 +594,7 @@ def analyze_config_file(json_path, tokenizer):
                                         # Count tool content separately
                                         char_count = count_characters(tool_content_text)
                                         word_count = count_tokens_simple(tool_content_text)
-                                        token_count = count_tokens_tiktoken(tool_content_text, tokenizer)
+                                        token_count = estimate_tokens(content_item, tokenizer)
 
                                         stats['tool_content_chars'] += char_count
                                         stats['tool_content_words'] += word_count
@@ -651,13 +646,11 @@ def analyze_config_file(json_path, tokenizer):
                 # Add this message's total content to all_content
                 if all_text_parts:
                     combined_text = "\n".join(all_text_parts)
-                    char_count = count_characters(combined_text)
-                    word_count = count_tokens_simple(combined_text)
-                    token_count = count_tokens_tiktoken(combined_text, tokenizer)
-                    
-                    stats['all_content_chars'] += char_count
-                    stats['all_content_words'] += word_count
-                    stats['all_content_tokens'] += token_count
+                    stats['all_content_chars'] += count_characters(combined_text)
+                    stats['all_content_words'] += count_tokens_simple(combined_text)
+                stats['all_content_tokens'] += message_costs[index]
+            # Brackets and separators, so the total equals estimate_tokens(messages)
+            stats['all_content_tokens'] += len(messages) + 1
         
         # Check if the last message contains context length error and whether it ended properly
         if messages and len(messages) > 0:
@@ -788,6 +781,9 @@ def analyze_config_dir(config_path, tokenizer):
         'total_reset_tokens': sum(r['reset_tokens_total'] for r in valid_runs_for_tokens),  # Total reset tokens
         'total_thinking_reset_tokens': sum(r['thinking_reset_tokens_total'] for r in valid_runs_for_tokens),  # Total thinking_reset tokens
         'total_summary_tokens': sum(r['summary_tokens_total'] for r in valid_runs_for_tokens),  # Total summary tokens
+        'total_api_latency_s': sum(r['api_latency_s'] for r in all_runs),  # Wall time waiting for the LLM API
+        'total_tool_latency_s': sum(t.get('total_s', 0.0) for r in all_runs for t in r['tool_timings']),  # Wall time in tool calls
+        'tool_timings': [t for r in all_runs for t in r['tool_timings']],  # Per-call tool timing records
         'total_api_tokens_with_trimmed': sum(r['api_total_tokens'] + r['trimmed_tokens_total'] for r in valid_runs_for_tokens),  # Including trimmed tokens
         'total_api_tokens_with_trimmed_and_reset': sum(r['api_total_tokens'] + r['trimmed_tokens_total'] + r['reset_tokens_total'] for r in valid_runs_for_tokens),  # Including trimmed and reset tokens
         'total_api_tokens_with_all_removed': sum(r['api_total_tokens'] + r['trimmed_tokens_total'] + r['reset_tokens_total'] + r['thinking_reset_tokens_total'] + r['summary_tokens_total'] for r in valid_runs_for_tokens),  # Including trimmed, reset, thinking_reset and summary tokens
@@ -875,7 +871,7 @@ print("=" * 100)
 
 # Initialize tokenizer
 print("\nInitializing tokenizer...")
-tokenizer = get_tokenizer()
+tokenizer = get_tokenizer("gpt-4o")
 
 # Store statistics for all configs
 all_configs_stats = {}
@@ -956,6 +952,9 @@ for config_dir in config_dirs:
         print(f"  Total Tool Content Tokens: {stats['total_tool_content_tokens']:,}")
         print(f"  Average Tokens per Tool Call: {stats['avg_tokens_per_tool_call']:.2f}")
         print(f"  Total All Content Tokens: {stats['total_all_content_tokens']:,}")
+        if stats['total_api_latency_s'] or stats['total_tool_latency_s']:
+            print(f"  === Latency (all runs combined) ===")
+            print(f"  LLM API Time: {stats['total_api_latency_s']:.2f}s | Tool Time: {stats['total_tool_latency_s']:.2f}s ({len(stats['tool_timings'])} timed calls)")
         
         # Display token progression statistics
         if stats['runs'] and any(run.get('tokens_before_each_assistant') for run in stats['runs']):
@@ -1337,6 +1336,24 @@ sorted_configs_avg = sorted(all_configs_stats.items(), key=lambda x: x[1]['avg_t
 for i, (config_name, stats) in enumerate(sorted_configs_avg, 1):
     print(f"{i:2d}. {config_name:12s}: Avg {stats['avg_tokens_per_tool_call']:7.2f} tokens/call | Total Tool Content tokens: {stats['total_tool_content_tokens']:8,} | Tool calls: {stats['total_tool_calls']:3d} times")
 
+# Per-tool and per-server latency (from tool_timings recorded by the inference runners)
+all_tool_timings = [t for s in all_configs_stats.values() for t in s['tool_timings']]
+tool_latency_by_tool = summarize_tool_timings(all_tool_timings)
+tool_latency_by_server = summarize_tool_timings(all_tool_timings, key="server")
+if all_tool_timings:
+    total_api_latency = sum(s['total_api_latency_s'] for s in all_configs_stats.values())
+    total_tool_latency = sum(s['total_tool_latency_s'] for s in all_configs_stats.values())
+    print(f"\n{'='*80}")
+    print(f"--- Tool Latency ---")
+    print(f"{'='*80}")
+    print(f"LLM API Time (all runs): {total_api_latency:,.2f}s | Tool Time (all runs): {total_tool_latency:,.2f}s ({len(all_tool_timings)} timed calls)")
+    print(f"\n{'Tool':40s} {'Server':20s} {'Calls':>6s} {'Errors':>6s} {'Total s':>9s} {'Mean s':>8s} {'P50 s':>8s} {'P95 s':>8s} {'Max s':>8s} {'Queue s':>9s} {'Exec s':>9s} {'Ser s':>8s}")
+    for tool_name, row in tool_latency_by_tool.items():
+        print(f"{tool_name[:40]:40s} {row['server'][:20]:20s} {row['calls']:6d} {row['errors']:6d} {row['total_s']:9.2f} {row['mean_s']:8.3f} {row['p50_s']:8.3f} {row['p95_s']:8.3f} {row['max_s']:8.3f} {row['queue_wait_s']:9.2f} {row['execution_s']:9.2f} {row['serialization_s']:8.2f}")
+    print(f"\n{'Server':40s} {'Calls':>6s} {'Errors':>6s} {'Total s':>9s} {'Mean s':>8s} {'P95 s':>8s} {'Max s':>8s}")
+    for server_name, row in tool_latency_by_server.items():
+        print(f"{server_name[:40]:40s} {row['calls']:6d} {row['errors']:6d} {row['total_s']:9.2f} {row['mean_s']:8.3f} {row['p95_s']:8.3f} {row['max_s']:8.3f}")
+
 print("\n" + "=" * 100)
 
 # Save results to file
@@ -1541,6 +1558,11 @@ for config_name, stats in all_configs_stats.items():
         "runs": runs_detail  # Add detailed metrics for each run
     }
 
+save_data["tool_latency"] = {
+    "by_tool": tool_latency_by_tool,
+    "by_server": tool_latency_by_server,
+}
+
 # Save to file
 with open(output_path, 'w', encoding='utf-8') as f:
     json.dump(save_data, f, indent=2, ensure_ascii=False)
@@ -1685,5 +1707,22 @@ with open(tokens_progression_path, 'w', newline='', encoding='utf-8') as f:
         writer.writerow([])  # Empty line separator between configs
 
 print(f"Tokens progression file saved to: {tokens_progression_path}")
+
+# Save per-tool latency CSV file
+if tool_latency_by_tool:
+    tool_latency_filename = f"tool_latency_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    tool_latency_path = os.path.join(output_dir, tool_latency_filename)
+    latency_columns = ['calls', 'errors', 'total_s', 'mean_s', 'p50_s', 'p95_s', 'max_s', 'queue_wait_s', 'execution_s', 'serialization_s']
+
+    with open(tool_latency_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Tool', 'Server'] + latency_columns)
+        for tool_name, row in tool_latency_by_tool.items():
+            writer.writerow([tool_name, row['server']] + [
+                row[column] if column in ('calls', 'errors') else f"{row[column]:.4f}"
+                for column in latency_columns
+            ])
+
+    print(f"Tool latency file saved to: {tool_latency_path}")
 print("=" * 100)
 
@@ -21,7 +21,7 @@ import importlib
 import random
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 import fire
 import anthropic
@@ -29,6 +29,8 @@ from dotenv import load_dotenv
 
 # Import all potential tools and wrappers
 from gem.tools.mcp_tool import MCPTool
+from gem.utils.prompt_cache import MAX_MESSAGE_CACHE_BREAKPOINTS, CacheBreakpointPlanner
+from gem.utils.token_count import estimate_item_tokens, estimate_tokens
 from gem.tools.mcp_server.programmatic_tool_calling.helper import ProgrammaticToolCallingTool
 from gem.tools.tool_env_wrapper import ToolEnvWrapperClaimDone, ToolEnvWrapperOpenAI
 from gem.tools.mcp_server.config_loader import build_server_config
@@ -497,20 +499,24 @@ def extract_tool_calls_for_env(claude_message: anthropic.types.Message) -> Dict[
         return {"type": "normal", "data": [content_text]}
 
 
-def convert_tool_results_to_claude(tool_results_json: str) -> List[Dict[str, Any]]:
+def convert_tool_results_to_claude(tool_results_json: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """Convert env.step_openai tool results to Claude tool_result format.
 
     Args:
-        tool_results_json: JSON string from env.step_openai, e.g.:
-            '[{"role": "tool", "tool_call_id": "...", "content": "..."}]'
+        tool_results_json: Tool messages from env.step_openai, e.g.:
+            [{"role": "tool", "tool_call_id": "...", "content": "..."}]
+            (a JSON string of the same list is also accepted)
 
     Returns:
         List of Claude tool_result content blocks
     """
-    try:
-        tool_results = json.loads(tool_results_json)
-    except (json.JSONDecodeError, TypeError):
-        return []
+    if isinstance(tool_results_json, list):
+        tool_results = tool_results_json
+    else:
+        try:
+            tool_results = json.loads(tool_results_json)
+        except (json.JSONDecodeError, TypeError):
+            return []
 
     claude_tool_results = []
     for result in tool_results:
@@ -617,20 +623,6 @@ def trim_claude_messages(
     """
     import copy
     
-    # Try to use tiktoken for token estimation
-    try:
-        import tiktoken
-        tokenizer = tiktoken.get_encoding("cl100k_base")
-        
-        def estimate_tokens(obj):
-            obj_str = json.dumps(obj, ensure_ascii=False)
-            return len(tokenizer.encode(obj_str, disallowed_special=()))
-    except ImportError:
-        # Fallback: estimate ~4 chars per token
-        def estimate_tokens(obj):
-            obj_str = json.dumps(obj, ensure_ascii=False)
-            return len(obj_str) // 4
-    
     # Calculate current token usage
     messages_tokens = estimate_tokens(claude_messages)
     tools_tokens = estimate_tokens(claude_tools) if claude_tools else 0
@@ -649,103 +641,93 @@ def trim_claude_messages(
     original_cache_breakpoints = cache_breakpoint_indices.copy()
     original_programmatic_indices = programmatic_message_indices.copy()
     
-    removed_count = 0
-    removed_indices = []  # Track which indices were removed
-    
     # Strategy: Remove assistant and user messages from the beginning (after first user message)
     # Keep the first user message (contains the task prompt)
-    while len(claude_messages) > 1:  # Keep at least the first message
-        # Calculate current token count
-        current_tokens = estimate_tokens(claude_messages)
-        current_total = current_tokens + tools_tokens
-        
+    #
+    # The removals are planned in one pass over the original list: per-message
+    # costs are computed once (estimate_tokens sums them, plus one token per
+    # message and one for the brackets), and messages are dropped in the same
+    # order a remove-and-recount loop would drop them.
+    message_costs = estimate_item_tokens(claude_messages)
+
+    # tool_use_id -> indices of user messages carrying a matching tool_result
+    tool_result_indices = {}
+    for i, msg in enumerate(claude_messages):
+        content = msg.get('content', [])
+        if msg.get('role') == 'user' and isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get('type') == 'tool_result':
+                    tool_result_indices.setdefault(block.get('tool_use_id'), []).append(i)
+
+    removed = set()
+    kept_count = len(claude_messages)
+    kept_tokens = sum(message_costs)
+    i = 1  # Start from index 1 to keep first user message
+    while i < len(claude_messages):
         # If we fit within the limit, we're done
-        if current_total <= available_context:
+        if kept_tokens + kept_count + 1 + tools_tokens <= available_context:
             break
-        
-        # Find the first assistant or tool_result user message to remove (after first user message)
-        removed_any = False
-        for i in range(1, len(claude_messages)):  # Start from index 1 to keep first user message
-            msg_role = claude_messages[i].get('role')
-            
-            if msg_role == 'assistant':
-                # Remove assistant message
-                removed_msg = claude_messages.pop(i)
-                removed_count += 1
-                removed_indices.append(i)
-                removed_any = True
-                
-                # Check if this assistant message has tool_use blocks
-                content = removed_msg.get('content', [])
-                if isinstance(content, list):
-                    tool_use_ids = set()
-                    for block in content:
-                        if isinstance(block, dict) and block.get('type') == 'tool_use':
-                            tool_use_ids.add(block.get('id'))
-                    
-                    # If there are tool_use blocks, remove corresponding tool_result messages
-                    if tool_use_ids:
-                        j = i  # Start from where we just removed
-                        while j < len(claude_messages):
-                            next_msg = claude_messages[j]
-                            if next_msg.get('role') == 'user':
-                                next_content = next_msg.get('content', [])
-                                if isinstance(next_content, list):
-                                    # Check if this user message has matching tool_result blocks
-                                    has_matching_tool_result = any(
-                                        isinstance(block, dict) and 
-                                        block.get('type') == 'tool_result' and
-                                        block.get('tool_use_id') in tool_use_ids
-                                        for block in next_content
-                                    )
-                                    if has_matching_tool_result:
-                                        claude_messages.pop(j)
-                                        removed_count += 1
-                                        removed_indices.append(j)
-                                        continue  # Don't increment j
-                            j += 1
-                break
-            
-            elif msg_role == 'user':
-                # Check if this is a tool_result user message (without corresponding assistant)
-                content = claude_messages[i].get('content', [])
-                if isinstance(content, list) and any(
-                    isinstance(block, dict) and block.get('type') == 'tool_result'
-                    for block in content
-                ):
-                    # This is an orphaned tool_result message, remove it
-                    claude_messages.pop(i)
-                    removed_count += 1
-                    removed_indices.append(i)
-                    removed_any = True
-                    break
-        
-        # If no assistant or tool_result message found to remove, we can't trim further
-        if not removed_any:
-            break
-    
+
+        if i in removed:
+            i += 1
+            continue
+
+        msg = claude_messages[i]
+        msg_role = msg.get('role')
+        content = msg.get('content', [])
+        group = []
+        if msg_role == 'assistant':
+            # Remove assistant message
+            group.append(i)
+
+            # If this assistant message has tool_use blocks, remove the
+            # following user messages with corresponding tool_result blocks
+            if isinstance(content, list):
+                tool_use_ids = set()
+                for block in content:
+                    if isinstance(block, dict) and block.get('type') == 'tool_use':
+                        tool_use_ids.add(block.get('id'))
+                group.extend(sorted({
+                    j
+                    for tool_use_id in tool_use_ids
+                    for j in tool_result_indices.get(tool_use_id, ())
+                    if j > i and j not in removed
+                }))
+        elif msg_role == 'user' and isinstance(content, list) and any(
+            isinstance(block, dict) and block.get('type') == 'tool_result'
+            for block in content
+        ):
+            # This is an orphaned tool_result message, remove it
+            group.append(i)
+
+        for j in group:
+            removed.add(j)
+            kept_count -= 1
+            kept_tokens -= message_costs[j]
+        i += 1
+
+    removed_count = len(removed)
+
+    # Map surviving indices to their new positions, dropping removed ones
+    new_positions = {}
+    for old_idx in range(len(claude_messages)):
+        if old_idx not in removed:
+            new_positions[old_idx] = len(new_positions)
+    claude_messages[:] = [msg for idx, msg in enumerate(claude_messages) if idx not in removed]
+
     # Update cache_breakpoint_indices to reflect new positions
-    # Messages were removed from the beginning, so all indices shift down
-    new_cache_breakpoints = []
-    for old_idx in cache_breakpoint_indices:
-        # Count how many removed indices were before this index
-        shift = sum(1 for removed_idx in sorted(removed_indices) if removed_idx < old_idx)
-        new_idx = old_idx - shift
-        # Only keep if the index is still valid and wasn't removed
-        if new_idx >= 0 and old_idx not in removed_indices and new_idx < len(claude_messages):
-            new_cache_breakpoints.append(new_idx)
-    
+    new_cache_breakpoints = [
+        new_positions[old_idx] for old_idx in cache_breakpoint_indices
+        if old_idx in new_positions
+    ]
     cache_breakpoint_indices.clear()
     cache_breakpoint_indices.extend(new_cache_breakpoints)
-    
+
     # Update programmatic_message_indices similarly
-    new_programmatic_indices = set()
-    for old_idx in programmatic_message_indices:
-        shift = sum(1 for removed_idx in sorted(removed_indices) if removed_idx < old_idx)
-        new_idx = old_idx - shift
-        if new_idx >= 0 and old_idx not in removed_indices and new_idx < len(claude_messages):
-            new_programmatic_indices.add(new_idx)
-    
+    new_programmatic_indices = {
+        new_positions[old_idx] for old_idx in programmatic_message_indices
+        if old_idx in new_positions
+    }
     programmatic_message_indices.clear()
     programmatic_message_indices.update(new_programmatic_indices)
     
@@ -935,6 +917,7 @@ def run_single_task(
     episode = []
     full_messages_history = []
     usage_tracking = []  # Track per-step usage and cost
+    tool_timings = []  # Track per-call tool wall time
     context_management_events = []  # Track clear_tool_uses events
     thinking_tracking = []  # Track thinking block usage per step
     trim_events = []  # Track context trimming events
@@ -1044,6 +1027,9 @@ def run_single_task(
 
         # Track cache breakpoint indices (Claude message indices where we added cache_control)
         cache_breakpoint_indices = []
+        cache_planner = CacheBreakpointPlanner(max_breakpoints=MAX_MESSAGE_CACHE_BREAKPOINTS)
+        # Prompt size of the last request, used to predict server-side tool-result clearing
+        last_prompt_tokens = 0
 
         # Track container ID for programmatic tool calling
         # Container is reused across requests to maintain state
@@ -1058,32 +1044,9 @@ def run_single_task(
             step_count += 1
             print(f"[{task_label}] Step {step_count}")
 
-            # Periodically extend cache to include more context as conversation grows
-            # IMPORTANT: Claude API allows maximum 4 cache breakpoints total
-            # We reserve 1 for tools, so we can only have 3 cache breakpoints in messages
-            should_extend_cache = step_count in [10, 20, 40, 80] or (step_count > 80 and step_count % 40 == 0)
-            MAX_MESSAGE_CACHE_BREAKPOINTS = 3
-
-            if should_extend_cache:
-                # Find a valid cache breakpoint index (not a programmatic message)
-                candidate_idx = len(claude_messages) - 1
-                # Skip programmatic message indices - they cannot have cache_control
-                while candidate_idx > 0 and candidate_idx in programmatic_message_indices:
-                    candidate_idx -= 1
-
-                if candidate_idx not in cache_breakpoint_indices and candidate_idx > 0:
-                    total_breakpoints = 1 + len(cache_breakpoint_indices)
-
-                    if total_breakpoints < MAX_MESSAGE_CACHE_BREAKPOINTS:
-                        cache_breakpoint_indices.append(candidate_idx)
-                        print(f"[{task_label}] 📦 Extending cache at step {step_count}, adding breakpoint at message index {candidate_idx}")
-                    else:
-                        removed_idx = cache_breakpoint_indices.pop(0)
-                        cache_breakpoint_indices.append(candidate_idx)
-                        print(f"[{task_label}] 📦 Extending cache at step {step_count}, replacing breakpoint at {removed_idx} with {candidate_idx}")
-
             # Trim messages if max_context_size is set and we exceed the limit
             # IMPORTANT: Trim BEFORE adding cache control, as trimming modifies cache_breakpoint_indices
+            trim_info = {}
             if max_context_size is not None:
                 trim_info = trim_claude_messages(
                     claude_messages=claude_messages,
@@ -1103,10 +1066,24 @@ def run_single_task(
                     trim_events.append(trim_event)
                     print(f"[{task_label}] Trim event recorded: removed {trim_info['removed_count']} messages")
 
+            # Place cache breakpoints (Claude API allows 4 in total, 1 is used for the tools).
+            # When trimming or tool-result clearing is about to rewrite the conversation,
+            # the end of the prompt is not written to the cache since it would not be read.
+            # Programmatic messages cannot have cache_control as they are not rendered in Claude's context
+            prefix_stable = not trim_info and not (
+                use_clear_tool_uses and last_prompt_tokens >= clear_trigger_tokens
+            )
+            cache_breakpoint_indices[:] = cache_planner.plan(
+                claude_messages,
+                ineligible=programmatic_message_indices,
+                prefix_stable=prefix_stable,
+            )
+            print(f"[{task_label}] 📦 Cache breakpoints: {cache_breakpoint_indices}")
+
             # Create a copy for API call and add cache control (do not modify original)
             import copy
             api_messages = copy.deepcopy(claude_messages)
-            add_cache_control_to_messages(api_messages, cache_first_user=True, cache_breakpoint_indices=cache_breakpoint_indices)
+            add_cache_control_to_messages(api_messages, cache_first_user=False, cache_breakpoint_indices=cache_breakpoint_indices)
 
             print(f"[{task_label}] Calling Claude API with {len(api_messages)} messages")
 
@@ -1181,6 +1158,7 @@ def run_single_task(
                     api_params["context_management"] = {"edits": edits}
 
                 # Use beta API if needed (memory tool or context management)
+                api_start = time.perf_counter()
                 if needs_beta:
                     with client.beta.messages.stream(**api_params) as stream:
                         message = stream.get_final_message()
@@ -1189,6 +1167,7 @@ def run_single_task(
                     with client.messages.stream(**api_params) as stream:
                         # Get the final message after streaming completes
                         message = stream.get_final_message()
+                api_latency = time.perf_counter() - api_start
 
                 print(f"[{task_label}] Claude API response - stop_reason: {message.stop_reason}")
 
@@ -1261,6 +1240,7 @@ def run_single_task(
                 total_usage["cache_creation_input_tokens"] += cache_creation_tokens
                 total_usage["cache_read_input_tokens"] += cache_read_tokens
                 total_usage["total_cost_usd"] += step_cost
+                last_prompt_tokens = input_tokens + cache_creation_tokens + cache_read_tokens
 
                 # Record per-step usage
                 step_usage_data = {
@@ -1269,8 +1249,10 @@ def run_single_task(
                     "output_tokens": output_tokens,
                     "cache_creation_input_tokens": cache_creation_tokens,
                     "cache_read_input_tokens": cache_read_tokens,
+                    "cache_breakpoints": list(cache_breakpoint_indices),
                     "step_cost_usd": step_cost,
                     "cumulative_cost_usd": total_usage["total_cost_usd"],
+                    "api_latency_s": round(api_latency, 6),
                 }
                 usage_tracking.append(step_usage_data)
 
@@ -1387,6 +1369,8 @@ def run_single_task(
                 env_response_for_step = env_response
 
             next_obs, reward, terminated, truncated, info = env.step_openai(env_response_for_step, verbose=True)
+            for timing in info.get("tool_timings", []):
+                tool_timings.append({"step": step_count, **timing})
 
             print(f"[{task_label}] Reward: {reward}, Terminated: {terminated}, Truncated: {truncated}")
 
@@ -1487,6 +1471,7 @@ def run_single_task(
                 "full_messages_history": full_messages_history,
                 "cache_breakpoint_indices": cache_breakpoint_indices.copy(),
                 "usage_tracking": usage_tracking,
+                "tool_timings": tool_timings,
                 "total_usage": total_usage.copy(),
                 "context_management_events": context_management_events,
                 "thinking_tracking": thinking_tracking,
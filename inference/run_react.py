@@ -56,6 +56,9 @@ for logger_name in ["mcp", "fastmcp", "mcp.server", "mcp.client", "httpx", "http
 
 # Import all potential tools and wrappers
 from gem.tools.mcp_tool import MCPTool
+from gem.utils.prompt_cache import CacheBreakpointPlanner, cache_ineligible_indices, mark_cache_breakpoints
+from gem.utils.token_count import estimate_tokens, get_tokenizer
+from gem.utils.trajectory import MessageTable
 from gem.tools.mcp_server.programmatic_tool_calling.helper import ProgrammaticToolCallingTool
 from gem.tools.tool_env_wrapper import ToolEnvWrapperClaimDone, ToolEnvWrapperOpenAI
 from gem.tools.mcp_server.config_loader import build_server_config
@@ -261,6 +264,8 @@ def make_aihubmix_api_request(
     reasoning_max_tokens: Optional[int] = None,
     reasoning_enabled: bool = True,
     reasoning_exclude: bool = False,
+    cache_planner: Optional[CacheBreakpointPlanner] = None,
+    cache_invalidation_tokens: Optional[int] = None,
     verbose: bool = False,
 ):
     """Make AIHubMix API request with retry logic.
@@ -278,6 +283,9 @@ def make_aihubmix_api_request(
         max_tokens: Maximum number of tokens to generate
         max_context_size: Maximum context size in tokens (if set, will trim messages to fit)
         context_awareness: If True, will also remove token usage user messages when trimming
+        cache_planner: If set, mark prompt-cache breakpoints (cache_control) chosen by the planner
+        cache_invalidation_tokens: Token count at which the caller's context management
+            rewrites the conversation; the end of the conversation is not cached beyond it
 
     Returns:
         Processed response object with type and data
@@ -306,6 +314,7 @@ def make_aihubmix_api_request(
     # Track whether messages were trimmed
     trimmed_messages = None
     trim_info = None  # Store trim information
+    total_estimated_tokens = None
     original_message_count = len(messages)
     
     # Prepare request data
@@ -343,23 +352,16 @@ def make_aihubmix_api_request(
     
     # Estimate tokens before making the API call
     try:
-        import tiktoken
-        # Get tokenizer
-        try:
-            tokenizer = tiktoken.encoding_for_model(model_name)
-        except:
-            tokenizer = tiktoken.get_encoding("cl100k_base")
+        tokenizer = get_tokenizer(model_name)
         
         # Calculate tokens for messages
         messages_tokens = 0
-        messages_str = json.dumps(messages, ensure_ascii=False)
-        messages_tokens = len(tokenizer.encode(messages_str, disallowed_special=()))
+        messages_tokens = estimate_tokens(messages, tokenizer)
         
         # Calculate tokens for tools if provided
         tools_tokens = 0
         if tools:
-            tools_str = json.dumps(tools, ensure_ascii=False)
-            tools_tokens = len(tokenizer.encode(tools_str, disallowed_special=()))
+            tools_tokens = estimate_tokens(tools, tokenizer)
         
         total_estimated_tokens = messages_tokens + tools_tokens
         if verbose:
@@ -380,8 +382,7 @@ def make_aihubmix_api_request(
             
             while len(current_messages) > 0:
                 # Calculate current token count
-                current_messages_str = json.dumps(current_messages, ensure_ascii=False)
-                current_tokens = len(tokenizer.encode(current_messages_str, disallowed_special=()))
+                current_tokens = estimate_tokens(current_messages, tokenizer)
                 current_total = current_tokens + tools_tokens
                 
                 # If we fit within the limit (available_context = max_context_size - max_tokens), we're done
@@ -476,8 +477,7 @@ def make_aihubmix_api_request(
                     break
             
             # Recalculate final token count
-            final_messages_str = json.dumps(messages, ensure_ascii=False)
-            final_messages_tokens = len(tokenizer.encode(final_messages_str, disallowed_special=()))
+            final_messages_tokens = estimate_tokens(messages, tokenizer)
             final_total_tokens = final_messages_tokens + tools_tokens
             
             if verbose:
@@ -545,13 +545,30 @@ def make_aihubmix_api_request(
                 'max_context_size': max_context_size,
                 'max_tokens': max_tokens,
                 'available_context': available_context,
-                'messages_after_trim_sample': copy.deepcopy(messages)  # Sample of messages after trimming
+                'messages_after_trim_sample': list(messages)  # Sample of messages after trimming
             }
 
     except Exception as e:
         if verbose:
             print(f"⚠️  Token estimation failed: {e}")
 
+    # Place prompt-cache breakpoints where the next request can read them
+    if cache_planner is not None:
+        prefix_stable = trimmed_messages is None and (
+            cache_invalidation_tokens is None
+            or total_estimated_tokens is None
+            or total_estimated_tokens < cache_invalidation_tokens
+        )
+        request_messages = json_data["messages"]
+        breakpoints = cache_planner.plan(
+            request_messages,
+            ineligible=set(cache_ineligible_indices(request_messages)),
+            prefix_stable=prefix_stable,
+        )
+        json_data["messages"] = mark_cache_breakpoints(request_messages, breakpoints)
+        if verbose:
+            print(f"🗄️  Cache breakpoints: {breakpoints}")
+
     only_setting = []  # Default
     if "moonshotai" in model_name:
         only_setting = ['moonshotai']
@@ -889,9 +906,10 @@ def perform_thinking_reset(messages: List[Dict], keep_thinking: int = 1) -> tupl
     new_messages = []
     cleared_count = 0
     total_reasoning_content_length = 0
+    indices_to_clear_set = set(indices_to_clear)
 
     for i, msg in enumerate(messages):
-        if i in indices_to_clear:
+        if i in indices_to_clear_set:
             # Check if this assistant message has reasoning fields
             # Support both 'reasoning' and 'reasoning_content' field names
             has_reasoning_content = 'reasoning_content' in msg and msg['reasoning_content']
@@ -942,6 +960,24 @@ def perform_thinking_reset(messages: List[Dict], keep_thinking: int = 1) -> tupl
     return new_messages, reset_info
 
 
+def _snapshot_trim_info(trim_info: Dict, message_table: MessageTable) -> Dict:
+    """
+    Copy trim info for a trim event, storing its message sample as references.
+
+    Args:
+        trim_info: Trim info returned by the API call helper
+        message_table: The trajectory's message table
+
+    Returns:
+        Trim info with 'messages_after_trim_sample' replaced by
+        'messages_after_trim_sample_refs'
+    """
+    snapshot = {k: v for k, v in trim_info.items() if k != 'messages_after_trim_sample'}
+    if 'messages_after_trim_sample' in trim_info:
+        snapshot['messages_after_trim_sample_refs'] = message_table.refs(trim_info['messages_after_trim_sample'])
+    return snapshot
+
+
 def perform_context_reset(messages: List[Dict], reset_ratio: float, keep_last_tool_call: bool = True) -> tuple:
     """
     Remove reset_ratio of tool calls and corresponding tool results from messages.
@@ -954,6 +990,12 @@ def perform_context_reset(messages: List[Dict], reset_ratio: float, keep_last_to
     Returns:
         Tuple of (new_messages, reset_info)
     """
+    # Index tool results by tool_call_id once, so pairing below stays linear
+    tool_result_indices_by_id = {}
+    for j, msg in enumerate(messages):
+        if msg.get('role') == 'tool':
+            tool_result_indices_by_id.setdefault(msg.get('tool_call_id'), []).append(j)
+    
     # Find all assistant messages with tool_calls and their corresponding tool results
     tool_call_pairs = []
     
@@ -962,16 +1004,15 @@ def perform_context_reset(messages: List[Dict], reset_ratio: float, keep_last_to
         msg = messages[i]
         if msg.get('role') == 'assistant' and 'tool_calls' in msg and msg['tool_calls']:
             # This is an assistant message with tool calls
-            tool_call_ids = [tc['id'] for tc in msg['tool_calls']]
+            tool_call_ids = {tc['id'] for tc in msg['tool_calls']}
             
             # Look for tool results after this message
-            j = i + 1
-            tool_results_indices = []
-            while j < len(messages):
-                if messages[j].get('role') == 'tool':
-                    if messages[j].get('tool_call_id') in tool_call_ids:
-                        tool_results_indices.append(j)
-                j += 1
+            tool_results_indices = sorted({
+                j
+                for tool_call_id in tool_call_ids
+                for j in tool_result_indices_by_id.get(tool_call_id, ())
+                if j > i
+            })
             
             tool_call_pairs.append({
                 'assistant_idx': i,
@@ -1145,7 +1186,9 @@ def run_single_task(
     summary_events = []  # Store information about summary events
     trim_events = []  # Store information about trim/truncation events
     thinking_reset_events = []  # Store information about thinking reset events
+    message_table = MessageTable()  # Messages referenced by event snapshots, stored once
     usage_tracking = []  # Store per-step API usage
+    tool_timings = []  # Store per-call tool wall time
     initial_user_message = None  # Store the initial user message for summary mode
     memory_warning_issued = False  # Track if memory warning has been issued
     tool = None  # Initialize tool to None for cleanup in finally block
@@ -1260,6 +1303,10 @@ def run_single_task(
         else:
             save_file = Path(base_task_dir) / f"config_{config_id}" / f"run_{run_id}" / "trajectory.json"
         
+        # Prompt caching for Claude models: breakpoints follow the growing conversation
+        cache_planner = CacheBreakpointPlanner() if "claude" in model.lower() else None
+        cache_invalidation_tokens = reset_size if (context_reset or context_summary or thinking_reset) else None
+
         # Run interaction loop
         done = False
         step_count = 0
@@ -1269,23 +1316,8 @@ def run_single_task(
             if verbose:
                 print(f"[Task {task_id} | {task_label}] Step {step_count}")
             
-            # Add cache control for Claude models at specific steps
-            if "claude" in model.lower() and step_count in [2, 4, 8, 16]: # claude is too cost, qwq
-                if verbose:
-                    print(f"[Task {task_id} | {task_label}] Adding cache control at step {step_count}")
-                cache_message = {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "function called",
-                            "cache_control": {"type": "ephemeral"}
-                        }
-                    ]
-                }
-                messages.append(cache_message)
-            
             # Make API request
+            api_start = time.perf_counter()
             response = make_aihubmix_api_request(
                 messages=messages,
                 model_name=model,
@@ -1302,8 +1334,11 @@ def run_single_task(
                 reasoning_max_tokens=reasoning_max_tokens,
                 reasoning_enabled=reasoning_enabled,
                 reasoning_exclude=reasoning_exclude,
+                cache_planner=cache_planner,
+                cache_invalidation_tokens=cache_invalidation_tokens,
                 verbose=verbose,
             )
+            api_latency = time.perf_counter() - api_start
 
             # Track API usage per step
             raw_resp = response.get('raw_response', {})
@@ -1316,6 +1351,10 @@ def run_single_task(
                     'total_tokens': usage.get('total_tokens', 0),
                     'prompt_cache_hit_tokens': usage.get('prompt_cache_hit_tokens', 0),
                     'prompt_cache_miss_tokens': usage.get('prompt_cache_miss_tokens', 0),
+                    'cache_read_input_tokens': usage.get('cache_read_input_tokens') or (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0),
+                    'cache_creation_input_tokens': usage.get('cache_creation_input_tokens', 0),
+                    'cache_breakpoints': list(cache_planner.last_breakpoints) if cache_planner else [],
+                    'api_latency_s': round(api_latency, 6),
                 })
 
             # Update messages if they were trimmed
@@ -1348,10 +1387,9 @@ def run_single_task(
 
                 # Record trim event if trim_info is available
                 if 'trim_info' in response and response['trim_info'] is not None:
-                    import copy
                     trim_event = {
                         'step': step_count,
-                        'trim_info': copy.deepcopy(response['trim_info']),
+                        'trim_info': _snapshot_trim_info(response['trim_info'], message_table),
                         'context': 'main_api_call'  # Distinguish from summary trim
                     }
                     trim_events.append(trim_event)
@@ -1402,6 +1440,9 @@ def run_single_task(
             else:
                 next_obs, reward, terminated, truncated, info = env.step_openai(response, verbose=verbose)
 
+            for timing in info.get("tool_timings", []):
+                tool_timings.append({'step': step_count, **timing})
+
             if verbose:
                 print("next_obs", next_obs)
                 print("reward", reward)
@@ -1414,7 +1455,9 @@ def run_single_task(
 
             if not done:
                 try:
-                    tool_results = json.loads(next_obs)
+                    # step_openai returns tool messages as a list; plain env
+                    # observations are still strings
+                    tool_results = next_obs if isinstance(next_obs, list) else json.loads(next_obs)
                     messages.extend(tool_results)
                     # Also add to full history
                     full_messages_history.extend(tool_results)
@@ -1423,22 +1466,15 @@ def run_single_task(
                     if context_awareness and max_context_size is not None:
                         # Calculate current token usage
                         try:
-                            import tiktoken
-                            # Get tokenizer
-                            try:
-                                tokenizer = tiktoken.encoding_for_model(model)
-                            except:
-                                tokenizer = tiktoken.get_encoding("cl100k_base")
+                            tokenizer = get_tokenizer(model)
 
                             # Calculate tokens for messages
-                            messages_str = json.dumps(messages, ensure_ascii=False)
-                            messages_tokens = len(tokenizer.encode(messages_str, disallowed_special=()))
+                            messages_tokens = estimate_tokens(messages, tokenizer)
 
                             # Calculate tokens for tools if provided
                             tools_tokens = 0
                             if tools:
-                                tools_str = json.dumps(tools, ensure_ascii=False)
-                                tools_tokens = len(tokenizer.encode(tools_str, disallowed_special=()))
+                                tools_tokens = estimate_tokens(tools, tokenizer)
 
                             current_tokens = messages_tokens + tools_tokens
 
@@ -1471,22 +1507,15 @@ def run_single_task(
             if context_reset and reset_size is not None and 'raw_response' in response:
                 # Calculate total_tokens using tiktoken (same method as in call_openai_with_tools)
                 try:
-                    import tiktoken
-                    # Get tokenizer
-                    try:
-                        tokenizer = tiktoken.encoding_for_model(model)
-                    except:
-                        tokenizer = tiktoken.get_encoding("cl100k_base")
+                    tokenizer = get_tokenizer(model)
 
                     # Calculate tokens for messages
-                    messages_str = json.dumps(messages, ensure_ascii=False)
-                    messages_tokens = len(tokenizer.encode(messages_str, disallowed_special=()))
+                    messages_tokens = estimate_tokens(messages, tokenizer)
 
                     # Calculate tokens for tools if provided
                     tools_tokens = 0
                     if tools:
-                        tools_str = json.dumps(tools, ensure_ascii=False)
-                        tools_tokens = len(tokenizer.encode(tools_str, disallowed_special=()))
+                        tools_tokens = estimate_tokens(tools, tokenizer)
 
                     total_tokens = messages_tokens + tools_tokens
                 except Exception as e:
@@ -1536,17 +1565,15 @@ def run_single_task(
                         
                         # Calculate tokens after reset
                         try:
-                            messages_str_after = json.dumps(messages, ensure_ascii=False)
-                            messages_tokens_after = len(tokenizer.encode(messages_str_after, disallowed_special=()))
+                            messages_tokens_after = estimate_tokens(messages, tokenizer)
                             tokens_after_reset = messages_tokens_after + tools_tokens
                         except Exception as e:
                             print(f"[Task {task_id} | {task_label}] Warning: Failed to calculate tokens after reset: {e}", file=sys.stderr)
                             tokens_after_reset = None
 
                         # Save the complete messages after reset for inspection
-                        # Deep copy to preserve the exact state at this moment
-                        import copy
-                        messages_after_reset_sample = copy.deepcopy(messages)
+                        # (as references into the trajectory's message table)
+                        messages_after_reset_sample = message_table.refs(messages)
 
                         # Record reset event
                         reset_event = {
@@ -1558,7 +1585,7 @@ def run_single_task(
                             'reset_info': reset_info,
                             'messages_before_count': len(messages_before_reset),
                             'messages_after_count': len(messages),
-                            'messages_after_reset_sample': messages_after_reset_sample
+                            'messages_after_reset_sample_refs': messages_after_reset_sample
                         }
                         reset_events.append(reset_event)
 
@@ -1577,22 +1604,15 @@ def run_single_task(
             if thinking_reset and reset_size is not None and 'raw_response' in response:
                 # Calculate total_tokens using tiktoken (same method as in call_openai_with_tools)
                 try:
-                    import tiktoken
-                    # Get tokenizer
-                    try:
-                        tokenizer = tiktoken.encoding_for_model(model)
-                    except:
-                        tokenizer = tiktoken.get_encoding("cl100k_base")
+                    tokenizer = get_tokenizer(model)
 
                     # Calculate tokens for messages
-                    messages_str = json.dumps(messages, ensure_ascii=False)
-                    messages_tokens = len(tokenizer.encode(messages_str, disallowed_special=()))
+                    messages_tokens = estimate_tokens(messages, tokenizer)
 
                     # Calculate tokens for tools if provided
                     tools_tokens = 0
                     if tools:
-                        tools_str = json.dumps(tools, ensure_ascii=False)
-                        tools_tokens = len(tokenizer.encode(tools_str, disallowed_special=()))
+                        tools_tokens = estimate_tokens(tools, tokenizer)
 
                     total_tokens = messages_tokens + tools_tokens
                 except Exception as e:
@@ -1642,17 +1662,15 @@ def run_single_task(
 
                         # Calculate tokens after thinking reset
                         try:
-                            messages_str_after = json.dumps(messages, ensure_ascii=False)
-                            messages_tokens_after = len(tokenizer.encode(messages_str_after, disallowed_special=()))
+                            messages_tokens_after = estimate_tokens(messages, tokenizer)
                             tokens_after_thinking_reset = messages_tokens_after + tools_tokens
                         except Exception as e:
                             print(f"[Task {task_id} | {task_label}] Warning: Failed to calculate tokens after thinking reset: {e}", file=sys.stderr)
                             tokens_after_thinking_reset = None
 
                         # Save the complete messages after thinking reset for inspection
-                        # Deep copy to preserve the exact state at this moment
-                        import copy
-                        messages_after_thinking_reset_sample = copy.deepcopy(messages)
+                        # (as references into the trajectory's message table)
+                        messages_after_thinking_reset_sample = message_table.refs(messages)
 
                         # Record thinking reset event
                         thinking_reset_event = {
@@ -1664,7 +1682,7 @@ def run_single_task(
                             'thinking_reset_info': thinking_reset_info,
                             'messages_before_count': len(messages_before_thinking_reset),
                             'messages_after_count': len(messages),
-                            'messages_after_thinking_reset_sample': messages_after_thinking_reset_sample
+                            'messages_after_thinking_reset_sample_refs': messages_after_thinking_reset_sample
                         }
                         thinking_reset_events.append(thinking_reset_event)
 
@@ -1682,22 +1700,15 @@ def run_single_task(
             if context_summary and reset_size is not None and 'raw_response' in response:
                 # Calculate total_tokens using tiktoken (same method as in call_openai_with_tools)
                 try:
-                    import tiktoken
-                    # Get tokenizer
-                    try:
-                        tokenizer = tiktoken.encoding_for_model(model)
-                    except:
-                        tokenizer = tiktoken.get_encoding("cl100k_base")
+                    tokenizer = get_tokenizer(model)
 
                     # Calculate tokens for messages
-                    messages_str = json.dumps(messages, ensure_ascii=False)
-                    messages_tokens = len(tokenizer.encode(messages_str, disallowed_special=()))
+                    messages_tokens = estimate_tokens(messages, tokenizer)
 
                     # Calculate tokens for tools if provided
                     tools_tokens = 0
                     if tools:
-                        tools_str = json.dumps(tools, ensure_ascii=False)
-                        tools_tokens = len(tokenizer.encode(tools_str, disallowed_special=()))
+                        tools_tokens = estimate_tokens(tools, tokenizer)
 
                     total_tokens = messages_tokens + tools_tokens
                 except Exception as e:
@@ -1775,10 +1786,9 @@ def run_single_task(
 
                         # Record trim event for summary call
                         if 'trim_info' in summary_response and summary_response['trim_info'] is not None:
-                            import copy
                             trim_event = {
                                 'step': step_count,
-                                'trim_info': copy.deepcopy(summary_response['trim_info']),
+                                'trim_info': _snapshot_trim_info(summary_response['trim_info'], message_table),
                                 'context': 'summary_api_call'  # Distinguish from main trim
                             }
                             trim_events.append(trim_event)
@@ -1814,7 +1824,7 @@ def run_single_task(
                                 'summary_request': summary_request_message,
                                 'summary_response_original': copy.deepcopy(summary_message),  # Original assistant response
                                 'summary_user_message': copy.deepcopy(summary_user_message),  # Converted to user message
-                                'messages_before_summary': copy.deepcopy(messages_before_summary),
+                                'messages_before_summary_refs': message_table.refs(messages_before_summary),
                             }
                             summary_events.append(summary_event)
 
@@ -1847,6 +1857,7 @@ def run_single_task(
                     "trim": trim_events or [],
                     "thinking_reset": thinking_reset_events or [],
                 },
+                "message_table": message_table.messages,
                 "metrics": {
                     "accuracy": reward,
                     "total_steps": step_count,
@@ -1859,7 +1870,7 @@ def run_single_task(
 
             # Save stats.json with API usage tracking (progress)
             if usage_tracking:
-                stats_data = {"usage_tracking": usage_tracking}
+                stats_data = {"usage_tracking": usage_tracking, "tool_timings": tool_timings}
                 stats_file = save_file.parent / "token_stats.json"
                 with open(stats_file, "w") as f:
                     json.dump(stats_data, f, indent=2)
@@ -1876,6 +1887,7 @@ def run_single_task(
                 "trim": trim_events or [],
                 "thinking_reset": thinking_reset_events or [],
             },
+            "message_table": message_table.messages,
             "metrics": {
                 "accuracy": reward,
                 "total_steps": step_count,
@@ -1888,7 +1900,7 @@ def run_single_task(
 
         # Save token_stats.json with API usage tracking
         if usage_tracking:
-            stats_data = {"usage_tracking": usage_tracking}
+            stats_data = {"usage_tracking": usage_tracking, "tool_timings": tool_timings}
             stats_file = save_file.parent / "token_stats.json"
             with open(stats_file, "w") as f:
                 json.dump(stats_data, f, indent=2)
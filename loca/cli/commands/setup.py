@@ -0,0 +1,80 @@
+# Copyright 2025 LOCA-bench Contributors. All Rights Reserved.
+#
+# Licensed under the MIT License.
+
+"""Setup command for LOCA-bench CLI."""
+
+from pathlib import Path
+from typing import Annotated, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def setup_command(
+    cache_dir: Annotated[
+        Optional[str],
+        typer.Option(
+            "--cache-dir",
+            help="Directory for locally installed npm packages (defaults to ~/.cache/loca/mcp_servers).",
+        ),
+    ] = None,
+    output: Annotated[
+        Optional[str],
+        typer.Option(
+            "--output",
+            "-o",
+            help="Generated launch command file (defaults to $LOCA_MCP_LAUNCH_COMMANDS or "
+            "gem/tools/mcp_server/config/launch_commands.json).",
+        ),
+    ] = None,
+) -> None:
+    """Pre-resolve launch commands for uv, uvx and npx MCP servers.
+
+    Syncs uv project environments, installs uvx packages as uv tools and npx
+    packages into a local node_modules, then records the resulting
+    interpreter and executable paths. Servers are launched through those
+    paths from then on, skipping dependency resolution at every spawn. Run
+    it again after changing server dependencies.
+
+    Example:
+        loca setup
+    """
+    from gem.tools.mcp_server.config_loader import ServerConfigLoader
+    from gem.tools.mcp_server.launch_commands import (
+        get_launch_commands_path,
+        prepare_launch_commands,
+    )
+
+    output_path = Path(output) if output else get_launch_commands_path()
+    console.print("Resolving MCP server launch commands...")
+    commands, errors = prepare_launch_commands(
+        ServerConfigLoader(),
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        path=output_path,
+    )
+
+    table = Table(title="MCP Server Launch Commands", show_header=True)
+    table.add_column("Type", style="cyan")
+    table.add_column("Target")
+    table.add_column("Launch Command", style="dim")
+
+    for kind, resolved in commands.items():
+        for target, executable in resolved.items():
+            table.add_row(kind, target, executable)
+    for key, error in errors.items():
+        kind, target = key.split(" ", 1)
+        table.add_row(kind, target, f"[red]failed:[/red] {error}")
+
+    console.print(table)
+    console.print(f"Wrote {output_path}")
+
+    if errors:
+        console.print(
+            f"[yellow]Warning:[/yellow] {len(errors)} launch command(s) could not be "
+            "resolved and will keep using uv/uvx/npx."
+        )
+        raise typer.Exit(1)
@@ -10,7 +10,7 @@ import typer
 from rich.console import Console
 
 from loca import __version__
-from loca.cli.commands import run, analyze, list_cmd, run_claude_api, run_claude_agent
+from loca.cli.commands import run, analyze, list_cmd, run_claude_api, run_claude_agent, setup
 
 console = Console()
 
@@ -57,6 +57,9 @@ app.command(name="run-claude-api", help="Run evaluations using Claude API direct
 app.command(name="run-claude-agent", help="Run evaluations using Claude Agent SDK.")(
     run_claude_agent.run_claude_agent_command
 )
+app.command(name="setup", help="Pre-resolve uv/uvx/npx MCP server launch commands.")(
+    setup.setup_command
+)
 
 
 if __name__ == "__main__":
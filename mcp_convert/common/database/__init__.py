@@ -5,7 +5,7 @@ Provides base classes and utilities for handling local file-based databases.
 """
 
 from .base import BaseDatabase
-from .json_db import JsonDatabase
+from .json_db import JsonDatabase, copy_json
 from .csv_db import CsvDatabase
 
-__all__ = ["BaseDatabase", "JsonDatabase", "CsvDatabase"]
\ No newline at end of file
+__all__ = ["BaseDatabase", "JsonDatabase", "CsvDatabase", "copy_json"]
\ No newline at end of file
@@ -2,26 +2,123 @@
 CSV database implementation for MCP Convert
 
 Handles CSV file operations with pandas integration.
+
+Parsed DataFrames are cached per process, keyed by absolute path and the
+file's (mtime_ns, size), so repeated queries against an unchanged CSV skip
+``read_csv`` and dtype inference entirely. Optionally, a columnar copy
+(feather, requires pyarrow) is written next to the data so that new processes
+can skip CSV parsing as well.
 """
 
+import os
 import pandas as pd
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .base import BaseDatabase
 
+# Process-wide cache: absolute path -> ((mtime_ns, size), DataFrame)
+_FRAME_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+COLUMNAR_CACHE_DIR = ".columnar_cache"
+
+
+def clear_frame_cache():
+    """Drop all cached DataFrames"""
+    _FRAME_CACHE.clear()
+
 
 class CsvDatabase(BaseDatabase):
     """CSV file database implementation"""
     
-    def load_data(self, filename: str) -> pd.DataFrame:
-        """Load CSV data as pandas DataFrame"""
-        file_path = self.get_file_path(filename)
+    def __init__(self, data_dir: str = "data", columnar_cache: bool = False):
+        """Initialize database
+        
+        Args:
+            data_dir: Directory holding the CSV files
+            columnar_cache: Also persist parsed frames as feather files under
+                ``<data_dir>/.columnar_cache`` (ignored if pyarrow is missing)
+        """
+        super().__init__(data_dir)
+        self.columnar_cache = columnar_cache
+    
+    def _get_frame(self, filename: str) -> pd.DataFrame:
+        """Return the cached DataFrame for a file, parsing it only when changed
+        
+        The returned frame is shared; callers must not modify it in place.
+        """
+        file_path = os.path.abspath(self.get_file_path(filename))
         try:
-            return pd.read_csv(file_path)
-        except FileNotFoundError:
+            st = os.stat(file_path)
+        except OSError:
+            _FRAME_CACHE.pop(file_path, None)
             return pd.DataFrame()
+        signature = (st.st_mtime_ns, st.st_size)
+        
+        cached = _FRAME_CACHE.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        df = self._read_columnar(filename, signature)
+        if df is None:
+            try:
+                df = pd.read_csv(file_path)
+            except Exception as e:
+                print(f"Error loading CSV {filename}: {e}")
+                return pd.DataFrame()
+            self._write_columnar(filename, signature, df)
+        
+        _FRAME_CACHE[file_path] = (signature, df)
+        return df
+    
+    def _columnar_path(self, filename: str, signature: Tuple[int, int]) -> str:
+        """Path of the feather copy for a given source file version"""
+        stem = os.path.basename(filename)
+        return os.path.join(self.data_dir, COLUMNAR_CACHE_DIR,
+                            f"{stem}.{signature[0]}_{signature[1]}.feather")
+    
+    def _read_columnar(self, filename: str, signature: Tuple[int, int]) -> Optional[pd.DataFrame]:
+        """Load the feather copy of a CSV if it matches the current version"""
+        if not self.columnar_cache:
+            return None
+        path = self._columnar_path(filename, signature)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_feather(path)
+        except Exception:
+            return None
+    
+    def _write_columnar(self, filename: str, signature: Tuple[int, int], df: pd.DataFrame):
+        """Persist a feather copy of a parsed CSV, replacing stale versions"""
+        if not self.columnar_cache:
+            return
+        path = self._columnar_path(filename, signature)
+        cache_dir = os.path.dirname(path)
+        prefix = f"{os.path.basename(filename)}."
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name in os.listdir(cache_dir):
+                if name.startswith(prefix) and name.endswith(".feather"):
+                    os.remove(os.path.join(cache_dir, name))
+            df.to_feather(path)
+        except ImportError:
+            # pyarrow not installed; keep the in-memory cache only
+            self.columnar_cache = False
         except Exception as e:
-            print(f"Error loading CSV {filename}: {e}")
-            return pd.DataFrame()
+            print(f"Warning: Could not write columnar cache for {filename}: {e}")
+    
+    def load_data(self, filename: str) -> pd.DataFrame:
+        """Load CSV data as pandas DataFrame"""
+        return self._get_frame(filename).copy()
+    
+    def get_shared_frame(self, filename: str) -> pd.DataFrame:
+        """Return the cached DataFrame for a file without copying it
+        
+        The frame is shared with every other reader and must be treated as
+        read-only; use ``load_data`` for a private copy. The same object is
+        returned until the file changes, so callers may key derived indexes
+        on its identity.
+        """
+        return self._get_frame(filename)
     
     def save_data(self, filename: str, data: pd.DataFrame) -> bool:
         """Save DataFrame to CSV file"""
@@ -31,11 +128,12 @@ class CsvDatabase(BaseDatabase):
             return True
         except Exception as e:
             print(f"Error saving CSV {filename}: {e}")
+            _FRAME_CACHE.pop(os.path.abspath(file_path), None)
             return False
     
     def load_as_records(self, filename: str) -> List[Dict[str, Any]]:
         """Load CSV data as list of dictionaries"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty:
             return []
         return df.to_dict('records')
@@ -49,7 +147,7 @@ class CsvDatabase(BaseDatabase):
     
     def query_records(self, filename: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Query CSV records with filters"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty:
             return []
         
@@ -62,7 +160,7 @@ class CsvDatabase(BaseDatabase):
     
     def get_unique_values(self, filename: str, column: str) -> List[Any]:
         """Get unique values from a column"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty or column not in df.columns:
             return []
         
@@ -70,7 +168,7 @@ class CsvDatabase(BaseDatabase):
     
     def aggregate_data(self, filename: str, group_by: str, agg_func: str, agg_column: str) -> Dict[str, Any]:
         """Aggregate data by grouping column"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty or group_by not in df.columns or agg_column not in df.columns:
             return {}
         
@@ -95,7 +193,7 @@ class CsvDatabase(BaseDatabase):
     
     def validate_columns(self, filename: str, required_columns: List[str]) -> bool:
         """Validate that CSV contains required columns"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty:
             return False
         
@@ -103,7 +201,7 @@ class CsvDatabase(BaseDatabase):
     
     def get_column_stats(self, filename: str, column: str) -> Dict[str, Any]:
         """Get statistical information about a column"""
-        df = self.load_data(filename)
+        df = self._get_frame(filename)
         if df.empty or column not in df.columns:
             return {}
         
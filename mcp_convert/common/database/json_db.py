@@ -2,18 +2,135 @@
 JSON database implementation for MCP Convert
 
 Handles JSON file operations with error handling and validation.
+
+Parsed documents are kept in memory and revalidated against the file's
+mtime/size on every access, so writes made by other processes (e.g.
+evaluators or preprocess scripts) are still picked up. In deferred-save mode
+writes only update the in-memory copy until ``flush()`` is called.
+
+Each cached document also keeps a pickled snapshot, built on first use, from
+which ``load_data`` makes private copies; one ``pickle.loads`` is cheaper
+than both copying the tree in Python and re-parsing the file.
 """
 
+import atexit
+import copy
 import json
-from typing import Any, Dict, List, Optional
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
 from .base import BaseDatabase
 
 
+def copy_json(value: Any) -> Any:
+    """Deep-copy a parsed JSON document (faster than copy.deepcopy)"""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return copy.deepcopy(value)
+
+
+def _snapshot(value: Any) -> bytes:
+    """Pickle a document for fast copying (b"" if it cannot be pickled)"""
+    try:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return b""
+
+
 class JsonDatabase(BaseDatabase):
-    """JSON file database implementation"""
+    """JSON file database implementation
+    
+    With caching enabled, ``load_data`` returns a copy of the cached
+    document, so callers may mutate the result freely; changes only become
+    visible to other readers once they are saved. Read-only callers should
+    use ``get_shared_data``, which skips the copy.
+    """
+    
+    def __init__(self, data_dir: str = "data", cache: bool = True, deferred_save: bool = False):
+        """Initialize database
+        
+        Args:
+            data_dir: Directory holding the JSON files
+            cache: Keep parsed documents in memory between calls
+            deferred_save: Only write files on ``flush()`` (implies ``cache``)
+        """
+        super().__init__(data_dir)
+        self.cache_enabled = cache or deferred_save
+        self.deferred_save = deferred_save
+        # filename -> (file signature, parsed document, pickled snapshot)
+        self._cache: Dict[str, Tuple[Optional[Tuple[int, int]], Any, Optional[bytes]]] = {}
+        self._dirty: set = set()
+        if deferred_save:
+            atexit.register(self.flush)
+    
+    def _file_signature(self, file_path: str) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def invalidate(self, filename: Optional[str] = None):
+        """Drop cached documents (all of them if no filename is given)
+        
+        Pending deferred writes are discarded for the invalidated files.
+        """
+        if filename is None:
+            self._cache.clear()
+            self._dirty.clear()
+        else:
+            self._cache.pop(filename, None)
+            self._dirty.discard(filename)
     
     def load_data(self, filename: str) -> Dict[str, Any]:
         """Load JSON data from file"""
+        if not self.cache_enabled:
+            return self._read_file(filename)
+        data = self.get_shared_data(filename)
+        cached = self._cache.get(filename)
+        if cached is None or cached[1] is not data:
+            # Not cached, e.g. because the file does not exist
+            return copy_json(data)
+        snapshot = cached[2]
+        if snapshot is None:
+            snapshot = _snapshot(data)
+            self._cache[filename] = (cached[0], data, snapshot)
+        return pickle.loads(snapshot) if snapshot else copy_json(data)
+    
+    def get_shared_data(self, filename: str) -> Any:
+        """Return the cached document for a file without copying it
+        
+        The document is shared with every other reader and must be treated
+        as read-only; use ``load_data`` for a private copy to modify and save.
+        The same object is returned until the file changes, so callers may
+        key derived indexes on its identity.
+        """
+        if not self.cache_enabled:
+            return self._read_file(filename)
+        
+        if filename in self._dirty:
+            return self._cache[filename][1]
+        
+        file_path = self.get_file_path(filename)
+        signature = self._file_signature(file_path)
+        cached = self._cache.get(filename)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+        
+        data = self._read_file(filename)
+        if signature is not None:
+            self._cache[filename] = (signature, data, None)
+        else:
+            self._cache.pop(filename, None)
+        return data
+    
+    def _read_file(self, filename: str) -> Any:
+        """Parse a JSON file from disk, returning {} on any error"""
         file_path = self.get_file_path(filename)
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -29,24 +146,59 @@ class JsonDatabase(BaseDatabase):
     
     def save_data(self, filename: str, data: Dict[str, Any]) -> bool:
         """Save JSON data to file"""
+        if self.deferred_save:
+            self._store(filename, None, data)
+            self._dirty.add(filename)
+            return True
+        return self._write_file(filename, data)
+    
+    def _write_file(self, filename: str, data: Any) -> bool:
+        """Write a document to disk and refresh its cache entry"""
         file_path = self.get_file_path(filename)
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
         except Exception as e:
             print(f"Error saving {filename}: {e}")
+            self._cache.pop(filename, None)
             return False
+        
+        if self.cache_enabled:
+            signature = self._file_signature(file_path)
+            if signature is not None:
+                self._store(filename, signature, data)
+            else:
+                self._cache.pop(filename, None)
+        return True
+    
+    def _store(self, filename: str, signature: Optional[Tuple[int, int]], data: Any):
+        """Cache a private copy of a saved document"""
+        snapshot = _snapshot(data)
+        document = pickle.loads(snapshot) if snapshot else copy_json(data)
+        self._cache[filename] = (signature, document, snapshot)
+    
+    def flush(self) -> bool:
+        """Write all pending deferred saves to disk"""
+        success = True
+        for filename in sorted(self._dirty):
+            data = self._cache[filename][1]
+            self._dirty.discard(filename)
+            if not self._write_file(filename, data):
+                success = False
+        return success
+    
+    def file_exists(self, filename: str) -> bool:
+        """Check if file exists (including files with pending deferred saves)"""
+        return filename in self._dirty or super().file_exists(filename)
     
     def get_nested_value(self, filename: str, keys: List[str], default: Any = None) -> Any:
         """Get nested value from JSON using key path"""
-        data = self.load_data(filename)
-        current = data
+        current = self.get_shared_data(filename)
         
         try:
             for key in keys:
                 current = current[key]
-            return current
+            return copy_json(current)
         except (KeyError, TypeError):
             return default
     
@@ -79,18 +231,18 @@ class JsonDatabase(BaseDatabase):
     
     def query_by_field(self, filename: str, field: str, value: Any) -> List[Dict[str, Any]]:
         """Query JSON array by field value"""
-        data = self.load_data(filename)
+        data = self.get_shared_data(filename)
         
         if isinstance(data, list):
-            return [item for item in data if isinstance(item, dict) and item.get(field) == value]
+            return [copy_json(item) for item in data if isinstance(item, dict) and item.get(field) == value]
         elif isinstance(data, dict):
-            return [item for item in data.values() if isinstance(item, dict) and item.get(field) == value]
+            return [copy_json(item) for item in data.values() if isinstance(item, dict) and item.get(field) == value]
         
         return []
     
     def validate_schema(self, filename: str, required_fields: List[str]) -> bool:
         """Validate that JSON contains required fields"""
-        data = self.load_data(filename)
+        data = self.get_shared_data(filename)
         
         if isinstance(data, dict):
             return all(field in data for field in required_fields)
@@ -100,4 +252,4 @@ class JsonDatabase(BaseDatabase):
             if isinstance(first_item, dict):
                 return all(field in first_item for field in required_fields)
         
-        return False
\ No newline at end of file
+        return False
@@ -23,6 +23,11 @@ import mcp.server.stdio
 import mcp.types as types
 
 
+# Hidden tool used by warm server pools to point a running server at the data
+# directory of the next task. It is not returned by list_tools.
+REINITIALIZE_TOOL_NAME = "__loca_reinitialize"
+
+
 class BaseMCPServer:
     """Base class for MCP server implementations"""
     
@@ -42,6 +47,8 @@ class BaseMCPServer:
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+            if name == REINITIALIZE_TOOL_NAME:
+                return await self.reinitialize(arguments)
             return await self.call_tool(name, arguments)
     
     async def list_tools(self) -> List[types.Tool]:
@@ -62,6 +69,30 @@ class BaseMCPServer:
             text=f"Tool {name} called with arguments: {arguments}"
         )]
     
+    async def reinitialize(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """Handle the hidden reinitialize tool by switching data directories"""
+        data_dir = arguments.get("data_dir")
+        if not data_dir:
+            return self.create_error_response("data_dir is required")
+        
+        try:
+            supported = self.set_data_dir(data_dir)
+        except Exception as e:
+            return self.create_error_response(f"Failed to switch data directory: {e}")
+        
+        if not supported:
+            return self.create_error_response(f"{self.server_name} does not support reinitialization")
+        return self.create_text_response(f"Data directory set to {data_dir}")
+    
+    def set_data_dir(self, data_dir: str) -> bool:
+        """Point the server at a new data directory
+        
+        Servers that keep all task state in their database override this and
+        return True; the default reports that reinitialization is unsupported,
+        so pools respawn the server instead.
+        """
+        return False
+    
     def register_tool(self, tool: types.Tool):
         """Register a tool with the server"""
         self.tools[tool.name] = tool
@@ -6,8 +6,10 @@ Handles data operations for the simplified Calendar implementation.
 
 import os
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
 
 # Add project root to path
 # project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -44,6 +46,7 @@ class CalendarDatabase:
 
         # Load events into memory for faster access
         self._events_cache = None
+        self._events_source = None
 
     def _ensure_database_initialized(self):
         """Ensure database is initialized, create if needed"""
@@ -62,21 +65,161 @@ class CalendarDatabase:
                 print("Database initialization complete", file=sys.stderr)
 
     def _load_events(self) -> List[Dict[str, Any]]:
-        """Load events from file, with caching"""
-        if self._events_cache is None:
-            self._events_cache = self.json_db.load_data(self.events_file)
+        """Load events from file, with caching
+
+        The JSON layer revalidates the file on every call and hands out the
+        same shared document until events.json changes, so the in-memory
+        indexes are only rebuilt when another process rewrites the file.
+        """
+        source = self.json_db.get_shared_data(self.events_file)
+        if self._events_cache is None or source is not self._events_source:
+            self._events_source = source
+            # Private copy, since create/update/delete modify it in place
+            raw = self.json_db.load_data(self.events_file)
             # Ensure it's a list
-            if not isinstance(self._events_cache, list):
-                self._events_cache = []
+            self._events_cache = raw if isinstance(raw, list) else []
+            self._build_indexes()
         return self._events_cache
 
     def _save_events(self, events: List[Dict[str, Any]]) -> bool:
         """Save events to file and update cache"""
         success = self.json_db.save_data(self.events_file, events)
         if success:
-            self._events_cache = events
+            if events is not self._events_cache:
+                self._events_cache = events
+                self._build_indexes()
+            self._events_source = self.json_db.get_shared_data(self.events_file)
         return success
 
+    # ====================== Event Indexes ======================
+
+    def _build_indexes(self):
+        """Build ID and start-time indexes over the cached events
+
+        Every event gets a sequence number reflecting its position in the file,
+        which keeps results in file order wherever the original linear scans
+        did. Timed events are kept sorted by parsed start datetime and all-day
+        events by date string, so range queries are two bisections.
+        """
+        self._seq_to_event: Dict[int, Dict[str, Any]] = {}
+        self._ids_to_seqs: Dict[str, List[int]] = {}
+        self._timed_index: List[Tuple[datetime, int]] = []
+        self._all_day_index: List[Tuple[str, int]] = []
+        self._start_key_index: List[Tuple[str, int]] = []
+        self._index_entries: Dict[int, Tuple[Any, ...]] = {}
+        self._max_numeric_id = 0
+        self._next_seq = 0
+
+        for event in self._events_cache:
+            self._index_event(self._next_seq, event, keep_sorted=False)
+            self._next_seq += 1
+
+        self._timed_index.sort()
+        self._all_day_index.sort()
+        self._start_key_index.sort()
+
+    def _index_event(self, seq: int, event: Dict[str, Any], keep_sorted: bool = True):
+        """Add one event to all indexes"""
+        self._seq_to_event[seq] = event
+
+        event_id = event.get("id", "")
+        seqs = self._ids_to_seqs.setdefault(event_id, [])
+        if keep_sorted:
+            insort(seqs, seq)
+        else:
+            seqs.append(seq)
+        id_num = self._numeric_id(event_id)
+        if id_num is not None and self._max_numeric_id is not None:
+            self._max_numeric_id = max(self._max_numeric_id, id_num)
+
+        start_info = event.get("start") or {}
+        start_key = (start_info.get("dateTime") or start_info.get("date") or "") if isinstance(start_info, dict) else ""
+        if "date" in start_info:
+            time_entry = ("date", (start_info["date"], seq))
+            target = self._all_day_index
+        elif "dateTime" in start_info:
+            time_entry = ("dateTime", (self._parse_datetime(start_info["dateTime"]), seq))
+            target = self._timed_index
+        else:
+            time_entry = None
+            target = None
+
+        if keep_sorted:
+            if target is not None:
+                insort(target, time_entry[1])
+            insort(self._start_key_index, (start_key, seq))
+        else:
+            if target is not None:
+                target.append(time_entry[1])
+            self._start_key_index.append((start_key, seq))
+
+        self._index_entries[seq] = (event_id, time_entry, start_key)
+
+    def _unindex_event(self, seq: int):
+        """Remove one event from all indexes"""
+        event_id, time_entry, start_key = self._index_entries.pop(seq)
+        del self._seq_to_event[seq]
+
+        seqs = self._ids_to_seqs.get(event_id, [])
+        if seq in seqs:
+            seqs.remove(seq)
+        if not seqs:
+            self._ids_to_seqs.pop(event_id, None)
+            if self._numeric_id(event_id) == self._max_numeric_id:
+                # Recomputed lazily so IDs of deleted events can be reused
+                self._max_numeric_id = None
+
+        if time_entry is not None:
+            target = self._all_day_index if time_entry[0] == "date" else self._timed_index
+            self._remove_sorted(target, time_entry[1])
+        self._remove_sorted(self._start_key_index, (start_key, seq))
+
+    @staticmethod
+    def _numeric_id(event_id: Any) -> Optional[int]:
+        """Numeric part of an "event_NNN" ID, or None"""
+        if isinstance(event_id, str) and event_id.startswith("event_"):
+            try:
+                return int(event_id.split("_")[1])
+            except:
+                pass
+        return None
+
+    @staticmethod
+    def _remove_sorted(index: List[Tuple[Any, int]], entry: Tuple[Any, int]):
+        """Remove an entry from a sorted index list"""
+        pos = bisect_left(index, entry)
+        if pos < len(index) and index[pos] == entry:
+            index.pop(pos)
+
+    def _find_seq(self, event_id: str) -> Optional[int]:
+        """Return the sequence number of the first event with this ID"""
+        seqs = self._ids_to_seqs.get(event_id)
+        return seqs[0] if seqs else None
+
+    def _seqs_in_range(self, time_min: str = None, time_max: str = None) -> List[int]:
+        """Sequence numbers of events matching a time range (inclusive)
+
+        Mirrors _compare_datetime: all-day events compare by date string,
+        timed events by parsed datetime, and events without a start only
+        match when no bound is given.
+        """
+        if time_min is None and time_max is None:
+            return list(self._seq_to_event.keys())
+
+        min_date = time_min.split('T')[0] if time_min else None
+        max_date = time_max.split('T')[0] if time_max else None
+        lo = bisect_left(self._all_day_index, min_date, key=itemgetter(0)) if min_date else 0
+        hi = bisect_right(self._all_day_index, max_date, key=itemgetter(0)) if max_date else len(self._all_day_index)
+        seqs = [seq for _, seq in self._all_day_index[lo:hi]]
+
+        min_dt = self._parse_datetime(time_min) if time_min else None
+        max_dt = self._parse_datetime(time_max) if time_max else None
+        lo = bisect_left(self._timed_index, min_dt, key=itemgetter(0)) if min_dt else 0
+        hi = bisect_right(self._timed_index, max_dt, key=itemgetter(0)) if max_dt else len(self._timed_index)
+        seqs.extend(seq for _, seq in self._timed_index[lo:hi])
+
+        return seqs
+
     def _parse_datetime(self, dt_string: str) -> datetime:
         """Parse ISO format datetime string, always return timezone-aware datetime"""
         # Handle both with and without timezone
@@ -137,54 +280,45 @@ class CalendarDatabase:
 
     def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific event by ID"""
-        events = self._load_events()
-        for event in events:
-            if event.get("id") == event_id:
-                return event.copy()
-        return None
+        self._load_events()
+        seq = self._find_seq(event_id)
+        if seq is None:
+            return None
+        return self._seq_to_event[seq].copy()
 
     def list_events(self, time_min: str = None, time_max: str = None,
                    max_results: int = None, order_by: str = "startTime") -> List[Dict[str, Any]]:
         """List events within a time range"""
-        events = self._load_events()
-
-        # Filter by time range
-        filtered_events = [
-            event.copy() for event in events
-            if self._compare_datetime(event, time_min, time_max)
-        ]
+        self._load_events()
 
         # Sort events
         if order_by == "startTime":
-            def get_start_key(event):
-                start = event.get("start", {})
-                return start.get("dateTime") or start.get("date") or ""
-            filtered_events.sort(key=get_start_key)
+            if time_min is None and time_max is None:
+                ordered = [seq for _, seq in self._start_key_index]
+            else:
+                seqs = self._seqs_in_range(time_min, time_max)
+                ordered = sorted(seqs, key=lambda seq: (self._index_entries[seq][2], seq))
         elif order_by == "updated":
-            filtered_events.sort(key=lambda e: e.get("updated", ""))
+            seqs = sorted(self._seqs_in_range(time_min, time_max))
+            ordered = sorted(seqs, key=lambda seq: self._seq_to_event[seq].get("updated", ""))
+        else:
+            ordered = sorted(self._seqs_in_range(time_min, time_max))
 
         # Limit results
         if max_results and max_results > 0:
-            filtered_events = filtered_events[:max_results]
+            ordered = ordered[:max_results]
 
-        return filtered_events
+        return [self._seq_to_event[seq].copy() for seq in ordered]
 
     def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new event"""
         events = self._load_events()
 
         # Generate new event ID
-        max_id = 0
-        for event in events:
-            event_id = event.get("id", "")
-            if event_id.startswith("event_"):
-                try:
-                    id_num = int(event_id.split("_")[1])
-                    max_id = max(max_id, id_num)
-                except:
-                    pass
-
-        new_id = f"event_{max_id + 1:03d}"
+        if self._max_numeric_id is None:
+            id_nums = [self._numeric_id(event_id) for event_id in self._ids_to_seqs]
+            self._max_numeric_id = max([n for n in id_nums if n is not None], default=0)
+        new_id = f"event_{self._max_numeric_id + 1:03d}"
 
         # Add metadata
         now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
@@ -206,6 +340,8 @@ class CalendarDatabase:
         }
 
         events.append(new_event)
+        self._index_event(self._next_seq, new_event)
+        self._next_seq += 1
         self._save_events(events)
 
         return new_event.copy()
@@ -214,34 +350,42 @@ class CalendarDatabase:
         """Update an existing event"""
         events = self._load_events()
 
-        for i, event in enumerate(events):
-            if event.get("id") == event_id:
-                # Update fields
-                for key, value in updates.items():
-                    if value is not None:  # Only update if value is provided
-                        event[key] = value
+        seq = self._find_seq(event_id)
+        if seq is None:
+            return None
 
-                # Update timestamp
-                event["updated"] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        event = self._seq_to_event[seq]
+        self._unindex_event(seq)
 
-                events[i] = event
-                self._save_events(events)
+        # Update fields
+        for key, value in updates.items():
+            if value is not None:  # Only update if value is provided
+                event[key] = value
 
-                return event.copy()
+        # Update timestamp
+        event["updated"] = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
-        return None
+        self._index_event(seq, event)
+        self._save_events(events)
+
+        return event.copy()
 
     def delete_event(self, event_id: str) -> bool:
         """Delete an event"""
         events = self._load_events()
 
-        for i, event in enumerate(events):
-            if event.get("id") == event_id:
-                events.pop(i)
-                self._save_events(events)
-                return True
+        seq = self._find_seq(event_id)
+        if seq is None:
+            return False
 
-        return False
+        event = self._seq_to_event[seq]
+        self._unindex_event(seq)
+        for i, candidate in enumerate(events):
+            if candidate is event:
+                events.pop(i)
+                break
+        self._save_events(events)
+        return True
 
     def get_all_events(self) -> List[Dict[str, Any]]:
         """Get all events"""
@@ -263,7 +407,7 @@ class CalendarDatabase:
 
         # Count upcoming vs past events
         now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-        upcoming = sum(1 for e in events if self._compare_datetime(e, time_min=now))
+        upcoming = len(self._seqs_in_range(time_min=now))
         stats["upcoming_events"] = upcoming
         stats["past_events"] = len(events) - upcoming
 
@@ -146,6 +146,34 @@ class TestCalendarDatabase(BaseDataTest):
         retrieved = database_instance.get_event(event_id)
         assert retrieved["summary"] == "Updated Event"
 
+    def test_update_event_moves_time_range(self, database_instance):
+        """Test that range queries follow an event whose start time changed"""
+        event_data = {
+            "summary": "Movable Event",
+            "start": {"dateTime": "2026-03-02T10:00:00-07:00"},
+            "end": {"dateTime": "2026-03-02T11:00:00-07:00"}
+        }
+        created = database_instance.create_event(event_data)
+        event_id = created["id"]
+
+        database_instance.update_event(event_id, {
+            "start": {"dateTime": "2026-03-09T10:00:00-07:00"},
+            "end": {"dateTime": "2026-03-09T11:00:00-07:00"}
+        })
+
+        old_day = database_instance.list_events(
+            time_min="2026-03-02T00:00:00-07:00",
+            time_max="2026-03-03T00:00:00-07:00"
+        )
+        new_day = database_instance.list_events(
+            time_min="2026-03-09T00:00:00-07:00",
+            time_max="2026-03-10T00:00:00-07:00"
+        )
+        assert event_id not in [event["id"] for event in old_day]
+        assert event_id in [event["id"] for event in new_day]
+
+        database_instance.delete_event(event_id)
+
     def test_update_nonexistent_event(self, database_instance):
         """Test updating a non-existent event"""
         result = database_instance.update_event("event_999", {"summary": "New Title"})
@@ -188,6 +216,33 @@ class TestCalendarDatabase(BaseDataTest):
         assert "files" in stats
         assert stats["total_events"] >= 0
 
+    def test_indexes_reused_between_reads(self, database_instance, monkeypatch):
+        """Test that reads reuse the indexes until events.json changes"""
+        database_instance.get_event("event_001")
+        builds = []
+        original = database_instance._build_indexes
+        monkeypatch.setattr(database_instance, "_build_indexes",
+                            lambda: (builds.append(1), original())[1])
+
+        for _ in range(5):
+            assert database_instance.get_event("event_001") is not None
+        database_instance.list_events(
+            time_min="2025-10-01T00:00:00-07:00",
+            time_max="2025-12-31T23:59:59-07:00"
+        )
+        assert builds == []
+
+        # A write from another process is still picked up
+        other = CalendarDatabase()
+        created = other.create_event({
+            "summary": "Written Elsewhere",
+            "start": {"dateTime": "2025-12-02T10:00:00-07:00"},
+            "end": {"dateTime": "2025-12-02T11:00:00-07:00"}
+        })
+        assert database_instance.get_event(created["id"]) is not None
+        assert builds == [1]
+        other.delete_event(created["id"])
+
 
 class TestCalendarMCPServer(BaseMCPTest):
     """Test the Calendar MCP server"""
@@ -19,7 +19,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, project_root)
 sys.path.insert(0, current_dir)
 
-from common.database import JsonDatabase
+from common.database import JsonDatabase, copy_json
 from sqlite_backend import SQLiteBackend
 
 
@@ -55,13 +55,23 @@ class GoogleCloudDatabase:
         self._sync_sqlite_tables()
     
     def _sync_sqlite_tables(self):
-        """Sync SQLite tables with JSON metadata and import existing data"""
+        """Sync SQLite tables with JSON metadata and import existing data
+        
+        A manifest in SQLite records, per table, the schema and the
+        mtime/size of its table_data JSON file at the last sync. Tables whose
+        schema and source file are unchanged (and which still exist) are
+        skipped, so startup does not re-read every table_data file.
+        """
         try:
             # Get all tables from metadata
-            tables_data = self.json_db.load_data(self.bigquery_tables_file)
+            tables_data = self.json_db.get_shared_data(self.bigquery_tables_file)
             if not isinstance(tables_data, dict):
                 return
             
+            manifest = self.sqlite.get_sync_manifest()
+            existing_tables = self.sqlite.list_table_names()
+            synced = {}
+            
             # Create SQLite tables based on schema
             for key, table in tables_data.items():
                 project_id = table.get('projectId', '')
@@ -70,12 +80,18 @@ class GoogleCloudDatabase:
                 schema = table.get('schema', [])
                 
                 if project_id and dataset_id and table_id and schema:
+                    self.sqlite.register_table_schema(project_id, dataset_id, table_id, schema)
+                    sqlite_table = f"{project_id}_{dataset_id}_{table_id}"
+                    json_data_file = os.path.join(self.data_dir, "table_data", 
+                                                  f"{project_id}_{dataset_id}_{table_id}.json")
+                    signature = self._table_source_signature(schema, json_data_file)
+                    if sqlite_table in existing_tables and manifest.get(sqlite_table) == signature:
+                        continue
+                    
                     # Create table in SQLite
                     self.sqlite.create_table_from_schema(project_id, dataset_id, table_id, schema)
                     
                     # Import existing data from JSON files if they exist
-                    json_data_file = os.path.join(self.data_dir, "table_data", 
-                                                  f"{project_id}_{dataset_id}_{table_id}.json")
                     if os.path.exists(json_data_file):
                         try:
                             with open(json_data_file, 'r') as f:
@@ -86,26 +102,42 @@ class GoogleCloudDatabase:
                                     self.sqlite.insert_rows(project_id, dataset_id, table_id, rows, schema)
                         except Exception as e:
                             print(f"Warning: Could not import data for {key}: {e}")
+                            continue
+                    
+                    synced[sqlite_table] = signature
+            
+            self.sqlite.set_sync_manifest(synced)
         except Exception as e:
             print(f"Warning: Could not sync SQLite tables: {e}")
     
+    def _table_source_signature(self, schema: List[Dict[str, Any]], json_data_file: str) -> str:
+        """Fingerprint of a table's schema and table_data file for the sync manifest"""
+        import hashlib
+        
+        schema_hash = hashlib.md5(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:12]
+        try:
+            st = os.stat(json_data_file)
+            return f"{schema_hash}:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            return f"{schema_hash}:-"
+    
     # ====================== BigQuery Operations ======================
     
     def list_bigquery_datasets(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List BigQuery datasets, optionally filtered by project"""
-        data = self.json_db.load_data(self.bigquery_datasets_file)
+        data = self.json_db.get_shared_data(self.bigquery_datasets_file)
         datasets = list(data.values()) if isinstance(data, dict) else []
         
         if project_id:
             datasets = [d for d in datasets if d.get('projectId') == project_id]
         
-        return datasets
+        return [copy_json(item) for item in datasets]
     
     def get_bigquery_dataset(self, project_id: str, dataset_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific BigQuery dataset"""
         key = f"{project_id}:{dataset_id}"
-        data = self.json_db.load_data(self.bigquery_datasets_file)
-        return data.get(key) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.bigquery_datasets_file)
+        return copy_json(data.get(key)) if isinstance(data, dict) else None
     
     def create_bigquery_dataset(self, project_id: str, dataset_id: str, 
                                dataset_info: Dict[str, Any]) -> bool:
@@ -135,18 +167,18 @@ class GoogleCloudDatabase:
     
     def list_bigquery_tables(self, project_id: str, dataset_id: str) -> List[Dict[str, Any]]:
         """List tables in a BigQuery dataset"""
-        data = self.json_db.load_data(self.bigquery_tables_file)
+        data = self.json_db.get_shared_data(self.bigquery_tables_file)
         tables = list(data.values()) if isinstance(data, dict) else []
         
-        return [t for t in tables 
+        return [copy_json(t) for t in tables 
                 if t.get('projectId') == project_id and t.get('datasetId') == dataset_id]
     
     def get_bigquery_table(self, project_id: str, dataset_id: str, 
                           table_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific BigQuery table"""
         key = f"{project_id}:{dataset_id}.{table_id}"
-        data = self.json_db.load_data(self.bigquery_tables_file)
-        return data.get(key) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.bigquery_tables_file)
+        return copy_json(data.get(key)) if isinstance(data, dict) else None
     
     def create_bigquery_table(self, project_id: str, dataset_id: str, 
                              table_id: str, table_info: Dict[str, Any]) -> bool:
@@ -166,6 +198,8 @@ class GoogleCloudDatabase:
         })
         
         all_data[key] = table_info
+        if table_info.get('schema'):
+            self.sqlite.register_table_schema(project_id, dataset_id, table_id, table_info['schema'])
         return self.json_db.save_data(self.bigquery_tables_file, all_data)
     
     def delete_bigquery_table(self, project_id: str, dataset_id: str, table_id: str) -> bool:
@@ -374,9 +408,8 @@ class GoogleCloudDatabase:
         query_id = f"query-{hashlib.md5(query.encode()).hexdigest()[:8]}"
         
         # Check if query result already exists in cache
-        all_results = self.json_db.load_data(self.query_results_file)
-        if isinstance(all_results, dict) and query_id in all_results:
-            cached_result = all_results[query_id]
+        cached_result = self.sqlite.get_cached_query(query_id)
+        if cached_result is not None:
             # Add cache indicator
             cached_result['cached'] = True
             return cached_result
@@ -404,27 +437,27 @@ class GoogleCloudDatabase:
         if error_message:
             result['error'] = error_message
         
-        # Save for future reference (cache) - only cache successful queries
-        if status == 'DONE':
-            if not isinstance(all_results, dict):
-                all_results = {}
-            all_results[query_id] = result
-            self.json_db.save_data(self.query_results_file, all_results)
+        # Cache successful read-only queries, keyed by the tables they read so
+        # that writes only invalidate dependent results. INFORMATION_SCHEMA
+        # queries reflect table metadata rather than table data and are not cached.
+        if (status == 'DONE' and not self.sqlite.last_written_tables
+                and 'INFORMATION_SCHEMA' not in query.upper()):
+            self.sqlite.cache_query_result(query_id, result, self.sqlite.last_read_tables)
         
         return result
     
     def get_query_result(self, query_id: str) -> Optional[Dict[str, Any]]:
         """Get results of a previous query"""
-        data = self.json_db.load_data(self.query_results_file)
-        return data.get(query_id) if isinstance(data, dict) else None
+        result = self.sqlite.get_cached_query(query_id)
+        if result is not None:
+            return result
+        # Fall back to results cached by older versions in query_results.json
+        data = self.json_db.get_shared_data(self.query_results_file)
+        return copy_json(data.get(query_id)) if isinstance(data, dict) else None
     
     def _invalidate_query_cache_for_table(self, project_id: str, dataset_id: str, table_id: str):
-        """Invalidate all cached queries for a specific table"""
-        # Clear all cached queries since we can't easily determine which queries accessed this table
-        try:
-            self.json_db.save_data(self.query_results_file, {})
-        except:
-            pass
+        """Invalidate cached queries that read a specific table"""
+        self.sqlite.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
     
     def insert_table_rows(self, project_id: str, dataset_id: str, table_id: str, rows: List[Dict[str, Any]]) -> bool:
         """Insert rows into a BigQuery table using real SQL INSERT"""
@@ -529,13 +562,13 @@ class GoogleCloudDatabase:
     
     def list_storage_buckets(self) -> List[Dict[str, Any]]:
         """List all Cloud Storage buckets"""
-        data = self.json_db.load_data(self.storage_buckets_file)
-        return list(data.values()) if isinstance(data, dict) else []
+        data = self.json_db.get_shared_data(self.storage_buckets_file)
+        return [copy_json(item) for item in data.values()] if isinstance(data, dict) else []
     
     def get_storage_bucket(self, bucket_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific Cloud Storage bucket"""
-        data = self.json_db.load_data(self.storage_buckets_file)
-        return data.get(bucket_name) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.storage_buckets_file)
+        return copy_json(data.get(bucket_name)) if isinstance(data, dict) else None
     
     def create_storage_bucket(self, bucket_name: str, bucket_info: Dict[str, Any]) -> bool:
         """Create a new Cloud Storage bucket"""
@@ -562,7 +595,7 @@ class GoogleCloudDatabase:
     
     def list_storage_objects(self, bucket_name: str, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
         """List objects in a Cloud Storage bucket"""
-        data = self.json_db.load_data(self.storage_objects_file)
+        data = self.json_db.get_shared_data(self.storage_objects_file)
         objects = list(data.values()) if isinstance(data, dict) else []
         
         objects = [obj for obj in objects if obj.get('bucket') == bucket_name]
@@ -570,13 +603,13 @@ class GoogleCloudDatabase:
         if prefix:
             objects = [obj for obj in objects if obj.get('name', '').startswith(prefix)]
         
-        return objects
+        return [copy_json(item) for item in objects]
     
     def get_storage_object(self, bucket_name: str, object_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific Cloud Storage object"""
         key = f"{bucket_name}/{object_name}"
-        data = self.json_db.load_data(self.storage_objects_file)
-        return data.get(key) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.storage_objects_file)
+        return copy_json(data.get(key)) if isinstance(data, dict) else None
     
     def upload_storage_object(self, bucket_name: str, object_name: str,
                              object_info: Dict[str, Any]) -> bool:
@@ -617,18 +650,18 @@ class GoogleCloudDatabase:
     
     def list_compute_instances(self, zone: Optional[str] = None) -> List[Dict[str, Any]]:
         """List Compute Engine instances, optionally filtered by zone"""
-        data = self.json_db.load_data(self.compute_instances_file)
+        data = self.json_db.get_shared_data(self.compute_instances_file)
         instances = list(data.values()) if isinstance(data, dict) else []
         
         if zone:
             instances = [i for i in instances if i.get('zone') == zone]
         
-        return instances
+        return [copy_json(item) for item in instances]
     
     def get_compute_instance(self, instance_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific Compute Engine instance"""
-        data = self.json_db.load_data(self.compute_instances_file)
-        return data.get(instance_name) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.compute_instances_file)
+        return copy_json(data.get(instance_name)) if isinstance(data, dict) else None
     
     def create_compute_instance(self, instance_name: str, instance_info: Dict[str, Any]) -> bool:
         """Create a new Compute Engine instance"""
@@ -675,18 +708,18 @@ class GoogleCloudDatabase:
     
     def list_service_accounts(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List IAM service accounts, optionally filtered by project"""
-        data = self.json_db.load_data(self.iam_service_accounts_file)
+        data = self.json_db.get_shared_data(self.iam_service_accounts_file)
         accounts = list(data.values()) if isinstance(data, dict) else []
         
         if project_id:
             accounts = [a for a in accounts if a.get('projectId') == project_id]
         
-        return accounts
+        return [copy_json(item) for item in accounts]
     
     def get_service_account(self, email: str) -> Optional[Dict[str, Any]]:
         """Get a specific IAM service account"""
-        data = self.json_db.load_data(self.iam_service_accounts_file)
-        return data.get(email) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.iam_service_accounts_file)
+        return copy_json(data.get(email)) if isinstance(data, dict) else None
     
     def create_service_account(self, email: str, account_info: Dict[str, Any]) -> bool:
         """Create a new IAM service account"""
@@ -777,7 +810,7 @@ class GoogleCloudDatabase:
         Returns:
             List of log entries
         """
-        data = self.json_db.load_data(self.log_entries_file)
+        data = self.json_db.get_shared_data(self.log_entries_file)
         entries = list(data.values()) if isinstance(data, dict) else []
         
         # Apply filtering
@@ -792,7 +825,7 @@ class GoogleCloudDatabase:
         entries.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
         
         # Limit results
-        return entries[:max_results]
+        return [copy_json(entry) for entry in entries[:max_results]]
     
     def _matches_log_filter(self, entry: Dict[str, Any], filter_string: str) -> bool:
         """Check if a log entry matches the filter string
@@ -903,7 +936,7 @@ class GoogleCloudDatabase:
         Returns:
             List of log names
         """
-        data = self.json_db.load_data(self.log_entries_file)
+        data = self.json_db.get_shared_data(self.log_entries_file)
         entries = list(data.values()) if isinstance(data, dict) else []
         
         log_names = set(entry.get('log_name') for entry in entries if entry.get('log_name'))
@@ -915,8 +948,8 @@ class GoogleCloudDatabase:
         Returns:
             List of log buckets
         """
-        data = self.json_db.load_data(self.log_buckets_file)
-        return list(data.values()) if isinstance(data, dict) else []
+        data = self.json_db.get_shared_data(self.log_buckets_file)
+        return [copy_json(item) for item in data.values()] if isinstance(data, dict) else []
     
     def get_log_bucket(self, bucket_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific log bucket
@@ -927,8 +960,8 @@ class GoogleCloudDatabase:
         Returns:
             Log bucket data or None
         """
-        data = self.json_db.load_data(self.log_buckets_file)
-        return data.get(bucket_id) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.log_buckets_file)
+        return copy_json(data.get(bucket_id)) if isinstance(data, dict) else None
     
     def create_log_bucket(self, bucket_id: str, bucket_info: Dict[str, Any]) -> bool:
         """Create a new log bucket
@@ -981,8 +1014,8 @@ class GoogleCloudDatabase:
         Returns:
             List of log sinks
         """
-        data = self.json_db.load_data(self.log_sinks_file)
-        return list(data.values()) if isinstance(data, dict) else []
+        data = self.json_db.get_shared_data(self.log_sinks_file)
+        return [copy_json(item) for item in data.values()] if isinstance(data, dict) else []
     
     def get_log_sink(self, sink_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific log sink
@@ -993,8 +1026,8 @@ class GoogleCloudDatabase:
         Returns:
             Log sink data or None
         """
-        data = self.json_db.load_data(self.log_sinks_file)
-        return data.get(sink_name) if isinstance(data, dict) else None
+        data = self.json_db.get_shared_data(self.log_sinks_file)
+        return copy_json(data.get(sink_name)) if isinstance(data, dict) else None
     
     def create_log_sink(self, sink_name: str, sink_info: Dict[str, Any]) -> bool:
         """Create a new log sink
@@ -1041,12 +1074,12 @@ class GoogleCloudDatabase:
         """Get database statistics"""
         stats = {
             'bigquery_datasets': len(self.list_bigquery_datasets()),
-            'bigquery_tables': len(self.json_db.load_data(self.bigquery_tables_file)),
+            'bigquery_tables': len(self.json_db.get_shared_data(self.bigquery_tables_file)),
             'storage_buckets': len(self.list_storage_buckets()),
-            'storage_objects': len(self.json_db.load_data(self.storage_objects_file)),
+            'storage_objects': len(self.json_db.get_shared_data(self.storage_objects_file)),
             'compute_instances': len(self.list_compute_instances()),
             'service_accounts': len(self.list_service_accounts()),
-            'log_entries': len(self.json_db.load_data(self.log_entries_file)),
+            'log_entries': len(self.json_db.get_shared_data(self.log_entries_file)),
             'log_buckets': len(self.list_log_buckets()),
             'log_sinks': len(self.list_log_sinks())
         }
@@ -133,12 +133,10 @@ def main():
     print(f"  - Rows returned: {result['totalRows']}")
     print(f"  - Is cached: {result.get('cached', False)}")
 
-    # View cache file
-    cache_file = os.path.join(db.data_dir, "query_results.json")
-    with open(cache_file, 'r') as f:
-        cache = json.load(f)
-    print(f"\n💾 Query results cached to query_results.json")
-    print(f"  - Number of cached queries: {len(cache)}")
+    # View cache table
+    cached_count = db.sqlite.conn.execute("SELECT COUNT(*) FROM _loca_query_cache").fetchone()[0]
+    print(f"\n💾 Query results cached in bigquery_data.db")
+    print(f"  - Number of cached queries: {cached_count}")
 
     # Execute the same query again
     print(f"\n🔍 Executing the same query again...")
@@ -197,9 +195,9 @@ def main():
    - Automatically updates JSON metadata
    - Relationship: Auto-sync after operations, maintains consistency
 
-4. **Query Cache (JSON)**
-   - Query results cached in JSON file
-   - Cache cleared when data is modified
+4. **Query Cache (SQLite)**
+   - Query results cached in bigquery_data.db with the tables each query read
+   - Modifying a table only invalidates queries that read it
    - Relationship: Cache improves performance, invalidated on modification
 
 5. **File Responsibilities**
@@ -207,7 +205,7 @@ def main():
    bigquery_datasets.json    → Dataset configuration
    bigquery_tables.json      → Table schema + statistics
    bigquery_data.db          → Actual table data
-   query_results.json        → Query result cache
+   _loca_query_cache (db)    → Query result cache
    storage_*.json            → Cloud Storage metadata
    compute_*.json            → Compute Engine metadata
    iam_*.json                → IAM metadata
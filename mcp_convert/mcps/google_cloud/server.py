@@ -38,6 +38,13 @@ class GoogleCloudMCPServer(BaseMCPServer):
         self.tool_registry = ToolRegistry()
         self.setup_tools()
     
+    def set_data_dir(self, data_dir: str) -> bool:
+        """Switch to another data directory (used by warm server pools)"""
+        os.makedirs(data_dir, exist_ok=True)
+        self.db.sqlite.close()
+        self.db = GoogleCloudDatabase(data_dir=data_dir)
+        return True
+    
     def _get_data_directory(self):
         """Determine the appropriate data directory for Google Cloud database"""
         import sys
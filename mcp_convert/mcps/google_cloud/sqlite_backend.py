@@ -7,17 +7,50 @@ Provides real SQL database operations using SQLite as the storage engine
 import sqlite3
 import json
 import os
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 
+# Bookkeeping tables live next to the data tables and are hidden from
+# INFORMATION_SCHEMA listings
+INTERNAL_TABLE_PREFIX = "_loca_"
+QUERY_CACHE_TABLE = "_loca_query_cache"
+QUERY_CACHE_DEPS_TABLE = "_loca_query_cache_tables"
+SYNC_MANIFEST_TABLE = "_loca_sync_manifest"
+
+# BigQuery field types stored as JSON text
+JSON_FIELD_TYPES = {'RECORD', 'STRUCT', 'JSON'}
+
+_WRITE_ACTIONS = {
+    sqlite3.SQLITE_INSERT,
+    sqlite3.SQLITE_UPDATE,
+    sqlite3.SQLITE_DELETE,
+    sqlite3.SQLITE_DROP_TABLE,
+    sqlite3.SQLITE_CREATE_TABLE,
+}
+
+
 class SQLiteBackend:
     """SQLite backend for real SQL operations"""
     
+    # Query results larger than this (serialized) are returned but not cached
+    max_cached_result_bytes = 2 * 1024 * 1024
+    # Least recently used entries are evicted beyond this count
+    max_cached_queries = 256
+    
     def __init__(self, db_path: str):
         """Initialize SQLite backend"""
         self.db_path = db_path
         self.conn = None
+        # Tables read/written by the statement currently run via execute_query
+        self._tracking = False
+        self._read_tables = set()
+        self._written_tables = set()
+        self.last_read_tables: List[str] = []
+        self.last_written_tables: List[str] = []
+        # table name -> {column name: holds JSON}, see register_table_schema
+        self._column_types: Dict[str, Dict[str, bool]] = {}
         self._connect()
     
     def _connect(self):
@@ -27,6 +60,204 @@ class SQLiteBackend:
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         # Enable JSON support
         self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.set_authorizer(self._authorize)
+        self._ensure_query_cache_tables()
+    
+    def _authorize(self, action, arg1, arg2, db_name, trigger):
+        """SQLite authorizer hook used to record which tables a query touches"""
+        if self._tracking:
+            if action == sqlite3.SQLITE_READ:
+                table = arg1
+                if table and not table.startswith(INTERNAL_TABLE_PREFIX):
+                    self._read_tables.add(table)
+            elif action in _WRITE_ACTIONS:
+                table = arg1
+                if table and not table.startswith(INTERNAL_TABLE_PREFIX):
+                    self._written_tables.add(table)
+            elif action == sqlite3.SQLITE_ALTER_TABLE:
+                if arg2 and not arg2.startswith(INTERNAL_TABLE_PREFIX):
+                    self._written_tables.add(arg2)
+        return sqlite3.SQLITE_OK
+    
+    # ====================== Query Result Cache ======================
+    
+    def _ensure_query_cache_tables(self):
+        """Create the query cache tables if needed"""
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {QUERY_CACHE_TABLE} ("
+            "query_id TEXT PRIMARY KEY, result TEXT NOT NULL, "
+            "size_bytes INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {QUERY_CACHE_DEPS_TABLE} ("
+            "query_id TEXT NOT NULL, table_name TEXT NOT NULL, "
+            "PRIMARY KEY (table_name, query_id))"
+        )
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_MANIFEST_TABLE} ("
+            "table_name TEXT PRIMARY KEY, source_signature TEXT NOT NULL)"
+        )
+        self.conn.commit()
+    
+    # ====================== Column Types ======================
+    
+    def register_table_schema(self, project_id: str, dataset_id: str, table_id: str,
+                              schema: List[Dict[str, Any]]):
+        """Remember which columns of a table hold JSON-encoded values
+        
+        RECORD/STRUCT/JSON fields and REPEATED fields are stored as JSON text
+        and decoded when read back; other columns are returned as-is.
+        """
+        columns = {}
+        for field in schema:
+            name = field.get('name')
+            if not name:
+                continue
+            is_json = (str(field.get('type', '')).upper() in JSON_FIELD_TYPES
+                       or str(field.get('mode', '')).upper() == 'REPEATED')
+            columns[name] = is_json
+            columns[self._clean_column_name(name)] = is_json
+        self._column_types[f"{project_id}_{dataset_id}_{table_id}"] = columns
+    
+    def unregister_table_schema(self, project_id: str, dataset_id: str, table_id: str):
+        """Forget the column types of a table"""
+        self._column_types.pop(f"{project_id}_{dataset_id}_{table_id}", None)
+    
+    def _json_column_indexes(self, keys: List[str]) -> List[int]:
+        """Indexes of result columns that may need JSON decoding
+        
+        Columns declared as JSON in any table read by the query are decoded,
+        columns declared as plain scalars are skipped, and anything else
+        (computed expressions, aliases, tables without a registered schema)
+        keeps the generic "looks like JSON" check.
+        """
+        read_tables = self._read_tables
+        if not read_tables or any(table not in self._column_types for table in read_tables):
+            return list(range(len(keys)))
+        
+        indexes = []
+        for idx, key in enumerate(keys):
+            declared = [self._column_types[table].get(key) for table in read_tables]
+            if any(declared) or all(flag is None for flag in declared):
+                indexes.append(idx)
+        return indexes
+    
+    # ====================== Sync Manifest ======================
+    
+    def get_sync_manifest(self) -> Dict[str, str]:
+        """Return table name -> source signature recorded by the last sync"""
+        try:
+            rows = self.conn.execute(
+                f"SELECT table_name, source_signature FROM {SYNC_MANIFEST_TABLE}"
+            ).fetchall()
+            return {row[0]: row[1] for row in rows}
+        except Exception:
+            return {}
+    
+    def set_sync_manifest(self, entries: Dict[str, str]):
+        """Record source signatures for synced tables"""
+        if not entries:
+            return
+        try:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {SYNC_MANIFEST_TABLE} (table_name, source_signature) VALUES (?, ?)",
+                list(entries.items())
+            )
+            self.conn.commit()
+        except Exception as e:
+            print(f"Warning: Could not update sync manifest: {e}")
+    
+    def list_table_names(self) -> set:
+        """Names of all data tables in the database"""
+        rows = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        return {row[0] for row in rows if not row[0].startswith(INTERNAL_TABLE_PREFIX)}
+    
+    def get_cached_query(self, query_id: str) -> Optional[Dict[str, Any]]:
+        """Return a cached query result, or None if absent"""
+        try:
+            row = self.conn.execute(
+                f"SELECT result FROM {QUERY_CACHE_TABLE} WHERE query_id = ?", (query_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                f"UPDATE {QUERY_CACHE_TABLE} SET last_used = ? WHERE query_id = ?",
+                (time.time(), query_id)
+            )
+            self.conn.commit()
+            return json.loads(row[0])
+        except Exception as e:
+            print(f"Warning: Could not read query cache: {e}")
+            return None
+    
+    def cache_query_result(self, query_id: str, result: Dict[str, Any], tables: List[str]) -> bool:
+        """Cache a query result along with the tables it depends on"""
+        try:
+            payload = json.dumps(result)
+            size = len(payload.encode('utf-8'))
+            if size > self.max_cached_result_bytes:
+                return False
+            
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {QUERY_CACHE_TABLE} (query_id, result, size_bytes, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (query_id, payload, size, time.time())
+            )
+            self.conn.execute(f"DELETE FROM {QUERY_CACHE_DEPS_TABLE} WHERE query_id = ?", (query_id,))
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {QUERY_CACHE_DEPS_TABLE} (query_id, table_name) VALUES (?, ?)",
+                [(query_id, table) for table in tables]
+            )
+            
+            # Evict least recently used entries beyond the cap
+            evicted = self.conn.execute(
+                f"SELECT query_id FROM {QUERY_CACHE_TABLE} ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                (self.max_cached_queries,)
+            ).fetchall()
+            if evicted:
+                self._delete_cached_queries([row[0] for row in evicted])
+            
+            self.conn.commit()
+            return True
+        except Exception as e:
+            print(f"Warning: Could not cache query result: {e}")
+            self.conn.rollback()
+            return False
+    
+    def _delete_cached_queries(self, query_ids: List[str]):
+        """Delete cache entries and their dependency rows (no commit)"""
+        rows = [(query_id,) for query_id in query_ids]
+        self.conn.executemany(f"DELETE FROM {QUERY_CACHE_TABLE} WHERE query_id = ?", rows)
+        self.conn.executemany(f"DELETE FROM {QUERY_CACHE_DEPS_TABLE} WHERE query_id = ?", rows)
+    
+    def invalidate_query_cache(self, table_names: List[str]):
+        """Drop cached results of queries that read any of the given tables"""
+        if not table_names:
+            return
+        try:
+            placeholders = ','.join('?' for _ in table_names)
+            query_ids = [row[0] for row in self.conn.execute(
+                f"SELECT DISTINCT query_id FROM {QUERY_CACHE_DEPS_TABLE} WHERE table_name IN ({placeholders})",
+                tuple(table_names)
+            ).fetchall()]
+            if query_ids:
+                self._delete_cached_queries(query_ids)
+                self.conn.commit()
+        except Exception as e:
+            print(f"Warning: Could not invalidate query cache: {e}")
+    
+    def invalidate_query_cache_for_table(self, project_id: str, dataset_id: str, table_id: str):
+        """Drop cached results of queries that read a BigQuery table"""
+        self.invalidate_query_cache([f"{project_id}_{dataset_id}_{table_id}"])
+    
+    def clear_query_cache(self):
+        """Drop all cached query results"""
+        try:
+            self.conn.execute(f"DELETE FROM {QUERY_CACHE_TABLE}")
+            self.conn.execute(f"DELETE FROM {QUERY_CACHE_DEPS_TABLE}")
+            self.conn.commit()
+        except Exception as e:
+            print(f"Warning: Could not clear query cache: {e}")
     
     def _get_sqlite_type(self, bigquery_type: str) -> str:
         """Convert BigQuery type to SQLite type"""
@@ -76,6 +307,7 @@ class SQLiteBackend:
             
             self.conn.execute(create_sql)
             self.conn.commit()
+            self.register_table_schema(project_id, dataset_id, table_id, schema)
             return True
         except Exception as e:
             print(f"Error creating table: {e}")
@@ -104,6 +336,7 @@ class SQLiteBackend:
         if not rows:
             return 0
         
+        self.register_table_schema(project_id, dataset_id, table_id, schema)
         try:
             # Clean column names in schema
             cleaned_schema = []
@@ -148,6 +381,7 @@ class SQLiteBackend:
             
             cursor = self.conn.executemany(insert_sql, processed_rows)
             self.conn.commit()
+            self.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
             return cursor.rowcount
         except Exception as e:
             print(f"Error inserting rows: {e}")
@@ -207,6 +441,8 @@ class SQLiteBackend:
             results = []
             for row in all_tables:
                 table_name = row[0]
+                if table_name.startswith(INTERNAL_TABLE_PREFIX):
+                    continue
                 
                 # Look for pattern: {anything}_{dataset_id}_{table_id}
                 # Use regex to find dataset_id in the table name
@@ -780,9 +1016,27 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
         """
         Execute a SQL query and return results
         
+        Tables read and written by the query are recorded in
+        ``last_read_tables`` / ``last_written_tables``; cached results of
+        queries over written tables are invalidated.
+        
         Returns:
             Tuple of (results, error_message)
         """
+        self._read_tables = set()
+        self._written_tables = set()
+        self._tracking = True
+        try:
+            return self._execute_query(query, params)
+        finally:
+            self._tracking = False
+            self.last_read_tables = sorted(self._read_tables)
+            self.last_written_tables = sorted(self._written_tables)
+            if self._written_tables:
+                self.invalidate_query_cache(self.last_written_tables)
+    
+    def _execute_query(self, query: str, params: Optional[Tuple] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Run a query; see execute_query"""
         try:
             # Check if this is an INFORMATION_SCHEMA query
             if 'INFORMATION_SCHEMA' in query.upper():
@@ -813,20 +1067,24 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
             
             # Convert to list of dicts
             results = []
+            if not rows:
+                return results, None
+            
+            keys = rows[0].keys()
+            json_indexes = self._json_column_indexes(keys)
             for row in rows:
-                row_dict = {}
-                for key in row.keys():
-                    value = row[key]
+                values = list(row)
+                for idx in json_indexes:
+                    value = values[idx]
                     # Try to parse JSON strings back to objects
                     if isinstance(value, str):
                         try:
                             # Check if it looks like JSON
                             if value.startswith('{') or value.startswith('['):
-                                value = json.loads(value)
+                                values[idx] = json.loads(value)
                         except:
                             pass
-                    row_dict[key] = value
-                results.append(row_dict)
+                results.append(dict(zip(keys, values)))
             
             return results, None
         except Exception as e:
@@ -854,6 +1112,7 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
             
             cursor = self.conn.execute(update_sql, tuple(values))
             self.conn.commit()
+            self.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
             return cursor.rowcount
         except Exception as e:
             print(f"Error updating rows: {e}")
@@ -872,6 +1131,7 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
             
             cursor = self.conn.execute(delete_sql)
             self.conn.commit()
+            self.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
             return cursor.rowcount
         except Exception as e:
             print(f"Error deleting rows: {e}")
@@ -892,7 +1152,13 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
         try:
             table_name = self._get_table_name(project_id, dataset_id, table_id)
             self.conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            self.unregister_table_schema(project_id, dataset_id, table_id)
+            self.conn.execute(
+                f"DELETE FROM {SYNC_MANIFEST_TABLE} WHERE table_name = ?",
+                (f"{project_id}_{dataset_id}_{table_id}",)
+            )
             self.conn.commit()
+            self.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
             return True
         except Exception as e:
             print(f"Error dropping table: {e}")
@@ -904,6 +1170,7 @@ WHERE NOT EXISTS (SELECT 1 FROM {target_table} WHERE {on_cond_fixed})"""
             table_name = self._get_table_name(project_id, dataset_id, table_id)
             self.conn.execute(f"DELETE FROM {table_name}")
             self.conn.commit()
+            self.invalidate_query_cache_for_table(project_id, dataset_id, table_id)
             return True
         except Exception as e:
             print(f"Error truncating table: {e}")
@@ -17,7 +17,7 @@ import re
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-from common.database import JsonDatabase
+from common.database import JsonDatabase, copy_json
 
 
 def column_letter_to_index(col: str) -> int:
@@ -141,12 +141,12 @@ class GoogleSheetDatabase:
     
     def get_spreadsheet(self, spreadsheet_id: str) -> Optional[Dict[str, Any]]:
         """Get spreadsheet by ID"""
-        spreadsheets = self.json_db.load_data(self.spreadsheets_file)
-        return spreadsheets.get(spreadsheet_id)
+        spreadsheets = self.json_db.get_shared_data(self.spreadsheets_file)
+        return copy_json(spreadsheets.get(spreadsheet_id))
     
     def list_spreadsheets(self, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all spreadsheets, optionally filtered by folder"""
-        spreadsheets = self.json_db.load_data(self.spreadsheets_file)
+        spreadsheets = self.json_db.get_shared_data(self.spreadsheets_file)
         result = []
         
         for spreadsheet_id, spreadsheet in spreadsheets.items():
@@ -212,24 +212,24 @@ class GoogleSheetDatabase:
     
     def get_sheet(self, spreadsheet_id: str, sheet_name: str) -> Optional[Dict[str, Any]]:
         """Get sheet by name"""
-        sheets_data = self.json_db.load_data(self.sheets_file)
+        sheets_data = self.json_db.get_shared_data(self.sheets_file)
         
         for sheet in sheets_data.values():
             if (sheet.get("spreadsheetId") == spreadsheet_id and 
                 sheet.get("title") == sheet_name):
-                return sheet
+                return copy_json(sheet)
         
         return None
     
     def get_sheet_by_id(self, spreadsheet_id: str, sheet_id: int) -> Optional[Dict[str, Any]]:
         """Get sheet by ID"""
-        sheets_data = self.json_db.load_data(self.sheets_file)
+        sheets_data = self.json_db.get_shared_data(self.sheets_file)
         sheet_key = f"{spreadsheet_id}_{sheet_id}"
-        return sheets_data.get(sheet_key)
+        return copy_json(sheets_data.get(sheet_key))
     
     def list_sheets(self, spreadsheet_id: str) -> List[str]:
         """List all sheet names in a spreadsheet"""
-        sheets_data = self.json_db.load_data(self.sheets_file)
+        sheets_data = self.json_db.get_shared_data(self.sheets_file)
         
         sheet_names = []
         for sheet in sheets_data.values():
@@ -297,13 +297,14 @@ class GoogleSheetDatabase:
         )
         
         # Copy all cells
-        for cell_key, cell_data in src_cells.items():
-            new_cell_key = cell_key.replace(
-                f"{src_spreadsheet}_{src_sheet}",
-                f"{dst_spreadsheet}_{dst_sheet}"
-            )
+        if src_cells:
             cells = self.json_db.load_data(self.cells_file)
-            cells[new_cell_key] = cell_data
+            for cell_key, cell_data in src_cells.items():
+                new_cell_key = cell_key.replace(
+                    f"{src_spreadsheet}_{src_sheet}",
+                    f"{dst_spreadsheet}_{dst_sheet}"
+                )
+                cells[new_cell_key] = cell_data
             self.json_db.save_data(self.cells_file, cells)
         
         return {"sheetId": new_sheet["sheetId"], "title": dst_sheet}
@@ -398,7 +399,7 @@ class GoogleSheetDatabase:
     def get_cells(self, spreadsheet_id: str, sheet_name: str,
                   range_notation: Optional[str] = None) -> Dict[str, Any]:
         """Get cells in a range"""
-        cells = self.json_db.load_data(self.cells_file)
+        cells = self.json_db.get_shared_data(self.cells_file)
         
         # Parse range if provided
         if range_notation:
@@ -427,14 +428,14 @@ class GoogleSheetDatabase:
                     if row >= start_row and col >= start_col:
                         if (end_row is None or row <= end_row) and \
                            (end_col is None or col <= end_col):
-                            result_cells[cell_key] = cell_data
+                            result_cells[cell_key] = copy_json(cell_data)
         
         return result_cells
     
     def get_all_cells(self, spreadsheet_id: str, sheet_name: str) -> Dict[str, Any]:
         """Get all cells in a sheet"""
-        cells = self.json_db.load_data(self.cells_file)
-        return {k: v for k, v in cells.items() 
+        cells = self.json_db.get_shared_data(self.cells_file)
+        return {k: copy_json(v) for k, v in cells.items() 
                 if k.startswith(f"{spreadsheet_id}_{sheet_name}_")}
     
     def get_values(self, spreadsheet_id: str, sheet_name: str,
@@ -628,9 +629,9 @@ class GoogleSheetDatabase:
     
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
-        spreadsheets = self.json_db.load_data(self.spreadsheets_file)
-        sheets = self.json_db.load_data(self.sheets_file)
-        cells = self.json_db.load_data(self.cells_file)
+        spreadsheets = self.json_db.get_shared_data(self.spreadsheets_file)
+        sheets = self.json_db.get_shared_data(self.sheets_file)
+        cells = self.json_db.get_shared_data(self.cells_file)
         
         return {
             "total_spreadsheets": len(spreadsheets),
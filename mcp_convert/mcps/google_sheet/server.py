@@ -44,6 +44,12 @@ class GoogleSheetMCPServer(BaseMCPServer):
         self.tool_registry = ToolRegistry()
         self.setup_tools()
     
+    def set_data_dir(self, data_dir: str) -> bool:
+        """Switch to another data directory (used by warm server pools)"""
+        os.makedirs(data_dir, exist_ok=True)
+        self.db = GoogleSheetDatabase(data_dir=data_dir)
+        return True
+    
     def setup_tools(self):
         """Setup all Google Sheets tools"""
         
@@ -10,7 +10,34 @@ import sys
 import sqlite3
 import json
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+# Pattern to match database.schema.table
+_QUALIFIED_NAME_PATTERN = re.compile(
+    r'\b([A-Za-z_][A-Za-z0-9_]*\.[A-Za-z_][A-Za-z0-9_]*\.[A-Za-z_][A-Za-z0-9_]*)\b'
+)
+
+
+def _physical_table_name(database: str, schema: str, table: str) -> str:
+    """Get the SQLite table name storing database.schema.table"""
+    return f"{database}_{schema}_{table}".upper()
+
+
+def _replace_table_name(match: "re.Match") -> str:
+    """Replace a database.schema.table reference with its physical table name"""
+    full_name = match.group(1)
+    parts = full_name.split('.')
+    if len(parts) == 3:
+        return f'"{_physical_table_name(*parts)}"'
+    return full_name
+
+
+@lru_cache(maxsize=1024)
+def _translate_query_cached(query: str) -> str:
+    """Translate fully qualified names in a query; memoized by query text"""
+    return _QUALIFIED_NAME_PATTERN.sub(_replace_table_name, query)
 
 
 class SimpleJsonDatabase:
@@ -61,9 +88,13 @@ class SnowflakeDatabase:
         
         # Initialize SQLite database
         self.db_path = os.path.join(data_dir, "snowflake.db")
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Keep more prepared statements around for repeated parameterized writes
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
         
+        # Nesting depth of batch() blocks; writes inside a batch commit once at the end
+        self._batch_depth = 0
+        
         # Initialize JSON database for metadata
         self.json_db = SimpleJsonDatabase(data_dir)
         self.metadata_file = "metadata.json"
@@ -165,7 +196,7 @@ class SnowflakeDatabase:
     
     def _get_physical_table_name(self, database: str, schema: str, table: str) -> str:
         """Get the physical SQLite table name"""
-        return f"{database}_{schema}_{table}".upper()
+        return _physical_table_name(database, schema, table)
     
     def list_databases(self) -> List[str]:
         """List all databases"""
@@ -235,27 +266,47 @@ class SnowflakeDatabase:
         
         return columns
     
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        """Execute a SELECT query and return results"""
+    def execute_query(self, query: str, params: Optional[Tuple] = None,
+                      max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Execute a SELECT query and return results
+        
+        Args:
+            query: SELECT statement using database.schema.table names
+            params: Optional parameters for ``?`` placeholders
+            max_rows: Stop fetching after this many rows (None = all rows)
+        """
+        if max_rows is None:
+            return list(self.iter_query(query, params))
+        
+        results = []
+        if max_rows <= 0:
+            return results
+        for row in self.iter_query(query, params, batch_size=min(max_rows, 1000)):
+            results.append(row)
+            if len(results) >= max_rows:
+                break
+        return results
+    
+    def iter_query(self, query: str, params: Optional[Tuple] = None,
+                   batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Execute a SELECT query and yield rows as dictionaries in batches"""
         # Translate Snowflake-style fully qualified names to SQLite table names
         translated_query = self._translate_query(query)
         
         cursor = self.conn.cursor()
-        cursor.execute(translated_query)
+        cursor.execute(translated_query, params or ())
         
-        # Convert rows to list of dictionaries
-        columns = [description[0] for description in cursor.description]
-        results = []
-        
-        for row in cursor.fetchall():
-            result_dict = {}
-            for idx, col_name in enumerate(columns):
-                result_dict[col_name.upper()] = row[idx]
-            results.append(result_dict)
+        # Upper-case column names once rather than per row
+        columns = [description[0].upper() for description in cursor.description]
         
-        return results
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
     
-    def execute_write_query(self, query: str) -> int:
+    def execute_write_query(self, query: str, params: Optional[Tuple] = None) -> int:
         """Execute an INSERT, UPDATE, DELETE, or CREATE query"""
         # Handle CREATE TABLE specially
         if query.strip().upper().startswith("CREATE TABLE"):
@@ -266,11 +317,56 @@ class SnowflakeDatabase:
         translated_query = self._translate_query(query)
         
         cursor = self.conn.cursor()
-        cursor.execute(translated_query)
-        self.conn.commit()
+        cursor.execute(translated_query, params or ())
+        self._commit()
+        
+        return cursor.rowcount
+    
+    def execute_write_many(self, query: str, params_seq: List[Tuple]) -> int:
+        """Execute one parameterized write statement for many parameter tuples
+        
+        The statement is prepared once and committed once.
+        """
+        translated_query = self._translate_query(query)
+        
+        cursor = self.conn.cursor()
+        cursor.executemany(translated_query, params_seq)
+        self._commit()
         
         return cursor.rowcount
     
+    @contextmanager
+    def batch(self):
+        """Group writes into a single transaction
+        
+        Inside the block, execute_write_query and CREATE TABLE do not commit;
+        everything is committed when the outermost block exits, or rolled back
+        if it raises. A statement that fails inside the block only undoes
+        itself, as with per-statement commits.
+        
+        Example:
+            with db.batch():
+                for row in rows:
+                    db.execute_write_query(insert_sql, row)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.commit()
+    
+    def _commit(self):
+        """Commit unless inside a batch() block"""
+        if self._batch_depth == 0:
+            self.conn.commit()
+    
     def _handle_create_table(self, query: str):
         """Handle CREATE TABLE statement"""
         # Parse the CREATE TABLE statement
@@ -328,7 +424,7 @@ class SnowflakeDatabase:
         create_stmt = f'CREATE TABLE IF NOT EXISTS "{physical_table_name}" ({", ".join(sqlite_columns)})'
         cursor.execute(create_stmt)
         
-        self.conn.commit()
+        self._commit()
     
     def _parse_column_definitions(self, column_defs: str) -> List[Dict[str, str]]:
         """Parse column definitions from CREATE TABLE statement"""
@@ -434,23 +530,12 @@ class SnowflakeDatabase:
             return "TEXT"  # Default to TEXT for unknown types
     
     def _translate_query(self, query: str) -> str:
-        """Translate Snowflake-style query to SQLite"""
-        # Find all fully qualified table names (database.schema.table)
-        # and replace them with physical table names
-        
-        # Pattern to match database.schema.table
-        pattern = r'\b([A-Za-z_][A-Za-z0-9_]*\.[A-Za-z_][A-Za-z0-9_]*\.[A-Za-z_][A-Za-z0-9_]*)\b'
-        
-        def replace_table_name(match):
-            full_name = match.group(1)
-            parts = full_name.split('.')
-            if len(parts) == 3:
-                database, schema, table = [p.upper() for p in parts]
-                return f'"{self._get_physical_table_name(database, schema, table)}"'
-            return full_name
-        
-        translated = re.sub(pattern, replace_table_name, query)
-        return translated
+        """Translate Snowflake-style query to SQLite
+        
+        Fully qualified names (database.schema.table) are replaced with
+        physical table names. Translations are memoized per query text.
+        """
+        return _translate_query_cached(query)
     
     def add_insight(self, insight: str):
         """Add a data insight to the memo"""
@@ -12,20 +12,24 @@ from typing import Dict, List, Any, Optional
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-from common.database import JsonDatabase, CsvDatabase
+from common.database import JsonDatabase, CsvDatabase, copy_json
 
 
 class YFinanceDatabase:
     """Database handler for YFinance data"""
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, columnar_cache: bool = False):
         """Initialize database with data directory"""
         if data_dir is None:
             # Default to data directory in the same folder as this file
             data_dir = os.path.join(os.path.dirname(__file__), "data")
         
         self.json_db = JsonDatabase(data_dir)
-        self.csv_db = CsvDatabase(data_dir)
+        self.csv_db = CsvDatabase(data_dir, columnar_cache=columnar_cache)
+        
+        # Price records grouped by symbol, rebuilt when the CSV changes
+        self._prices_frame = None
+        self._prices_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
         
         # File mappings
         self.stocks_file = "stocks.json"
@@ -39,12 +43,20 @@ class YFinanceDatabase:
     
     def get_stock_info(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get stock information for a ticker"""
-        stocks = self.json_db.load_data(self.stocks_file)
-        return stocks.get(ticker.upper())
+        stocks = self.json_db.get_shared_data(self.stocks_file)
+        return copy_json(stocks.get(ticker.upper()))
     
     def get_historical_prices(self, ticker: str, period: str = "1mo", interval: str = "1d") -> List[Dict[str, Any]]:
         """Get historical prices for a ticker"""
-        return self.csv_db.query_records(self.prices_file, {"symbol": ticker.upper()})
+        df = self.csv_db.get_shared_frame(self.prices_file)
+        if df is not self._prices_frame:
+            self._prices_frame = df
+            self._prices_by_symbol = {}
+            if not df.empty and "symbol" in df.columns:
+                for record in df.to_dict('records'):
+                    self._prices_by_symbol.setdefault(record["symbol"], []).append(record)
+        
+        return [dict(record) for record in self._prices_by_symbol.get(ticker.upper(), [])]
     
     def get_news(self, ticker: str) -> List[Dict[str, Any]]:
         """Get news for a ticker"""
@@ -117,7 +129,7 @@ class YFinanceDatabase:
     # Utility methods
     def get_available_tickers(self) -> List[str]:
         """Get list of available tickers"""
-        stocks = self.json_db.load_data(self.stocks_file)
+        stocks = self.json_db.get_shared_data(self.stocks_file)
         return list(stocks.keys())
     
     def validate_ticker(self, ticker: str) -> bool:
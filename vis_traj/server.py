@@ -17,6 +17,8 @@ from functools import partial
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import unquote
 
+from gem.utils.trajectory import resolve_message_refs
+
 TRAJECTORY_CACHE = {}
 FILE_LIST = []
 
@@ -31,7 +33,7 @@ def load_trajectories(traj_path: str):
     for task_name in sorted(all_data.keys()):
         states = all_data[task_name]
         for state_name in sorted(states.keys()):
-            traj_data = states[state_name]
+            traj_data = resolve_message_refs(states[state_name])
 
             cache_key = f"{task_name}/{state_name}"
             TRAJECTORY_CACHE[cache_key] = traj_data